@@ -0,0 +1,255 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Benchmark the reevaluation of expressions bound to a shared model.
+
+The number of scope objects allocated per reevaluation is counted by
+instrumenting the scope and tracer classes. This benchmark does not
+require a display or a gui toolkit.
+
+"""
+from traits.api import HasTraits, Instance, Int
+
+from enaml.core import dynamic_scope, expressions
+from enaml.core.declarative import Declarative
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.core.operator_context import OperatorContext
+from enaml.core.parser import parse
+
+from benchutils import best_time, report, result
+
+
+SUITE = 'expressions'
+
+
+SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Item(Declarative):
+    attr model
+    attr value << model.count + 1
+    attr total = 0
+    model ::
+        self.total += 1
+"""
+
+
+CHAIN_SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Chain(Declarative):
+    attr model
+    attr value << model.child.count
+"""
+
+
+DEEP_SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Root(Declarative):
+    attr model
+
+enamldef Leaf(Declarative):
+    attr value << model.count
+"""
+
+
+TABS_SOURCE = """
+from enaml.core.declarative import Declarative
+from enaml.widgets.widget import Widget
+
+enamldef Cell(Declarative):
+    attr value << model.count * 2
+
+enamldef Tab(Widget):
+    attr model
+"""
+
+
+class Model(HasTraits):
+    count = Int()
+    child = Instance('Model')
+
+
+class AllocationCounter(object):
+    """ A context manager which counts the instances created of the
+    scope and tracer classes.
+
+    """
+    classes = (
+        dynamic_scope.DynamicScope,
+        dynamic_scope.Nonlocals,
+        expressions.TraitsTracer,
+    )
+
+    def __init__(self):
+        self.count = 0
+        self._inits = []
+
+    def _counting(self, init):
+        def counting_init(obj, *args, **kwargs):
+            self.count += 1
+            init(obj, *args, **kwargs)
+        return counting_init
+
+    def __enter__(self):
+        for cls in self.classes:
+            init = cls.__dict__['__init__']
+            self._inits.append((cls, init))
+            cls.__init__ = self._counting(init)
+        return self
+
+    def __exit__(self, *args):
+        for cls, init in self._inits:
+            cls.__init__ = init
+        del self._inits[:]
+
+
+def build_items(count):
+    code = EnamlCompiler.compile(parse(SOURCE), '<bench_expressions>')
+    namespace = {}
+    exec code in namespace
+    Item = namespace['Item']
+    model = Model()
+    items = [Item(model=model) for ignored in xrange(count)]
+    for item in items:
+        item.initialize()
+        item.value
+    return model, items
+
+
+def bench_subscription(count):
+    model, items = build_items(count)
+    def run():
+        model.count += 1
+        for item in items:
+            item.value
+    run()
+    with AllocationCounter() as counter:
+        run()
+    seconds = best_time(run, repeat=5, number=5) / count
+    return result(
+        SUITE, 'subscription_reeval', seconds, expressions=count,
+        allocations_per_eval=float(counter.count) / count,
+    )
+
+
+def traced_operators():
+    """ Create an operator context which always binds the traced
+    SubscriptionExpression for the `<<` operator.
+
+    """
+    def op_subscribe(obj, name, func, identifiers):
+        expr = expressions.SubscriptionExpression(func, identifiers)
+        obj.bind_expression(name, expr)
+    ctxt = OperatorContext(OperatorContext.default_context())
+    ctxt['__operator_LessLess__'] = op_subscribe
+    return ctxt
+
+
+def bench_chain(count, traced):
+    code = EnamlCompiler.compile(parse(CHAIN_SOURCE), '<bench_expressions>')
+    namespace = {}
+    exec code in namespace
+    Chain = namespace['Chain']
+    model = Model(child=Model())
+    if traced:
+        with traced_operators():
+            items = [Chain(model=model) for ignored in xrange(count)]
+    else:
+        items = [Chain(model=model) for ignored in xrange(count)]
+    for item in items:
+        item.initialize()
+        item.value
+    child = model.child
+    def run():
+        child.count += 1
+        for item in items:
+            item.value
+    seconds = best_time(run, repeat=5, number=5) / count
+    name = 'traced_chain' if traced else 'static_chain'
+    return result(SUITE, name, seconds, expressions=count)
+
+
+def bench_deep_scope(count, depth):
+    code = EnamlCompiler.compile(parse(DEEP_SOURCE), '<bench_expressions>')
+    namespace = {}
+    exec code in namespace
+    model = Model()
+    root = namespace['Root'](model=model)
+    parent = root
+    for ignored in xrange(depth):
+        parent = Declarative(parent)
+    Leaf = namespace['Leaf']
+    items = [Leaf(parent) for ignored in xrange(count)]
+    root.initialize()
+    for item in items:
+        item.value
+    def run():
+        model.count += 1
+        for item in items:
+            item.value
+    seconds = best_time(run, repeat=5, number=5) / count
+    return result(SUITE, 'deep_scope', seconds, expressions=count, depth=depth)
+
+
+def bench_notification(count):
+    model, items = build_items(count)
+    models = [Model() for ignored in xrange(2)]
+    state = {'idx': 0}
+    def run():
+        state['idx'] ^= 1
+        new = models[state['idx']]
+        for item in items:
+            item.model = new
+    run()
+    with AllocationCounter() as counter:
+        run()
+    seconds = best_time(run, repeat=5) / count
+    return result(
+        SUITE, 'notification', seconds, expressions=count,
+        allocations_per_eval=float(counter.count) / count,
+    )
+
+
+def bench_tabs(tabs, cells, lazy):
+    code = EnamlCompiler.compile(parse(TABS_SOURCE), '<bench_expressions>')
+    namespace = {}
+    exec code in namespace
+    Tab = namespace['Tab']
+    Cell = namespace['Cell']
+    model = Model()
+    roots = []
+    for idx in xrange(tabs):
+        tab = Tab(model=model, lazy=lazy)
+        cells_ = [Cell(tab) for ignored in xrange(cells)]
+        tab.initialize()
+        for cell in cells_:
+            cell.value
+        roots.append(tab)
+    # Only the first tab is visible, as in a notebook.
+    for tab in roots[1:]:
+        tab.visible = False
+    def run():
+        model.count += 1
+    seconds = best_time(run, repeat=5, number=20)
+    name = 'hidden_tabs_lazy' if lazy else 'hidden_tabs_eager'
+    return result(SUITE, name, seconds, tabs=tabs, cells=cells)
+
+
+def main():
+    results = [
+        bench_subscription(1000),
+        bench_notification(1000),
+        bench_chain(1000, traced=True),
+        bench_chain(1000, traced=False),
+        bench_deep_scope(1000, 12),
+        bench_tabs(10, 100, lazy=False),
+        bench_tabs(10, 100, lazy=True),
+    ]
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
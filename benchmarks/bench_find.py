@@ -0,0 +1,83 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Benchmark the lookup of objects by name and by type in a large tree.
+
+This benchmark does not require a display or a gui toolkit.
+
+"""
+from enaml.core.object import Object
+
+from benchutils import best_time, report, result
+
+
+SUITE = 'find'
+
+
+class Leaf(Object):
+    pass
+
+
+class Marker(Object):
+    pass
+
+
+def build_tree(rows, cols):
+    """ Build a tree of rows of named cells, where every tenth row
+    has a marker.
+
+    """
+    root = Object(name='root')
+    for row in xrange(rows):
+        parent = Object(root, name='row_%d' % row)
+        if row % 10 == 0:
+            Marker(parent)
+        for col in xrange(cols):
+            Leaf(parent, name='cell_%d_%d' % (row, col))
+    return root
+
+
+def bench_find(rows, cols, indexed):
+    root = build_tree(rows, cols)
+    if indexed:
+        root.enable_index()
+    names = ['cell_%d_%d' % (row, row % cols) for row in xrange(rows)]
+
+    def find():
+        for name in names:
+            root.find(name)
+
+    def find_by_type():
+        root.find_by_type(Leaf)
+
+    def find_rare_type():
+        root.find_by_type(Marker)
+
+    suffix = 'indexed' if indexed else 'traversal'
+    objects = len(list(root.traverse()))
+    return [
+        result(
+            SUITE, 'find_' + suffix, best_time(find, repeat=3) / rows,
+            objects=objects,
+        ),
+        result(
+            SUITE, 'find_by_type_' + suffix, best_time(find_by_type),
+            objects=objects,
+        ),
+        result(
+            SUITE, 'find_rare_type_' + suffix, best_time(find_rare_type),
+            objects=objects,
+        ),
+    ]
+
+
+def main():
+    results = []
+    results.extend(bench_find(100, 50, indexed=False))
+    results.extend(bench_find(100, 50, indexed=True))
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Benchmark the instantiation of enamldef types.
+
+This measures the per object cost of stamping out many identical
+copies of an enamldef, either directly or through a Looper. It does
+not require a display or a gui toolkit.
+
+"""
+import gc
+
+from enaml.core.declarative import (
+    _lookup_operator, _make_binding_func, prepare_description, scope_lookup,
+)
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.core.operator_context import OperatorContext
+from enaml.core.parser import parse
+
+from benchutils import best_time, report, result
+
+
+SUITE = 'instantiation'
+
+
+SOURCE = """
+import gc
+
+from enaml.core.declarative import Declarative
+from enaml.core.looper import Looper
+
+enamldef Cell(Declarative):
+    attr text = ''
+
+enamldef Row(Declarative):
+    attr index = 0
+    attr label = 'row'
+    Cell:
+        text << label
+    Cell:
+        text = 'static'
+    Cell:
+        text << str(index)
+
+enamldef Page(Declarative):
+    attr count = 0
+    Looper:
+        iterable << range(count)
+        Row:
+            index = loop_index
+            label = 'row %d' % loop_index
+"""
+
+
+def load():
+    code = EnamlCompiler.compile(parse(SOURCE), '<bench_instantiation>')
+    namespace = {}
+    exec code in namespace
+    return namespace
+
+
+def timed(func):
+    """ Time a callable with the cyclic garbage collector disabled.
+
+    The objects are released between runs, and collecting them during
+    a run would dominate the variance of the measurement.
+
+    """
+    def run():
+        gc.collect()
+        gc.disable()
+        try:
+            func()
+        finally:
+            gc.enable()
+    return best_time(run, repeat=5)
+
+
+def bench_rows(count):
+    Row = load()['Row']
+
+    def run():
+        for ignored in xrange(count):
+            Row()
+
+    seconds = timed(run)
+    return result(SUITE, 'enamldef', seconds / count, objects=count)
+
+
+def bench_looper(count):
+    Page = load()['Page']
+
+    def run():
+        page = Page(count=count)
+        page.initialize()
+        page.destroy()
+
+    seconds = timed(run)
+    return result(SUITE, 'looper', seconds / count, objects=count)
+
+
+def bench_setup(count):
+    """ Compare the setup work of populating from the Row description
+    with and without the prepared description cache.
+
+    """
+    namespace = load()
+    Row = namespace['Row']
+    description, f_globals = Row._descriptions[-1]
+    descriptions = [description] + description['children']
+    operators = OperatorContext.active_context()
+
+    def uncached():
+        for ignored in xrange(count):
+            for descr in descriptions:
+                for binding in descr['bindings']:
+                    _lookup_operator(operators, binding)
+                    _make_binding_func(binding, f_globals)
+                for child in descr['children']:
+                    scope_lookup(child['type'], f_globals, child)
+
+    def cached():
+        for ignored in xrange(count):
+            for descr in descriptions:
+                prepared = prepare_description(descr, f_globals)
+                prepared.bindings(operators)
+                prepared.children()
+
+    return [
+        result(SUITE, 'setup_uncached', timed(uncached) / count),
+        result(SUITE, 'setup_cached', timed(cached) / count),
+    ]
+
+
+def main():
+    results = [
+        bench_rows(5000),
+        bench_looper(5000),
+    ]
+    results.extend(bench_setup(5000))
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
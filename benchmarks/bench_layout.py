@@ -0,0 +1,394 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Benchmark constraints-based layout without a gui toolkit.
+
+The benchmarks build synthetic trees of constraints widgets and time
+each stage of a layout: the generation of the layout info by the
+server widgets, the decoding and conversion of the constraints by the
+client, the initialization of the solver, the solves for resizes and
+the relayouts which follow a change on the server. The client side of
+the layout is performed by a NullLayout, which uses the constraint
+generators of the toolkit clients with a fixed size hint for every
+leaf widget.
+
+This benchmark does not require a display or a gui toolkit.
+
+"""
+from itertools import cycle
+import json
+
+from enaml.layout.constraint_encoding import (
+    decode_constraints, encode_constraints
+)
+from enaml.layout.layout_box import (
+    LayoutBox, contents_constraints, convert_user_constraints,
+    hard_constraints, size_hint_constraints
+)
+from enaml.layout.layout_helpers import (
+    align, expand_constraints, grid, hbox, vbox
+)
+from enaml.layout.layout_manager import LayoutManager
+from enaml.widgets.constraints_widget import (
+    ConstraintsWidget, layout_cache_stats, reset_layout_cache_stats
+)
+from enaml.widgets.container import Container
+
+from benchutils import best_time, report, result
+
+
+SUITE = 'layout'
+
+
+#------------------------------------------------------------------------------
+# Synthetic Trees
+#------------------------------------------------------------------------------
+# Each tree builder returns the root container, the ordered list of the
+# items which the root lays out, and a function which creates the root
+# constraints for an ordering of those items. A relayout is benchmarked
+# by swapping the first two items, as when a user moves a widget.
+def leaves(parent, count):
+    """ Create leaf widgets for a parent.
+
+    """
+    widgets = []
+    for ignored in xrange(count):
+        widget = ConstraintsWidget()
+        widget.set_parent(parent)
+        widgets.append(widget)
+    return widgets
+
+
+def build_grid(rows, cols):
+    """ Build a container which lays out its children in a grid.
+
+    """
+    container = Container()
+    cells = [leaves(container, cols) for ignored in xrange(rows)]
+    arrange = lambda rows: [grid(*rows)]
+    container.constraints = arrange(cells)
+    return container, cells, arrange
+
+
+def build_nested(depth, count):
+    """ Build containers nested to a depth, which alternate between a
+    vbox and an hbox of their children and share their layout.
+
+    """
+    root = container = Container()
+    for level in xrange(depth):
+        items = leaves(container, count)
+        if level < depth - 1:
+            child = Container(share_layout=True)
+            child.set_parent(container)
+            items.append(child)
+        else:
+            child = None
+        helper = hbox if level % 2 else vbox
+        container.constraints = [helper(*items)]
+        if level == 0:
+            root_items = items
+        container = child
+    arrange = lambda items: [vbox(*items)]
+    return root, root_items, arrange
+
+
+def build_aligned(count):
+    """ Build a container with a vbox of its children and an align
+    helper for each pair of adjacent children.
+
+    """
+    container = Container()
+    widgets = leaves(container, count)
+
+    def arrange(widgets):
+        cns = [vbox(*widgets)]
+        for first, second in zip(widgets, widgets[1:]):
+            cns.append(align('left', first, second))
+            cns.append(align('width', first, second))
+        return cns
+
+    container.constraints = arrange(widgets)
+    return container, widgets, arrange
+
+
+def build_shared(groups, count):
+    """ Build a container with a vbox of child containers which share
+    their layout, each with an hbox of leaf widgets.
+
+    """
+    root = Container()
+    children = []
+    for ignored in xrange(groups):
+        child = Container(share_layout=True)
+        child.set_parent(root)
+        child.constraints = [hbox(*leaves(child, count))]
+        children.append(child)
+    arrange = lambda children: [vbox(*children)]
+    root.constraints = arrange(children)
+    return root, children, arrange
+
+
+#------------------------------------------------------------------------------
+# Null Client Layout
+#------------------------------------------------------------------------------
+class NullLayout(object):
+    """ A toolkit independent client layout of a container.
+
+    A NullLayout collects the constraints of a container and of the
+    descendants which share its layout in the same way as a toolkit
+    container, using the constraint generators of the toolkit clients,
+    and gives every leaf widget a size hint of 80 by 24.
+
+    """
+    #: The size hint of a leaf widget.
+    HINT = (80, 24)
+
+    def __init__(self, root):
+        self.root = root
+        self.items = []
+        self.containers = set()
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            self.items.append(item)
+            if isinstance(item, Container):
+                if item is root or item.share_layout:
+                    self.containers.add(item)
+                    stack.extend(item.children)
+        self.owners = None
+        self.raw_cns = None
+        self.cn_map = {}
+
+    def layout_infos(self):
+        """ Generate the layout info of the items on the server.
+
+        """
+        return [item._layout_info() for item in self.items]
+
+    def raw_constraints(self, infos):
+        """ Create the hard, contents and size hint constraints.
+
+        Returns
+        -------
+        result : (list, dict)
+            The list of constraints and the mapping of owner id to
+            LayoutBox for the items.
+
+        """
+        owners = {}
+        cns = []
+        hint_width, hint_height = self.HINT
+        containers = self.containers
+        for item, info in zip(self.items, infos):
+            box = LayoutBox(type(item).__name__, item.object_id)
+            owners[item.object_id] = box
+            cns.extend(hard_constraints(box))
+            if item in containers:
+                cns.extend(contents_constraints(box, info['padding']))
+            else:
+                cns.extend(size_hint_constraints(
+                    box, hint_width, hint_height, info['hug'], info['resist'],
+                ))
+        return cns, owners
+
+    def user_infos(self, infos):
+        """ Decode the user constraints of the items in the layout.
+
+        """
+        user = []
+        containers = self.containers
+        for item, info in zip(self.items, infos):
+            if item in containers or not isinstance(item, Container):
+                user.extend(decode_constraints(info['constraints']))
+        return user
+
+    def constraints(self, infos):
+        """ Create the constraints of a full layout.
+
+        The constraints are recorded for a later `relayout`.
+
+        """
+        raw_cns, owners = self.raw_constraints(infos)
+        result = convert_user_constraints(
+            self.user_infos(infos), owners, {}, {}
+        )
+        self.raw_cns = raw_cns
+        self.owners = owners
+        self.cn_map = result[0]
+        return raw_cns + result[1]
+
+    def relayout(self, manager):
+        """ Update the constraints of a manager after a change on the
+        server, in the same way as an incremental toolkit relayout.
+
+        The constraints which are not user constraints do not change,
+        since the tree and the size hints are unchanged.
+
+        Returns
+        -------
+        result : int
+            The number of constraints which were added to the manager.
+
+        """
+        infos = self.layout_infos()
+        owners = dict(
+            (item.object_id, self.owners[item.object_id])
+            for item in self.items
+        )
+        new_map, ignored, added, removed = convert_user_constraints(
+            self.user_infos(infos), owners, self.cn_map, self.owners
+        )
+        manager.replace_constraints(removed, added)
+        self.owners = owners
+        self.cn_map = new_map
+        return len(added)
+
+
+def clear_caches(layout):
+    """ Clear the constraint caches of the items of a layout.
+
+    """
+    for item in layout.items:
+        item._layout_cache = None
+
+
+def bench_tree(kind, tree):
+    """ Time the stages of the layout of a tree.
+
+    """
+    root, items, arrange = tree
+    layout = NullLayout(root)
+
+    def generate():
+        clear_caches(layout)
+        layout.layout_infos()
+
+    infos = layout.layout_infos()
+
+    def convert():
+        NullLayout(root).constraints(infos)
+
+    cns = layout.constraints(infos)
+
+    def initialize():
+        LayoutManager().initialize(cns)
+
+    manager = LayoutManager()
+    manager.initialize(cns)
+    box = layout.owners[root.object_id]
+    width = box.primitive('width')
+    height = box.primitive('height')
+    min_width, min_height = manager.get_min_size(width, height)
+    sizes = [
+        (int(min_width * factor), int(min_height * factor))
+        for factor in (1.0, 1.25, 1.5, 2.0)
+    ]
+
+    def resize():
+        for size in sizes:
+            manager.layout(lambda: None, width, height, size)
+
+    swapped = [items[1], items[0]] + list(items[2:])
+    orders = cycle([swapped, items])
+    size = sizes[-1]
+    replaced = []
+
+    def relayout():
+        # Move a widget by swapping the first two items of the root,
+        # then update the solver and solve for the current size.
+        root.constraints = arrange(orders.next())
+        replaced.append(layout.relayout(manager))
+        manager.layout(lambda: None, width, height, size)
+
+    extra = {
+        'tree': kind,
+        'widgets': len(layout.items),
+        'constraints': len(cns),
+    }
+    results = [
+        result(SUITE, 'generate', best_time(generate, repeat=3), **extra),
+        result(SUITE, 'convert', best_time(convert, repeat=3), **extra),
+        result(SUITE, 'initialize', best_time(initialize, repeat=3), **extra),
+        result(SUITE, 'resize', best_time(resize, repeat=3) / len(sizes),
+               **extra),
+    ]
+    reset_layout_cache_stats()
+    seconds = best_time(relayout, repeat=3)
+    stats = layout_cache_stats()
+    results.append(
+        result(SUITE, 'relayout', seconds, cache_hit_rate=stats['hit_rate'],
+               replaced=replaced[-1], **extra)
+    )
+    return results
+
+
+#------------------------------------------------------------------------------
+# Constraint Info Benchmarks
+#------------------------------------------------------------------------------
+def bench_layout_info(rows, cols):
+    container = build_grid(rows, cols)[0]
+
+    def cached():
+        # The layout info of a relayout which is not caused by a change
+        # to the inputs of constraint generation, such as a change to a
+        # hug policy.
+        container._layout_info()
+
+    def regenerate():
+        container._layout_cache = None
+        container._layout_info()
+
+    reset_layout_cache_stats()
+    seconds = best_time(cached, repeat=3)
+    stats = layout_cache_stats()
+    cells = rows * cols
+    return [
+        result(SUITE, 'layout_info_uncached',
+               best_time(regenerate, repeat=3), cells=cells),
+        result(SUITE, 'layout_info_cached', seconds, cells=cells,
+               cache_hits=stats['hits'], cache_misses=stats['misses']),
+    ]
+
+
+def bench_encoding(rows, cols):
+    container = build_grid(rows, cols)[0]
+    cns = list(expand_constraints(container, container.constraints))
+    dicts = [cn.as_dict() for cn in cns]
+    table = encode_constraints(cns)
+    payload = json.dumps(table)
+
+    def encode_dicts():
+        [cn.as_dict() for cn in cns]
+
+    def encode():
+        encode_constraints(cns)
+
+    def decode():
+        decode_constraints(json.loads(payload))
+
+    count = len(cns)
+    return [
+        result(SUITE, 'encode_dicts', best_time(encode_dicts, repeat=3),
+               constraints=count, payload_bytes=len(json.dumps(dicts))),
+        result(SUITE, 'encode_compact', best_time(encode, repeat=3),
+               constraints=count, payload_bytes=len(payload)),
+        result(SUITE, 'decode_compact', best_time(decode, repeat=3),
+               constraints=count),
+    ]
+
+
+def main():
+    results = []
+    results.extend(bench_tree('grid', build_grid(8, 8)))
+    results.extend(bench_tree('nested', build_nested(8, 3)))
+    results.extend(bench_tree('aligned', build_aligned(40)))
+    results.extend(bench_tree('shared', build_shared(8, 5)))
+    results.extend(bench_layout_info(30, 30))
+    results.extend(bench_encoding(30, 30))
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Benchmark the memory used by large numbers of declarative objects.
+
+The memory is measured as the growth of the resident set size of the
+process, so this benchmark should be run in a fresh process. It does
+not require a display or a gui toolkit.
+
+"""
+import gc
+import resource
+import time
+
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.core.parser import parse
+
+from benchutils import report, result
+
+
+SUITE = 'memory'
+
+
+SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Item(Declarative):
+    attr label = 'item'
+    attr value << label + '!'
+    label ::
+        pass
+
+enamldef Plain(Declarative):
+    pass
+"""
+
+
+def resident_bytes():
+    """ Get the resident set size of the process in bytes.
+
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize()
+    except IOError:
+        # ru_maxrss is a high water mark, which is sufficient for a
+        # benchmark which only grows the heap.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def bench_objects(cls_name, count, evaluate):
+    code = EnamlCompiler.compile(parse(SOURCE), '<bench_memory>')
+    namespace = {}
+    exec code in namespace
+    cls = namespace[cls_name]
+    gc.collect()
+    before = resident_bytes()
+    start = time.time()
+    items = []
+    for ignored in xrange(count):
+        item = cls()
+        item.initialize()
+        if evaluate:
+            item.value
+        items.append(item)
+    seconds = time.time() - start
+    gc.collect()
+    used = resident_bytes() - before
+    return result(
+        SUITE, cls_name.lower(), seconds / count, objects=count,
+        bytes_per_object=float(used) / count,
+    )
+
+
+def main():
+    results = [
+        bench_objects('Plain', 100000, False),
+        bench_objects('Item', 100000, True),
+    ]
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
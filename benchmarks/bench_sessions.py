@@ -0,0 +1,128 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Benchmark session creation and messaging with a NullApplication.
+
+This benchmark does not require a display or a gui toolkit.
+
+"""
+import time
+
+from enaml.null.null_application import NullApplication
+from enaml.session import Session
+from enaml.widgets.container import Container
+from enaml.widgets.label import Label
+from enaml.widgets.window import Window
+
+from benchutils import best_time, report, result
+
+
+SUITE = 'sessions'
+
+
+class WideSession(Session):
+    """ A session with a window holding many containers.
+
+    """
+    def __init__(self, width=100):
+        super(WideSession, self).__init__()
+        self.width = width
+
+    def on_open(self):
+        window = Window()
+        body = Container(window)
+        for idx in xrange(self.width):
+            Container(body, name='item_%d' % idx)
+        self.windows.append(window)
+
+
+def bench_start_session(app, count):
+    def run():
+        for ignored in xrange(count):
+            app.start_session('wide')
+        app.process_events()
+        for session in app.sessions():
+            app.end_session(session.session_id)
+        app.process_events()
+    seconds = best_time(run, repeat=3) / count
+    return result(SUITE, 'start_session', seconds, sessions=count)
+
+
+def bench_snapshot(app):
+    session_id = app.start_session('wide')
+    session = app.session(session_id)
+    seconds = best_time(session.snapshot, repeat=5, number=10)
+    app.end_session(session_id)
+    app.process_events()
+    return result(SUITE, 'snapshot', seconds)
+
+
+def bench_messages(app, count):
+    session_id = app.start_session('wide')
+    app.process_events()
+    stats = app.client_stats(session_id)
+    stats.reset()
+    window = app.session(session_id).windows[0]
+    start = time.time()
+    for idx in xrange(count):
+        window.title = 'title %d' % idx
+    app.process_events()
+    seconds = time.time() - start
+    app.end_session(session_id)
+    app.process_events()
+    return result(
+        SUITE, 'messages', seconds, messages=count,
+        mean_latency=stats.mean_latency(), total_bytes=stats.total_bytes,
+    )
+
+
+def bench_close_panel(app, rows, cols, repeat=3):
+    """ Time the destruction of a large panel of an active session.
+
+    """
+    session_id = app.start_session('wide')
+    app.process_events()
+    window = app.session(session_id).windows[0]
+    stats = app.client_stats(session_id)
+    best = None
+    for ignored in xrange(repeat):
+        panel = Container()
+        for row in xrange(rows):
+            parent = Container(panel)
+            for col in xrange(cols):
+                Label(parent, text='%d, %d' % (row, col))
+        window.insert_children(None, [panel])
+        app.process_events()
+        stats.reset()
+        start = time.time()
+        panel.destroy()
+        app.process_events()
+        seconds = time.time() - start
+        if best is None or seconds < best:
+            best = seconds
+    app.end_session(session_id)
+    app.process_events()
+    return result(
+        SUITE, 'close_panel', best, widgets=rows * (cols + 1) + 1,
+        messages=sum(stats.action_counts.itervalues()),
+    )
+
+
+def main():
+    factory = WideSession.factory('wide')
+    app = NullApplication([factory], measure_size=True)
+    try:
+        results = [
+            bench_start_session(app, 50),
+            bench_snapshot(app),
+            bench_messages(app, 10000),
+            bench_close_panel(app, 300, 9),
+        ]
+    finally:
+        app.destroy()
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Benchmark the registered solver backends of the LayoutManager.
+
+Each backend is timed on the same system of constraints: a row of
+cells which share the width of a container. This benchmark does not
+require a display or a gui toolkit.
+
+"""
+from enaml.layout.layout_manager import LayoutManager
+from enaml.layout.solver_backend import (
+    create_variable, registered_backends, using_backend
+)
+
+from benchutils import best_time, report, result
+
+
+SUITE = 'solver'
+
+
+def build_system(variable, cells):
+    """ Build a system of constraints for a row of equal width cells.
+
+    Returns
+    -------
+    result : (list, width, height, lefts)
+        The constraints, the width and height variables of the
+        container and the left variables of the cells.
+
+    """
+    width = variable('width')
+    height = variable('height')
+    cns = [width >= 0, height >= 0]
+    lefts = []
+    prev = None
+    for idx in xrange(cells):
+        left = variable('left_%d' % idx)
+        cell_width = variable('width_%d' % idx)
+        cns.append(cell_width >= 10)
+        cns.append((cell_width == 50) | 'weak')
+        if prev is None:
+            cns.append(left == 0)
+        else:
+            prev_left, prev_width = prev
+            cns.append(left == prev_left + prev_width + 10)
+            cns.append((cell_width == prev_width) | 'strong')
+        lefts.append(left)
+        prev = (left, cell_width)
+    cns.append(prev[0] + prev[1] <= width)
+    return cns, width, height, lefts
+
+
+def bench_backend(name, cells):
+    """ Benchmark the default backend, which is named by `name`.
+
+    """
+    def init():
+        cns, width, height, lefts = build_system(create_variable, cells)
+        manager = LayoutManager()
+        manager.initialize(cns)
+
+    cns, width, height, lefts = build_system(create_variable, cells)
+    manager = LayoutManager()
+    manager.initialize(cns)
+
+    sizes = [(cells * factor, 100) for factor in (20, 40, 60, 80)]
+
+    def resize():
+        for size in sizes:
+            manager.layout(lambda: None, width, height, size)
+
+    extra = [(left >= 5 * idx) | 'medium' for idx, left in enumerate(lefts)]
+
+    def add_remove():
+        manager.replace_constraints([], extra)
+        manager.replace_constraints(extra, [])
+
+    return [
+        result(SUITE, 'init', best_time(init, repeat=3),
+               backend=name, cells=cells),
+        result(SUITE, 'resize', best_time(resize, repeat=3) / len(sizes),
+               backend=name, cells=cells),
+        result(SUITE, 'add_remove', best_time(add_remove, repeat=3),
+               backend=name, cells=cells, constraints=len(extra)),
+    ]
+
+
+def main():
+    results = []
+    for name in registered_backends():
+        with using_backend(name):
+            results.extend(bench_backend(name, 50))
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Utilities shared by the Enaml benchmark scripts.
+
+Each benchmark produces a list of result dicts which are written as
+JSON, so that results can be compared across releases.
+
+"""
+import json
+import platform
+import sys
+import time
+
+
+def best_time(func, repeat=5, number=1):
+    """ Time a callable and return the best time per call.
+
+    Parameters
+    ----------
+    func : callable
+        The callable to time. It is called with no arguments.
+
+    repeat : int, optional
+        The number of timing runs. The best run is reported.
+
+    number : int, optional
+        The number of calls to make in each timing run.
+
+    Returns
+    -------
+    result : float
+        The best time in seconds for a single call.
+
+    """
+    best = None
+    clock = time.time
+    for ignored in xrange(repeat):
+        start = clock()
+        for ignored in xrange(number):
+            func()
+        elapsed = (clock() - start) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def result(suite, name, seconds, **extra):
+    """ Create a result dict for a benchmark.
+
+    Parameters
+    ----------
+    suite : str
+        The name of the benchmark suite.
+
+    name : str
+        The name of the benchmark within the suite.
+
+    seconds : float
+        The measured time in seconds.
+
+    **extra
+        Additional JSON serializable values to include in the result.
+
+    """
+    res = {'suite': suite, 'name': name, 'seconds': seconds}
+    res.update(extra)
+    return res
+
+
+def report(results, stream=None):
+    """ Write benchmark results as a JSON document.
+
+    Parameters
+    ----------
+    results : list
+        The list of result dicts to write.
+
+    stream : file, optional
+        The stream to which the results are written. The default is
+        sys.stdout.
+
+    """
+    if stream is None:
+        stream = sys.stdout
+    doc = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    json.dump(doc, stream, indent=2, sort_keys=True)
+    stream.write('\n')
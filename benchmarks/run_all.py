@@ -0,0 +1,152 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Run the Enaml benchmark scripts and collect their results.
+
+Each `bench_*.py` script in this directory is run in its own process
+and the results are merged into a single JSON document. The document
+can be saved and given as the baseline of a later run, in which case
+the results which are slower than the baseline by more than a given
+threshold are reported as regressions.
+
+Examples
+--------
+Run the layout and solver benchmarks and save the results::
+
+    python run_all.py -o release.json layout solver
+
+Compare a new run of all of the benchmarks against the saved results::
+
+    python run_all.py --baseline release.json
+
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+from benchutils import report
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def bench_scripts(names):
+    """ Get the paths of the benchmark scripts to run.
+
+    Parameters
+    ----------
+    names : list
+        The names of the benchmarks to run, such as 'layout' for
+        'bench_layout.py'. All of the benchmarks are run if the list
+        is empty.
+
+    """
+    if not names:
+        return sorted(glob.glob(os.path.join(HERE, 'bench_*.py')))
+    paths = []
+    for name in names:
+        path = os.path.join(HERE, 'bench_%s.py' % name)
+        if not os.path.exists(path):
+            raise ValueError('Unknown benchmark %r' % name)
+        paths.append(path)
+    return paths
+
+
+def run_script(path):
+    """ Run a benchmark script and return its list of results.
+
+    """
+    env = dict(os.environ)
+    root = os.path.dirname(HERE)
+    pythonpath = env.get('PYTHONPATH')
+    env['PYTHONPATH'] = root + os.pathsep + pythonpath if pythonpath else root
+    output = subprocess.check_output(
+        [sys.executable, os.path.basename(path)], cwd=HERE, env=env
+    )
+    return json.loads(output)['results']
+
+
+def result_key(res):
+    """ Compute the key which identifies a result across runs.
+
+    The key is the suite, the name, and the string valued parameters
+    of the result, such as the tree or the backend of a benchmark.
+
+    """
+    params = sorted(
+        (k, v) for k, v in res.iteritems()
+        if k not in ('suite', 'name') and isinstance(v, basestring)
+    )
+    return (res['suite'], res['name']) + tuple(params)
+
+
+def compare(baseline, results, threshold):
+    """ Compare results against a baseline.
+
+    Parameters
+    ----------
+    baseline : list
+        The list of result dicts of the baseline run.
+
+    results : list
+        The list of result dicts of the current run.
+
+    threshold : float
+        The relative slowdown above which a result is a regression.
+
+    Returns
+    -------
+    result : list
+        A list of (key, old seconds, new seconds) tuples for the
+        results which regressed.
+
+    """
+    old = dict((result_key(res), res['seconds']) for res in baseline)
+    regressions = []
+    for res in results:
+        key = result_key(res)
+        seconds = old.get(key)
+        if seconds and res['seconds'] > seconds * (1.0 + threshold):
+            regressions.append((key, seconds, res['seconds']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help='the benchmarks to run, e.g. layout')
+    parser.add_argument('-o', '--output', help='the file for the results')
+    parser.add_argument('--baseline', help='the results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='the relative slowdown of a regression')
+    args = parser.parse_args()
+
+    results = []
+    for path in bench_scripts(args.names):
+        results.extend(run_script(path))
+
+    if args.output:
+        with open(args.output, 'w') as stream:
+            report(results, stream)
+    else:
+        report(results)
+
+    if args.baseline:
+        with open(args.baseline) as stream:
+            baseline = json.load(stream)['results']
+        regressions = compare(baseline, results, args.threshold)
+        for key, old, new in regressions:
+            params = ['%s=%s' % param for param in key[2:]]
+            label = ' '.join(list(key[:2]) + params)
+            msg = 'REGRESSION %s: %.6fs -> %.6fs\n'
+            sys.stderr.write(msg % (label, old, new))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ from heapq import heappush, heappop
 from itertools import count
 import logging
 from threading import Lock
+import time
 
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,10 @@ class ScheduledTask(object):
         self._valid = True
         self._pending = True
         self._notify = None
+        self._schedule_time = time.time()
+        self._priority = 0
+        self._key = None
+        self._deadline = None
 
     #--------------------------------------------------------------------------
     # Private API
@@ -109,6 +114,13 @@ class Application(object):
     #: Private storage for the singleton application instance.
     _instance = None
 
+    #: The time budget, in milliseconds, for executing scheduled tasks
+    #: in a single cycle of the event loop. Tasks are executed until
+    #: the budget is exhausted, after which the remaining tasks are
+    #: deferred to a later cycle so that input and paint events can be
+    #: processed. A budget of zero executes one task per cycle.
+    task_budget_ms = 8
+
     @staticmethod
     def instance():
         """ Get the global Application instance.
@@ -151,30 +163,67 @@ class Application(object):
         self._task_heap = []
         self._counter = count()
         self._heap_lock = Lock()
+        self._drain_pending = False
+        self._keyed_tasks = {}
+        self._task_stats = {
+            'executed': 0, 'cycles': 0, 'max_depth': 0, 'coalesced': 0,
+            'dropped': 0, 'total_wait': 0.0, 'max_wait': 0.0,
+        }
         self.add_factories(factories)
 
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
-    def _process_task(self, task):
-        """ Processes the given task, then dispatches the next task.
-
-        """
-        try:
-            task._execute()
-        finally:
-            self._next_task()
+    def _process_tasks(self):
+        """ Process the tasks on the heap until the task time budget
+        is exhausted.
 
-    def _next_task(self):
-        """ Pulls the next task off the heap and processes it on the
-        main gui thread.
+        At least one task is processed per call. If tasks remain on the
+        heap when the budget is exhausted, their processing is deferred
+        to a later cycle of the event loop, which gives the toolkit a
+        chance to process its own events. Stale heap entries of tasks
+        which were promoted to a higher priority are skipped, and tasks
+        whose deadline has passed are dropped.
 
         """
+        clock = time.time
+        start = clock()
+        budget = self.task_budget_ms / 1000.0
+        stats = self._task_stats
+        stats['cycles'] += 1
         heap = self._task_heap
-        with self._heap_lock:
-            if heap:
+        first = True
+        while True:
+            with self._heap_lock:
+                if not heap:
+                    self._drain_pending = False
+                    return
+                if not first and clock() - start >= budget:
+                    self.deferred_call(self._process_tasks)
+                    return
                 priority, ignored, task = heappop(heap)
-                self.deferred_call(self._process_task, task)
+                if not task._pending:
+                    continue
+                key = task._key
+                if key is not None and self._keyed_tasks.get(key) is task:
+                    del self._keyed_tasks[key]
+            first = False
+            now = clock()
+            deadline = task._deadline
+            if deadline is not None and now > deadline:
+                stats['dropped'] += 1
+                task.unschedule()
+                task._execute()
+                continue
+            wait = now - task._schedule_time
+            stats['executed'] += 1
+            stats['total_wait'] += wait
+            if wait > stats['max_wait']:
+                stats['max_wait'] = wait
+            try:
+                task._execute()
+            except Exception:
+                logger.exception('Exception occured in scheduled task:')
 
     #--------------------------------------------------------------------------
     # Abstract API
@@ -312,11 +361,18 @@ class Application(object):
     #--------------------------------------------------------------------------
     # Public API
     #--------------------------------------------------------------------------
-    def schedule(self, callback, args=None, kwargs=None, priority=0):
+    def schedule(self, callback, args=None, kwargs=None, priority=0,
+                 key=None, deadline=None):
         """ Schedule a callable to be executed on the event loop thread.
 
         This call is thread-safe.
 
+        If a key is given and a task with the same key is pending, the
+        pending task is updated to execute the new callable and is
+        returned instead of a new task. The pending task keeps its
+        place in the queue unless the new priority is higher, in which
+        case it is promoted.
+
         Parameters
         ----------
         callback : callable
@@ -333,6 +389,16 @@ class Application(object):
             lower priority, larger values indicate higher priority. The
             default priority is zero.
 
+        key : hashable, optional
+            The coalescing key for the task. A task scheduled with the
+            same key as a pending task replaces the callable of that
+            task. The default is None and indicates no coalescing.
+
+        deadline : int, optional
+            The time, in milliseconds, after which the task is dropped
+            if it has not yet been executed. The default is None and
+            indicates that the task is never dropped.
+
         Returns
         -------
         result : ScheduledTask
@@ -345,17 +411,40 @@ class Application(object):
             args = ()
         if kwargs is None:
             kwargs = {}
-        task = ScheduledTask(callback, args, kwargs)
+        if deadline is not None:
+            deadline = time.time() + deadline / 1000.0
         heap = self._task_heap
+        keyed = self._keyed_tasks
+        stats = self._task_stats
         with self._heap_lock:
-            needs_start = len(heap) == 0
+            needs_start = not self._drain_pending
+            self._drain_pending = True
+            task = None
+            if key is not None:
+                task = keyed.get(key)
+                if task is not None and not task._valid:
+                    task = None
+            if task is not None:
+                stats['coalesced'] += 1
+                task._callback = callback
+                task._args = args
+                task._kwargs = kwargs
+                task._deadline = deadline
+                if priority <= task._priority:
+                    return task
+            else:
+                task = ScheduledTask(callback, args, kwargs)
+                task._key = key
+                task._deadline = deadline
+                if key is not None:
+                    keyed[key] = task
+            task._priority = priority
             item = (-priority, self._counter.next(), task)
             heappush(heap, item)
+            if len(heap) > stats['max_depth']:
+                stats['max_depth'] = len(heap)
         if needs_start:
-            if self.is_main_thread():
-                self._next_task()
-            else:
-                self.deferred_call(self._next_task)
+            self.deferred_call(self._process_tasks)
         return task
 
     def has_pending_tasks(self):
@@ -372,6 +461,29 @@ class Application(object):
             has_pending = len(heap) > 0
         return has_pending
 
+    def task_stats(self):
+        """ Get the statistics of the task scheduler.
+
+        Returns
+        -------
+        result : dict
+            A dict with the number of 'pending' tasks, the number of
+            'executed' tasks, the number of event loop 'cycles' used to
+            execute them, the 'max_depth' of the task queue, the number
+            of 'coalesced' and 'dropped' tasks, and the 'mean_wait' and
+            'max_wait' time in seconds between the scheduling and the
+            execution of a task.
+
+        """
+        with self._heap_lock:
+            pending = len(self._task_heap)
+            stats = self._task_stats.copy()
+        executed = stats['executed']
+        total_wait = stats.pop('total_wait')
+        stats['pending'] = pending
+        stats['mean_wait'] = total_wait / executed if executed else 0.0
+        return stats
+
     def add_factories(self, factories):
         """ Add session factories to the application.
 
@@ -419,6 +531,8 @@ class Application(object):
         """
         for session in self.sessions():
             self.end_session(session.session_id)
+        for factory in self._all_factories:
+            factory.clear_pool()
         self._all_factories = []
         self._named_factories = {}
         Application._instance = None
@@ -498,7 +612,8 @@ def is_main_thread():
     return app.is_main_thread()
 
 
-def schedule(callback, args=None, kwargs=None, priority=0):
+def schedule(callback, args=None, kwargs=None, priority=0, key=None,
+             deadline=None):
     """ Schedule a callable to be executed on the event loop thread.
 
     This call is thread-safe.
@@ -523,6 +638,16 @@ def schedule(callback, args=None, kwargs=None, priority=0):
         lower priority, larger values indicate higher priority. The
         default priority is zero.
 
+    key : hashable, optional
+        The coalescing key for the task. A task scheduled with the
+        same key as a pending task replaces the callable of that
+        task. The default is None and indicates no coalescing.
+
+    deadline : int, optional
+        The time, in milliseconds, after which the task is dropped
+        if it has not yet been executed. The default is None and
+        indicates that the task is never dropped.
+
     Returns
     -------
     result : ScheduledTask
@@ -534,5 +659,5 @@ def schedule(callback, args=None, kwargs=None, priority=0):
     app = Application.instance()
     if app is None:
         raise RuntimeError('Application instance does not exist')
-    return app.schedule(callback, args, kwargs, priority)
+    return app.schedule(callback, args, kwargs, priority, key, deadline)
 
@@ -4,6 +4,7 @@
 #------------------------------------------------------------------------------
 from .conditional import Conditional
 from .declarative import Declarative
+from .expressions import RefreshBatch
 from .include import Include
 from .looper import Looper
 from .messenger import Messenger
@@ -0,0 +1,154 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+class BindingTable(tuple):
+    """ A compact and immutable mapping of attribute name to binding.
+
+    A BindingTable is a tuple of alternating keys and values. Most
+    declarative objects have only a handful of bindings, and for such
+    small tables a flat tuple is several times smaller than a dict and
+    is searched just as quickly. An empty table is shared by all of the
+    objects which have no bindings.
+
+    The table is immutable. The `set` method returns a new table with
+    the given key set to the given value.
+
+    """
+    __slots__ = ()
+
+    def __new__(cls, items=()):
+        """ Create a new BindingTable.
+
+        Parameters
+        ----------
+        items : iterable, optional
+            An iterable of (key, value) pairs for the table.
+
+        """
+        flat = []
+        for key, value in items:
+            flat.append(key)
+            flat.append(value)
+        return super(BindingTable, cls).__new__(cls, flat)
+
+    def _index(self, key):
+        """ Get the index of the given key in the tuple, or -1 if the
+        key is not in the table.
+
+        """
+        # The search is done by the C implementation of tuple.index. A
+        # match at an odd index is a value which compares equal to the
+        # key, so the search resumes after it.
+        start = 0
+        try:
+            while True:
+                idx = tuple.index(self, key, start)
+                if not idx & 1:
+                    return idx
+                start = idx + 1
+        except ValueError:
+            return -1
+
+    def __getitem__(self, key):
+        """ Get the value for the given key.
+
+        Raises
+        ------
+        KeyError
+            The key is not in the table.
+
+        """
+        idx = self._index(key)
+        if idx < 0:
+            raise KeyError(key)
+        return tuple.__getitem__(self, idx + 1)
+
+    def __contains__(self, key):
+        """ Returns True if the key is in the table, False otherwise.
+
+        """
+        return self._index(key) >= 0
+
+    def __len__(self):
+        """ Returns the number of keys in the table.
+
+        """
+        return tuple.__len__(self) >> 1
+
+    def __iter__(self):
+        """ Returns an iterator over the keys of the table.
+
+        """
+        return iter(self.keys())
+
+    def __repr__(self):
+        """ A pretty representation of the table.
+
+        """
+        return 'BindingTable(%r)' % self.items()
+
+    def get(self, key, default=None):
+        """ Get the value for the given key, or the default if the key
+        is not in the table.
+
+        """
+        idx = self._index(key)
+        if idx < 0:
+            return default
+        return tuple.__getitem__(self, idx + 1)
+
+    def keys(self):
+        """ Get a list of the keys of the table.
+
+        """
+        return list(tuple.__getslice__(self, 0, tuple.__len__(self))[::2])
+
+    def values(self):
+        """ Get a list of the values of the table.
+
+        """
+        return list(tuple.__getslice__(self, 0, tuple.__len__(self))[1::2])
+
+    def items(self):
+        """ Get a list of the (key, value) pairs of the table.
+
+        """
+        return zip(self.keys(), self.values())
+
+    def iteritems(self):
+        """ Get an iterator over the (key, value) pairs of the table.
+
+        """
+        return iter(self.items())
+
+    def set(self, key, value):
+        """ Get a new table with the given key set to the value.
+
+        Parameters
+        ----------
+        key : str
+            The key to set in the new table.
+
+        value : object
+            The value for the key.
+
+        Returns
+        -------
+        result : BindingTable
+            A new table which is a copy of this table with the key
+            set to the given value.
+
+        """
+        flat = list(tuple.__getslice__(self, 0, tuple.__len__(self)))
+        idx = self._index(key)
+        if idx < 0:
+            flat.append(key)
+            flat.append(value)
+        else:
+            flat[idx + 1] = value
+        return tuple.__new__(BindingTable, flat)
+
+
+#: The shared empty binding table.
+EMPTY_TABLE = BindingTable()
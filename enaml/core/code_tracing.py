@@ -20,6 +20,8 @@ class CodeTracer(object):
     method is ignored; exceptions are propagated.
 
     """
+    __slots__ = ()
+
     def load_attr(self, obj, attr):
         """ Called before the LOAD_ATTR opcode is executed.
 
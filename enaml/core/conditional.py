@@ -4,7 +4,7 @@
 #------------------------------------------------------------------------------
 from traits.api import Bool, Tuple, Property
 
-from .declarative import scope_lookup
+from .declarative import prepare_description
 from .templated import Templated
 
 
@@ -107,7 +107,7 @@ class Conditional(Templated):
                 # parented via `insert_children` later on.
                 scope = identifiers.copy()
                 for descr in descriptions:
-                    cls = scope_lookup(descr['type'], f_globals, descr)
+                    cls = prepare_description(descr, f_globals).resolve_type()
                     instance = cls()
                     with instance.children_event_context():
                         instance.populate(descr, scope, f_globals)
@@ -5,11 +5,13 @@
 from types import FunctionType
 
 from traits.api import (
-    Any, Property, Disallow, ReadOnly, CTrait, Instance, Uninitialized,
+    Any, Bool, Property, Disallow, ReadOnly, CTrait, Uninitialized,
 )
 
+from .binding_table import EMPTY_TABLE
 from .dynamic_scope import DynamicAttributeError
 from .exceptions import DeclarativeNameError, OperatorLookupError
+from .expressions import RefreshBatch
 from .object import Object
 from .operator_context import OperatorContext
 from .trait_types import EnamlInstance, EnamlEvent
@@ -149,12 +151,69 @@ def _wired_setter(obj, name, value):
     setattr(obj, name, value)
 
 
-def _wire_default(obj, name):
+def _unwire_lazy(obj, name):
+    """ Restore the trait and the stale value of a deferred expression.
+
+    This is a private function used by Declarative for the lazy
+    evaluation of the expressions of hidden subtrees.
+
+    """
+    itraits = obj._instance_traits()
+    trait = itraits[name]
+    itraits[name] = trait._shadowed
+    stale = trait._stale
+    if stale is not Uninitialized:
+        obj.__dict__[name] = stale
+
+
+def _lazy_getter(obj, name):
+    """ The getter of an attribute with a deferred expression.
+
+    This is a private function used by Declarative to evaluate a dirty
+    expression of a hidden lazy subtree when its attribute is read.
+    Unlike the default getter, the value is set with notification.
+
+    """
+    _unwire_lazy(obj, name)
+    val = obj.eval_expression(name)
+    if val is not NotImplemented:
+        setattr(obj, name, val)
+    return getattr(obj, name)
+
+
+def _lazy_setter(obj, name, value):
+    """ The setter of an attribute with a deferred expression.
+
+    This is a private function used by Declarative for the lazy
+    evaluation of the expressions of hidden subtrees.
+
+    """
+    _unwire_lazy(obj, name)
+    setattr(obj, name, value)
+
+
+def _wire_lazy(obj, name):
+    """ Wire the trait of a deferred expression.
+
+    This is a private function used by Declarative for the lazy
+    evaluation of the expressions of hidden subtrees. Traits returns
+    a value in the instance dict without consulting the trait, so the
+    stale value is moved to the wired trait until it is unwired.
+
+    """
+    _wire_default(obj, name, _lazy_getter, _lazy_setter)
+    trait = obj._instance_traits()[name]
+    trait._stale = obj.__dict__.pop(name, Uninitialized)
+    trait._lazy = True
+
+
+def _wire_default(obj, name, getter=_wired_getter, setter=_wired_setter):
     """ Wire an expression trait for default value computation.
 
     This is a private function used by Declarative for allowing default
     values of attributes to be provided by bound expression objects
-    without requiring an explicit initialization graph.
+    without requiring an explicit initialization graph. It is also used
+    to wire the traits of deferred expressions.
 
     """
     # This is a low-level performance hack that bypasses a mountain
@@ -164,7 +223,7 @@ def _wire_default(obj, name):
     # A new 'event' trait type (defaults are overridden)
     trait = CTrait(4)
     # Override defaults with 2-arg getter, 3-arg setter, no validator
-    trait.property(_wired_getter, 2, _wired_setter, 3, None, 0)
+    trait.property(getter, 2, setter, 3, None, 0)
     # Provide a handler else dynamic creation kills performance
     trait.handler = Any
     shadow = obj._trait(name, 2)
@@ -173,6 +232,11 @@ def _wire_default(obj, name):
     obj._instance_traits()[name] = trait
 
 
+#: The number of lazy objects which are currently hidden. The search
+#: for a hidden lazy ancestor is skipped entirely while this is zero.
+_hidden_lazy_count = 0
+
+
 class ListenerNotifier(object):
     """ A lightweight trait change notifier used by Declarative.
 
@@ -223,9 +287,190 @@ def scope_lookup(name, scope, description):
     return item
 
 
+def _make_binding_func(binding, f_globals):
+    """ Create the function for a binding dict and a globals dict.
+
+    """
+    code = binding['code']
+    # If the code is a tuple, it represents a delegation
+    # expression which is a combination of subscription
+    # and update functions.
+    if isinstance(code, tuple):
+        sub_code, upd_code = code
+        func = FunctionType(sub_code, f_globals)
+        func._update = FunctionType(upd_code, f_globals)
+    else:
+        func = FunctionType(code, f_globals)
+        # A subscription which is a plain dotted chain of names
+        # carries the chain, which enables a static fast path.
+        if 'chain' in binding:
+            func._chain = binding['chain']
+    return func
+
+
+def _lookup_operator(operators, binding):
+    """ Lookup the operator for a binding dict in an operator context.
+
+    """
+    opname = binding['operator']
+    try:
+        return operators[opname]
+    except KeyError:
+        filename = binding['filename']
+        lineno = binding['lineno']
+        block = binding['block']
+        raise OperatorLookupError(opname, filename, lineno, block)
+
+
+class PreparedDescription(object):
+    """ The prepared state of a description dict for a globals dict.
+
+    The binding functions and the child types of a description depend
+    only on the description and the globals of the enamldef module, so
+    they are computed the first time an object is populated from the
+    description and reused for every subsequent object. This makes the
+    N-th instantiation of an enamldef or of a loop template nearly free
+    of setup work. The binding functions are shared by the objects,
+    since the expressions evaluate them with a per-object scope.
+
+    Instances of this class should be retrieved with the function
+    `prepare_description`.
+
+    """
+    __slots__ = (
+        'description', 'f_globals', '_funcs', '_operators', '_bindings',
+        '_children', '_type',
+    )
+
+    def __init__(self, description, f_globals):
+        """ Initialize a PreparedDescription.
+
+        Parameters
+        ----------
+        description : dict
+            The description dict created by the Enaml compiler.
+
+        f_globals : dict
+            The globals dict for the description.
+
+        """
+        self.description = description
+        self.f_globals = f_globals
+        self._funcs = None
+        self._operators = None
+        self._bindings = None
+        self._children = None
+        self._type = None
+
+    def bindings(self, operators):
+        """ Get the prepared bindings of the description.
+
+        Parameters
+        ----------
+        operators : OperatorContext
+            The operator context in which to lookup the operators.
+
+        Returns
+        -------
+        result : tuple
+            A tuple of (operator, name, func) tuples for the bindings.
+            The last result is cached for the given operator context,
+            which is almost always the shared default context.
+
+        """
+        if operators is self._operators:
+            return self._bindings
+        funcs = self._funcs
+        bindings = self.description['bindings']
+        if funcs is None:
+            f_globals = self.f_globals
+            funcs = [_make_binding_func(b, f_globals) for b in bindings]
+            self._funcs = funcs
+        prepared = []
+        for binding, func in zip(bindings, funcs):
+            operator = _lookup_operator(operators, binding)
+            prepared.append((operator, binding['name'], func))
+        self._operators = operators
+        self._bindings = prepared = tuple(prepared)
+        return prepared
+
+    def children(self):
+        """ Get the child descriptions and their resolved types.
+
+        Returns
+        -------
+        result : tuple
+            A tuple of (description, type) tuples for the children of
+            the description. A DeclarativeNameError is raised if a type
+            cannot be resolved, in which case nothing is cached.
+
+        """
+        children = self._children
+        if children is None:
+            f_globals = self.f_globals
+            children = []
+            for child in self.description['children']:
+                cls = prepare_description(child, f_globals).resolve_type()
+                children.append((child, cls))
+            self._children = children = tuple(children)
+        return children
+
+    def resolve_type(self):
+        """ Get the type named by the description.
+
+        Returns
+        -------
+        result : type
+            The type named by the description in the globals. A
+            DeclarativeNameError is raised if it cannot be resolved.
+
+        """
+        cls = self._type
+        if cls is None:
+            d = self.description
+            cls = self._type = scope_lookup(d['type'], self.f_globals, d)
+        return cls
+
+
+#: The key under which a description dict stores its prepared state.
+#: Storing it on the description ties the lifetime of the prepared
+#: state, and of the globals it holds, to the lifetime of the
+#: description, so the state of a reloaded module is freed with it.
+_PREPARED_KEY = '__prepared__'
+
+
+def prepare_description(description, f_globals):
+    """ Get the PreparedDescription for a description and globals.
+
+    Parameters
+    ----------
+    description : dict
+        The description dict created by the Enaml compiler.
+
+    f_globals : dict
+        The globals dict for the description.
+
+    Returns
+    -------
+    result : PreparedDescription
+        The cached prepared description. A new one is created if the
+        description has not yet been prepared with the given globals.
+
+    """
+    prepared = description.get(_PREPARED_KEY)
+    if (prepared is None or prepared.f_globals is not f_globals or
+        prepared.description is not description):
+        prepared = PreparedDescription(description, f_globals)
+        description[_PREPARED_KEY] = prepared
+    return prepared
+
+
 def setup_bindings(instance, bindings, identifiers, f_globals):
     """ Setup the expression bindings for a declarative instance.
 
+    This creates new binding functions on each call. The populate
+    methods use the cached functions of `prepare_description` instead.
+
     Parameters
     ----------
     instance : Declarative
@@ -243,24 +488,8 @@ def setup_bindings(instance, bindings, identifiers, f_globals):
     """
     operators = instance.operators
     for binding in bindings:
-        opname = binding['operator']
-        try:
-            operator = operators[opname]
-        except KeyError:
-            filename = binding['filename']
-            lineno = binding['lineno']
-            block = binding['block']
-            raise OperatorLookupError(opname, filename, lineno, block)
-        code = binding['code']
-        # If the code is a tuple, it represents a delegation
-        # expression which is a combination of subscription
-        # and update functions.
-        if isinstance(code, tuple):
-            sub_code, upd_code = code
-            func = FunctionType(sub_code, f_globals)
-            func._update = FunctionType(upd_code, f_globals)
-        else:
-            func = FunctionType(code, f_globals)
+        operator = _lookup_operator(operators, binding)
+        func = _make_binding_func(binding, f_globals)
         operator(instance, binding['name'], func, identifiers)
 
 
@@ -286,19 +515,32 @@ class Declarative(Object):
     #: by user code.
     operators = ReadOnly
 
-    #: The dictionary of bound expression objects. XXX These dicts are
-    #: typically small and waste space. We need to switch to a more
-    #: space efficient hash table at some point in the future. For
+    #: The table of bound expression objects. A BindingTable is used
+    #: instead of a dict since these tables are typically small. For
     #: pathological cases of large numbers of objects, the savings
-    #: can be as high as 20% of the heap size.
-    _expressions = Instance(dict, ())
-
-    #: The dictionary of bound listener objects. XXX These dicts are
-    #: typically small and waste space. We need to switch to a more
-    #: space efficient hash table at some point in the future. For
-    #: pathological cases of large numbers of objects, the savings
-    #: can be as high as 20% of the heap size.
-    _listeners = Instance(dict, ())
+    #: can be as high as 20% of the heap size. Objects without bound
+    #: expressions share the empty table.
+    _expressions = Any(EMPTY_TABLE)
+
+    #: The table of tuples of bound listener objects. This follows the
+    #: same design as the table of expressions.
+    _listeners = Any(EMPTY_TABLE)
+
+    #: Whether the `<<` expressions of this object and its descendants
+    #: are evaluated lazily while this object is hidden. A change to a
+    #: dependency of such an expression only marks it as dirty. A dirty
+    #: expression is evaluated when its attribute is read, or when the
+    #: object is no longer hidden. An expression which reads a dirty
+    #: attribute is not notified until then, so visible state should
+    #: not depend on the attributes of a hidden lazy subtree.
+    lazy = Bool(False)
+
+    #: Whether this object is lazy and currently hidden.
+    _lazy_hidden = Bool(False)
+
+    #: The dict of the dirty expressions of the hidden subtree, keyed
+    #: on (id(owner), name), or None if there are none.
+    _lazy_dirty = Any
 
     def __init__(self, parent=None, **kwargs):
         """ Initialize a declarative component.
@@ -387,13 +629,12 @@ class Declarative(Object):
         ident = description['identifier']
         if ident:
             identifiers[ident] = self
-        bindings = description['bindings']
-        if len(bindings) > 0:
-            setup_bindings(self, bindings, identifiers, f_globals)
-        children = description['children']
-        if len(children) > 0:
-            for child in children:
-                cls = scope_lookup(child['type'], f_globals, child)
+        prepared = prepare_description(description, f_globals)
+        if len(description['bindings']) > 0:
+            for operator, name, func in prepared.bindings(self.operators):
+                operator(self, name, func, identifiers)
+        if len(description['children']) > 0:
+            for child, cls in prepared.children():
                 instance = cls(self)
                 with instance.children_event_context():
                     instance.populate(child, identifiers, f_globals)
@@ -485,10 +726,10 @@ class Declarative(Object):
         if curr is None or curr.trait_type is Disallow:
             msg = "Cannot bind expression. %s object has no attribute '%s'"
             raise AttributeError(msg % (self, name))
-        dct = self._expressions
-        if name not in dct:
+        table = self._expressions
+        if name not in table:
             _wire_default(self, name)
-        dct[name] = expression
+        self._expressions = table.set(name, expression)
 
     def bind_listener(self, name, listener):
         """ A private method used by the Enaml execution engine.
@@ -513,12 +754,13 @@ class Declarative(Object):
         if curr is None or curr.trait_type is Disallow:
             msg = "Cannot bind listener. %s object has no attribute '%s'"
             raise AttributeError(msg % (self, name))
-        dct = self._listeners
-        if name not in dct:
-            dct[name] = [listener]
+        table = self._listeners
+        listeners = table.get(name)
+        if listeners is None:
+            self._listeners = table.set(name, (listener,))
             self.add_notifier(name, ListenerNotifier)
         else:
-            dct[name].append(listener)
+            self._listeners = table.set(name, listeners + (listener,))
 
     def eval_expression(self, name):
         """ Evaluate a bound expression with the given name.
@@ -535,20 +777,30 @@ class Declarative(Object):
             if there is no expression bound to the given name.
 
         """
-        dct = self._expressions
-        if name in dct:
-            return dct[name].eval(self, name)
+        expr = self._expressions.get(name)
+        if expr is not None:
+            return expr.eval(self, name)
         return NotImplemented
 
     def refresh_expression(self, name):
         """ Refresh the value of a bound expression.
 
+        If the object is in the subtree of a hidden lazy object, the
+        expression is marked as dirty instead of being evaluated.
+
         Parameters
         ----------
         name : str
             The attribute name to which the invalid expression is bound.
 
         """
+        if _hidden_lazy_count > 0:
+            obj = self
+            while obj is not None:
+                if getattr(obj, '_lazy_hidden', False):
+                    obj._defer_expression(self, name)
+                    return
+                obj = obj.parent
         value = self.eval_expression(name)
         if value is not NotImplemented:
             setattr(self, name, value)
@@ -568,8 +820,105 @@ class Declarative(Object):
             The new value to pass to the listeners.
 
         """
-        dct = self._listeners
-        if name in dct:
-            for listener in dct[name]:
+        listeners = self._listeners.get(name)
+        if listeners is not None:
+            for listener in listeners:
                 listener.value_changed(self, name, old, new)
 
+    #--------------------------------------------------------------------------
+    # Lazy Evaluation API
+    #--------------------------------------------------------------------------
+    def is_hidden(self):
+        """ Get whether the object is hidden.
+
+        This is used to determine whether the expressions of a lazy
+        object are deferred. The default implementation returns False.
+        Subclasses which can be hidden should reimplement this method
+        and call `update_lazy_state` when the result changes.
+
+        Returns
+        -------
+        result : bool
+            Whether or not the object is hidden.
+
+        """
+        return False
+
+    def update_lazy_state(self):
+        """ Update the lazy state of the object.
+
+        If the object is lazy and has become hidden, the expressions of
+        its subtree are deferred from now on. If it has been shown, its
+        dirty expressions are evaluated in a single RefreshBatch.
+
+        """
+        global _hidden_lazy_count
+        hidden = self.lazy and not self.is_destroyed and self.is_hidden()
+        if hidden == self._lazy_hidden:
+            return
+        self._lazy_hidden = hidden
+        if hidden:
+            _hidden_lazy_count += 1
+            return
+        _hidden_lazy_count -= 1
+        dirty = self._lazy_dirty
+        self._lazy_dirty = None
+        if dirty and not self.is_destroyed:
+            with RefreshBatch() as batch:
+                for owner, name in dirty.itervalues():
+                    if owner.is_destroyed:
+                        continue
+                    # An attribute which has been read since it was
+                    # deferred is no longer dirty.
+                    trait = owner._instance_traits().get(name)
+                    if getattr(trait, '_lazy', False):
+                        _unwire_lazy(owner, name)
+                        batch.mark(owner, name)
+
+    def _defer_expression(self, owner, name):
+        """ Mark an expression of the hidden subtree as dirty.
+
+        Parameters
+        ----------
+        owner : Declarative
+            The declarative object which owns the expression.
+
+        name : str
+            The name to which the expression is bound.
+
+        """
+        dirty = self._lazy_dirty
+        if dirty is None:
+            dirty = self._lazy_dirty = {}
+        itraits = owner._instance_traits()
+        if not getattr(itraits.get(name), '_lazy', False):
+            dirty[(id(owner), name)] = (owner, name)
+            _wire_lazy(owner, name)
+
+    def _lazy_changed(self):
+        """ The change handler for the 'lazy' attribute.
+
+        """
+        self.update_lazy_state()
+
+    def post_initialize(self):
+        """ A reimplemented initialization method.
+
+        This sets the initial lazy state of the object. The `lazy` flag
+        and the attributes which determine whether the object is hidden
+        are usually bound as default values, which do not fire change
+        notifications when they are computed.
+
+        """
+        self.update_lazy_state()
+        super(Declarative, self).post_initialize()
+
+    def post_destroy(self):
+        """ A reimplemented destructor.
+
+        This releases the lazy state of the object.
+
+        """
+        super(Declarative, self).post_destroy()
+        self.update_lazy_state()
+
@@ -3,6 +3,23 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 from abc import ABCMeta, abstractmethod
+from weakref import ref
+
+
+#: The generation of the object trees. It is incremented whenever an
+#: object is reparented, which invalidates the resolution caches of
+#: the dynamic scopes.
+_tree_generation = 0
+
+
+def invalidate_scope_caches():
+    """ Invalidate the name resolution caches of all dynamic scopes.
+
+    This should be called whenever the parent of an object changes.
+
+    """
+    global _tree_generation
+    _tree_generation += 1
 
 
 #------------------------------------------------------------------------------
@@ -57,13 +74,28 @@ class DynamicScope(object):
     opcode is encountered in a code object which has been transformed
     by the Enaml compiler chain.
 
+    If the name 'nonlocals' is not provided by the overrides, a
+    Nonlocals object for the scope is created the first time the name
+    is loaded and is stored in the overrides.
+
+    A name which resolves to an attribute of an ancestor of the object
+    is cached with the depth of that ancestor, so that later loads of
+    the name do not repeat the walk up the tree. The cache is retained
+    when the scope is reset for the same object, and it is invalidated
+    whenever an object is reparented.
+
     Notes
     -----
     Strong references are kept to all objects passed to the constructor,
-    so these scope objects should be created as needed and discarded in
-    order to avoid unnecessary reference cycles.
+    so these scope objects should be discarded, or reset with `reset`,
+    after use in order to avoid unnecessary reference cycles.
 
     """
+    __slots__ = (
+        '_obj', '_identifiers', '_overrides', '_listener', '_depths',
+        '_depths_obj', '_depths_generation',
+    )
+
     def __init__(self, obj, identifiers, overrides, listener):
         """ Initialize a DynamicScope.
 
@@ -88,6 +120,33 @@ class DynamicScope(object):
         self._identifiers = identifiers
         self._overrides = overrides
         self._listener = listener
+        self._depths = None
+        self._depths_obj = None
+        self._depths_generation = -1
+
+    def reset(self, obj, listener):
+        """ Reset the scope so that it can be reused.
+
+        The overrides of the scope are cleared. The identifiers of the
+        scope are retained.
+
+        Parameters
+        ----------
+        obj : Declarative or None
+            The Declarative object which owns the executing code, or
+            None to release the reference to the previous object.
+
+        listener : DynamicScopeListener or None
+            A listener which should be notified when a name is loaded
+            via dynamic scoping.
+
+        """
+        if obj is not None and self._depths is not None:
+            if self._depths_obj() is not obj:
+                self._depths = None
+        self._obj = obj
+        self._listener = listener
+        self._overrides.clear()
 
     def __getitem__(self, name):
         """ Lookup and return an item from the scope.
@@ -106,10 +165,36 @@ class DynamicScope(object):
         dct = self._overrides
         if name in dct:
             return dct[name]
+        if name == 'nonlocals':
+            value = dct[name] = Nonlocals(self._obj, self._listener)
+            return value
         dct = self._identifiers
         if name in dct:
             return dct[name]
+        depths = self._depths
+        if depths is not None:
+            if self._depths_generation != _tree_generation:
+                depths = self._depths = None
+            elif name in depths:
+                parent = self._obj
+                for ignored in xrange(depths[name]):
+                    if parent is None:
+                        break
+                    parent = parent.parent
+                if parent is not None:
+                    try:
+                        value = getattr(parent, name)
+                    except DynamicAttributeError:
+                        raise
+                    except AttributeError:
+                        pass
+                    else:
+                        listener = self._listener
+                        if listener is not None:
+                            listener.dynamic_load(parent, name, value)
+                        return value
         parent = self._obj
+        depth = 0
         while parent is not None:
             try:
                 value = getattr(parent, name)
@@ -117,7 +202,14 @@ class DynamicScope(object):
                 raise
             except AttributeError:
                 parent = parent.parent
+                depth += 1
             else:
+                if depth > 0:
+                    if depths is None:
+                        depths = self._depths = {}
+                        self._depths_obj = ref(self._obj)
+                        self._depths_generation = _tree_generation
+                    depths[name] = depth
                 listener = self._listener
                 if listener is not None:
                     listener.dynamic_load(parent, name, value)
@@ -68,7 +68,12 @@ from .code_tracing import inject_tracing, inject_inversion
 #     out the object tree has been shifted to the Declarative class. This
 #     is a touch slower, but provides a ton more flexibility and enables
 #     templated components like `Looper` and `Conditional`.
-COMPILER_VERSION = 8
+# 9 : Static dependency chains for subscriptions - 17 October 2026
+#     The binding dict of a `<<` expression which is a plain dotted
+#     chain of names, such as `model.name`, has a 'chain' key with the
+#     tuple of names. This enables the runtime to evaluate and trace
+#     the expression without executing the traced bytecode.
+COMPILER_VERSION = 9
 
 
 # The Enaml compiler translates an Enaml AST into a decription dict
@@ -295,6 +300,39 @@ def compile_subscribe(py_ast, filename):
     return bp_code.to_code()
 
 
+def static_chain(py_ast):
+    """ Get the static dependency chain of an expression ast.
+
+    A static chain is an expression which is a name followed by zero or
+    more attribute loads, such as `model.name`. The dependencies of such
+    an expression can be traced without instrumenting its bytecode. The
+    `nonlocals` magic name is excluded since it performs its own scope
+    lookups.
+
+    Parameters
+    ----------
+    py_ast : ast.Expression
+        A Python ast Expression node.
+
+    Returns
+    -------
+    result : tuple or None
+        The tuple of names which form the chain, or None if the
+        expression is not a static chain.
+
+    """
+    node = py_ast.body
+    names = []
+    while isinstance(node, ast.Attribute):
+        names.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name) or node.id == 'nonlocals':
+        return None
+    names.append(node.id)
+    names.reverse()
+    return tuple(names)
+
+
 def compile_update(py_ast, filename):
     """ Compile an ast into a code object implementing operator `>>`.
 
@@ -519,6 +557,10 @@ class DeclarationCompiler(_NodeVisitor):
             'filename': self.filename,
             'block': self.block,
         }
+        if op == '__operator_LessLess__':
+            chain = static_chain(py_ast)
+            if chain is not None:
+                binding['chain'] = chain
         obj['bindings'].append(binding)
 
     def visit_Instantiation(self, node):
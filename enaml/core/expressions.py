@@ -2,17 +2,25 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+import __builtin__
+import logging
 from collections import namedtuple
+from heapq import heapify, heappush, heappop
+from itertools import count
+from types import ModuleType
 from weakref import ref
 
 from traits.api import HasTraits, Disallow, TraitListObject, TraitDictObject
 
 from .abstract_expressions import AbstractExpression, AbstractListener
 from .code_tracing import CodeTracer, CodeInverter
-from .dynamic_scope import DynamicScope, AbstractScopeListener, Nonlocals
+from .dynamic_scope import DynamicScope, AbstractScopeListener
 from .funchelper import call_func
 
 
+logger = logging.getLogger(__name__)
+
+
 #------------------------------------------------------------------------------
 # Traits Code Tracer
 #------------------------------------------------------------------------------
@@ -23,6 +31,8 @@ class TraitsTracer(CodeTracer):
     (obj, name) pairs of traits items discovered during tracing.
 
     """
+    __slots__ = ('traced_items',)
+
     def __init__(self):
         """ Initialize a TraitsTracer.
 
@@ -127,16 +137,16 @@ class StandardInverter(CodeInverter):
     """ The standard code inverter for Enaml expressions.
 
     """
-    def __init__(self, nonlocals):
+    def __init__(self, scope):
         """ Initialize a StandardInverter.
 
         Parameters
         ----------
-        nonlocals : Nonlocals
-            The nonlocal scope for the executing expression.
+        scope : DynamicScope
+            The dynamic scope for the executing expression.
 
         """
-        self._nonlocals = nonlocals
+        self._scope = scope
 
     #--------------------------------------------------------------------------
     # CodeInverter Interface
@@ -148,7 +158,7 @@ class StandardInverter(CodeInverter):
         See also: `CodeInverter.load_name`.
 
         """
-        self._nonlocals[name] = value
+        self._scope['nonlocals'][name] = value
 
     def load_attr(self, obj, attr, value):
         """ Called before the LOAD_ATTR opcode is executed.
@@ -191,8 +201,13 @@ class StandardInverter(CodeInverter):
 class BaseExpression(object):
     """ The base class of the standard Enaml expression classes.
 
+    An expression keeps the dynamic scope of its last evaluation and
+    resets it for the next one, which avoids allocating a new scope on
+    every evaluation. A scope is taken from the expression while it is
+    in use, so a reentrant evaluation allocates a scope of its own.
+
     """
-    __slots__ = ('_func', '_f_locals')
+    __slots__ = ('_func', '_f_locals', '_scope')
 
     def __init__(self, func, f_locals):
         """ Initialize a BaseExpression.
@@ -210,6 +225,42 @@ class BaseExpression(object):
         """
         self._func = func
         self._f_locals = f_locals
+        self._scope = None
+
+    def _acquire_scope(self, owner, listener):
+        """ Get a dynamic scope for evaluating the expression.
+
+        Parameters
+        ----------
+        owner : Declarative
+            The Declarative object which owns the expression.
+
+        listener : DynamicScopeListener or None
+            The listener for the dynamic loads of the scope.
+
+        Returns
+        -------
+        result : DynamicScope
+            A scope which must be handed back to `_release_scope`
+            when the evaluation is finished.
+
+        """
+        scope = self._scope
+        if scope is None:
+            return DynamicScope(owner, self._f_locals, {}, listener)
+        self._scope = None
+        scope.reset(owner, listener)
+        return scope
+
+    def _release_scope(self, scope):
+        """ Release a scope acquired with `_acquire_scope`.
+
+        The references held by the scope are cleared so that the cached
+        scope does not create a reference cycle with its owner.
+
+        """
+        scope.reset(None, None)
+        self._scope = scope
 
 
 #------------------------------------------------------------------------------
@@ -228,10 +279,12 @@ class SimpleExpression(BaseExpression):
         """ Evaluate and return the expression value.
 
         """
-        overrides = {'nonlocals': Nonlocals(owner, None)}
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
-        with owner.operators:
-            return call_func(self._func, (), {}, scope)
+        scope = self._acquire_scope(owner, None)
+        try:
+            with owner.operators:
+                return call_func(self._func, (), {}, scope)
+        finally:
+            self._release_scope(scope)
 
 
 AbstractExpression.register(SimpleExpression)
@@ -256,13 +309,13 @@ class NotificationExpression(BaseExpression):
         """ Called when the attribute on the owner has changed.
 
         """
-        overrides = {
-            'event': NotificationEvent(owner, name, old, new),
-            'nonlocals': Nonlocals(owner, None),
-        }
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
-        with owner.operators:
-            call_func(self._func, (), {}, scope)
+        scope = self._acquire_scope(owner, None)
+        scope['event'] = NotificationEvent(owner, name, old, new)
+        try:
+            with owner.operators:
+                call_func(self._func, (), {}, scope)
+        finally:
+            self._release_scope(scope)
 
 
 AbstractListener.register(NotificationExpression)
@@ -284,27 +337,227 @@ class UpdateExpression(BaseExpression):
         """ Called when the attribute on the owner has changed.
 
         """
-        nonlocals = Nonlocals(owner, None)
-        overrides = {'nonlocals': nonlocals}
-        inverter = StandardInverter(nonlocals)
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
-        with owner.operators:
-            call_func(self._func, (inverter, new), {}, scope)
+        scope = self._acquire_scope(owner, None)
+        inverter = StandardInverter(scope)
+        try:
+            with owner.operators:
+                call_func(self._func, (inverter, new), {}, scope)
+        finally:
+            self._release_scope(scope)
 
 
 AbstractListener.register(UpdateExpression)
 
 
+#------------------------------------------------------------------------------
+# Refresh Batch
+#------------------------------------------------------------------------------
+class RefreshBatch(object):
+    """ A context manager which batches the refresh of subscriptions.
+
+    While a batch is active, a change to a dependency of a `<<`
+    expression marks the expression as dirty instead of re-evaluating
+    it. When the outermost batch exits, each dirty expression is
+    re-evaluated at most once, in dependency order, so that an
+    expression which depends on other expressions is evaluated after
+    them and never sees an intermediate state.
+
+    Nested batches join the outermost batch, which accumulates the
+    statistics of the transaction. The dirty expressions are flushed
+    when the outermost batch exits, even if it exits with an error.
+
+    There is a single active batch for the process rather than one per
+    session. The objects of all sessions are updated on the thread of
+    the application event loop, so a batch opened by a handler holds
+    exactly the changes made by that handler, whichever sessions they
+    touch.
+
+    """
+    #: The currently active batch, or None.
+    _active_ = None
+
+    @staticmethod
+    def active_batch():
+        """ A staticmethod that returns the currently active batch, or
+        None if there is no active batch.
+
+        """
+        return RefreshBatch._active_
+
+    def __init__(self):
+        """ Initialize a RefreshBatch.
+
+        """
+        #: The number of refreshes requested during the batch.
+        self.requested = 0
+        #: The number of expression evaluations performed by the batch.
+        self.evaluated = 0
+        self._pending = {}
+        self._heap = None
+        self._ranks = None
+        self._counter = count()
+
+    @property
+    def saved(self):
+        """ The number of evaluations saved by batching the refreshes.
+
+        """
+        return self.requested - self.evaluated
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _rank(self, owner, name):
+        """ Compute the depth of an expression in the dependency graph.
+
+        An expression which does not depend on other expressions has a
+        rank of zero. Otherwise, its rank is one greater than the rank
+        of its deepest dependency.
+
+        """
+        ranks = self._ranks
+        key = (id(owner), name)
+        if key in ranks:
+            return ranks[key]
+        # Guard against cycles in the dependency graph.
+        ranks[key] = 0
+        rank = 0
+        expr = owner._expressions.get(name)
+        notifier = getattr(expr, '_notifier', None)
+        if notifier is not None:
+            for (ignored, attr), wr in notifier.deps.iteritems():
+                obj = wr()
+                exprs = getattr(obj, '_expressions', None)
+                if exprs and attr in exprs:
+                    rank = max(rank, self._rank(obj, attr) + 1)
+        ranks[key] = rank
+        return rank
+
+    def _push(self, owner, name):
+        """ Push a dirty expression onto the evaluation heap.
+
+        """
+        item = (self._rank(owner, name), self._counter.next(), owner, name)
+        heappush(self._heap, item)
+
+    def _flush(self):
+        """ Re-evaluate the dirty expressions in dependency order.
+
+        """
+        self._ranks = {}
+        self._heap = []
+        pending = self._pending
+        for owner, name in pending.itervalues():
+            self._push(owner, name)
+        heap = self._heap
+        while heap:
+            ignored, ignored, owner, name = heappop(heap)
+            del pending[(id(owner), name)]
+            self.evaluated += 1
+            owner.refresh_expression(name)
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def mark(self, owner, name):
+        """ Mark an expression as dirty.
+
+        Parameters
+        ----------
+        owner : Declarative
+            The declarative object which owns the expression.
+
+        name : str
+            The name to which the expression is bound.
+
+        """
+        self.requested += 1
+        key = (id(owner), name)
+        pending = self._pending
+        if key not in pending:
+            pending[key] = (owner, name)
+            if self._heap is not None:
+                self._push(owner, name)
+
+    def __enter__(self):
+        """ A context manager method which activates the batch, unless
+        another batch is already active.
+
+        """
+        if RefreshBatch._active_ is None:
+            RefreshBatch._active_ = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ A context manager method which flushes the dirty expressions
+        if this is the outermost batch.
+
+        """
+        if RefreshBatch._active_ is self:
+            try:
+                # The dirty expressions are flushed even if the body of
+                # the batch raised, so that their dependents are not
+                # left with stale values. An error in that flush is
+                # logged so it does not mask the original exception.
+                if exc_type is None:
+                    self._flush()
+                else:
+                    try:
+                        self._flush()
+                    except Exception:
+                        logger.exception('Error flushing a RefreshBatch')
+            finally:
+                RefreshBatch._active_ = None
+                self._pending = {}
+                self._heap = None
+                self._ranks = None
+
+
 #------------------------------------------------------------------------------
 # Subcsription Expression
 #------------------------------------------------------------------------------
+def live_handler_count(obj):
+    """ Get the number of live trait change handlers of an object.
+
+    Parameters
+    ----------
+    obj : HasTraits
+        The traits object of interest.
+
+    Returns
+    -------
+    result : int
+        The number of object and trait level change handlers attached
+        to the object, excluding handlers whose owner has been garbage
+        collected.
+
+    """
+    notifiers = list(obj._notifiers(True))
+    for name in obj._instance_traits():
+        trait = obj._trait(name, 0)
+        if trait is not None:
+            notifiers.extend(trait._notifiers(True))
+    count = 0
+    for notifier in notifiers:
+        # Wrappers of method handlers hold a weak reference to the
+        # object which owns the method.
+        wr = getattr(notifier, 'object', None)
+        if wr is None or wr() is not None:
+            count += 1
+    return count
+
+
 class SubscriptionNotifier(object):
     """ A simple object used for attaching notification handlers.
 
+    A notifier keeps a weak reference to each of its dependencies so
+    that it can rewire its handlers incrementally when the dependencies
+    of the expression change.
+
     """
-    __slots__ = ('owner', 'name', 'keyval', '__weakref__')
+    __slots__ = ('owner', 'name', 'keyval', 'deps', '__weakref__')
 
-    def __init__(self, owner, name, keyval):
+    def __init__(self, owner, name):
         """ Initialize a SubscriptionNotifier.
 
         Parameters
@@ -315,28 +568,68 @@ class SubscriptionNotifier(object):
         name : str
             The name to which the expression is bound.
 
-        keyval : object
-            An object to use for testing equivalency of notifiers.
-
         """
         self.owner = ref(owner)
         self.name = name
-        self.keyval = keyval
+        self.keyval = ()
+        self.deps = {}
 
     def notify(self):
         """ Notify that the expression is invalid.
 
+        If a RefreshBatch is active, the expression is marked as dirty
+        instead of being refreshed immediately.
+
         """
         owner = self.owner()
         if owner is not None:
-            owner.refresh_expression(self.name)
+            batch = RefreshBatch._active_
+            if batch is None:
+                owner.refresh_expression(self.name)
+            else:
+                batch.mark(owner, self.name)
+
+    def rewire(self, traced, keyval):
+        """ Update the handlers of the notifier for new dependencies.
+
+        Handlers are added only for the new dependencies and removed
+        only for the dependencies which no longer apply.
+
+        Parameters
+        ----------
+        traced : iterable
+            An iterable of the (obj, name) pairs of the dependencies.
+
+        keyval : tuple
+            The sorted tuple of (id(obj), name) pairs for the traced
+            dependencies.
+
+        """
+        handler = self.notify
+        old = self.deps
+        new = {}
+        for obj, attr in traced:
+            key = (id(obj), attr)
+            wr = old.pop(key, None)
+            # An id may be reused by a new object once the object of
+            # an old dependency has been garbage collected.
+            if wr is None or wr() is not obj:
+                obj.on_trait_change(handler, attr)
+                wr = ref(obj)
+            new[key] = wr
+        for (ignored, attr), wr in old.iteritems():
+            obj = wr()
+            if obj is not None:
+                obj.on_trait_change(handler, attr, remove=True)
+        self.deps = new
+        self.keyval = keyval
 
 
 class SubscriptionExpression(BaseExpression):
     """ An implementation of AbstractExpression for the `<<` operator.
 
     """
-    __slots__ = ('_notifier')
+    __slots__ = ('_notifier', '_tracer')
 
     def __init__(self, func, f_locals):
         """ Initialize a SubscriptionExpression.
@@ -344,6 +637,7 @@ class SubscriptionExpression(BaseExpression):
         """
         super(SubscriptionExpression, self).__init__(func, f_locals)
         self._notifier = None
+        self._tracer = None
 
     #--------------------------------------------------------------------------
     # AbstractExpression Interface
@@ -352,38 +646,145 @@ class SubscriptionExpression(BaseExpression):
         """ Evaluate and return the expression value.
 
         """
-        tracer = TraitsTracer()
-        overrides = {'nonlocals': Nonlocals(owner, tracer)}
-        scope = DynamicScope(owner, self._f_locals, overrides, tracer)
-        with owner.operators:
-            result = call_func(self._func, (tracer,), {}, scope)
+        # The tracer is reused in the same fashion as the scope. It is
+        # taken from the expression while in use so that a reentrant
+        # evaluation does not share its traced items.
+        tracer = self._tracer
+        if tracer is None:
+            tracer = TraitsTracer()
+        else:
+            self._tracer = None
+        result = self._trace(owner, tracer)
 
         # In most cases, the objects comprising the dependencies of an
         # expression will not change during subsequent evaluations of
-        # the expression. Rather than creating a new notifier on each
-        # pass and repeating the work of creating the change handlers,
-        # a key for the dependencies is computed and a new notifier is
-        # created only when the key changes. The key uses the id of an
-        # object instead of the object itself so strong references to
-        # the object are not maintained by the expression. A sorted
-        # tuple is used instead of a frozenset to reduced the memory
-        # footprint. It is slightly slower to compute but ~5x smaller.
+        # the expression. Rather than repeating the work of creating
+        # the change handlers on each pass, a key for the dependencies
+        # is computed and the notifier is rewired only when the key
+        # changes. The key uses the id of an object instead of the
+        # object itself so strong references to the object are not
+        # maintained by the expression. A sorted tuple is used instead
+        # of a frozenset to reduced the memory footprint. It is slightly
+        # slower to compute but ~5x smaller.
         traced = tracer.traced_items
         keyval = tuple(sorted((id(obj), attr) for obj, attr in traced))
         notifier = self._notifier
-        if notifier is None or keyval != notifier.keyval:
-            notifier = SubscriptionNotifier(owner, name, keyval)
+        if notifier is None:
+            notifier = SubscriptionNotifier(owner, name)
             self._notifier = notifier
-            handler = notifier.notify
-            for obj, attr in traced:
-                obj.on_trait_change(handler, attr)
+        if keyval != notifier.keyval:
+            notifier.rewire(traced, keyval)
 
+        traced.clear()
+        self._tracer = tracer
         return result
 
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _trace(self, owner, tracer):
+        """ Evaluate the expression using the given tracer.
+
+        Parameters
+        ----------
+        owner : Declarative
+            The declarative object which owns the expression.
+
+        tracer : TraitsTracer
+            The tracer which records the dependencies of the expression.
+
+        Returns
+        -------
+        result : object
+            The value of the expression.
+
+        """
+        scope = self._acquire_scope(owner, tracer)
+        try:
+            with owner.operators:
+                return call_func(self._func, (tracer,), {}, scope)
+        finally:
+            self._release_scope(scope)
+
 
 AbstractExpression.register(SubscriptionExpression)
 
 
+#------------------------------------------------------------------------------
+# Static Subcsription Expression
+#------------------------------------------------------------------------------
+class StaticSubscriptionExpression(SubscriptionExpression):
+    """ A SubscriptionExpression for a plain dotted chain of names.
+
+    The Enaml compiler identifies `<<` expressions of the form `a.b.c`
+    which have a dependency chain that is known statically. Instead of
+    executing the traced bytecode of the expression, this expression
+    walks the chain directly and reports each step to the tracer.
+
+    """
+    __slots__ = ('_chain',)
+
+    def __init__(self, func, f_locals, chain):
+        """ Initialize a StaticSubscriptionExpression.
+
+        Parameters
+        ----------
+        func : types.FunctionType
+            The traced function for the expression. It is not called
+            by this expression, but is kept for introspection.
+
+        f_locals : dict
+            The dictionary of local identifiers for the function.
+
+        chain : tuple
+            The tuple of names which form the dotted chain. The first
+            name is loaded from the scope and the rest are attributes.
+
+        """
+        super(StaticSubscriptionExpression, self).__init__(func, f_locals)
+        self._chain = chain
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _load_name(self, scope, name):
+        """ Load a name with the semantics of the LOAD_NAME opcode.
+
+        The name is looked up in the scope, then in the globals and
+        then in the builtins of the function.
+
+        """
+        try:
+            return scope[name]
+        except KeyError:
+            pass
+        f_globals = self._func.func_globals
+        if name in f_globals:
+            return f_globals[name]
+        builtins = f_globals.get('__builtins__', __builtin__)
+        if isinstance(builtins, ModuleType):
+            builtins = builtins.__dict__
+        if name in builtins:
+            return builtins[name]
+        raise NameError("name '%s' is not defined" % name)
+
+    def _trace(self, owner, tracer):
+        """ Evaluate the chain of the expression using the tracer.
+
+        """
+        chain = self._chain
+        scope = self._acquire_scope(owner, tracer)
+        try:
+            obj = self._load_name(scope, chain[0])
+        finally:
+            self._release_scope(scope)
+        load_attr = tracer.load_attr
+        for attr in chain[1:]:
+            load_attr(obj, attr)
+            obj = getattr(obj, attr)
+        return obj
+
+
 #------------------------------------------------------------------------------
 # Delegation Expression
 #------------------------------------------------------------------------------
@@ -400,12 +801,13 @@ class DelegationExpression(SubscriptionExpression):
         """ Called when the attribute on the owner has changed.
 
         """
-        nonlocals = Nonlocals(owner, None)
-        inverter = StandardInverter(nonlocals)
-        overrides = {'nonlocals': nonlocals}
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
-        with owner.operators:
-            call_func(self._func._update, (inverter, new), {}, scope)
+        scope = self._acquire_scope(owner, None)
+        inverter = StandardInverter(scope)
+        try:
+            with owner.operators:
+                call_func(self._func._update, (inverter, new), {}, scope)
+        finally:
+            self._release_scope(scope)
 
 
 AbstractListener.register(DelegationExpression)
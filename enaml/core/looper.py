@@ -3,13 +3,41 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 from collections import Iterable
+from itertools import chain
+from types import CodeType
 
-from traits.api import Instance, Property, Tuple
+from traits.api import Callable, Dict, Instance, Property, Tuple
 
-from .declarative import scope_lookup
+from .declarative import Declarative, prepare_description
 from .templated import Templated
 
 
+def _loads_names(code, names):
+    """ Get whether a code object loads any of the given names.
+
+    Parameters
+    ----------
+    code : types.CodeType
+        The code object of an expression function. The code objects
+        of nested functions are searched as well.
+
+    names : set
+        The set of names to look for.
+
+    Returns
+    -------
+    result : bool
+        True if the code loads one of the names, False otherwise.
+
+    """
+    if not names.isdisjoint(code.co_names):
+        return True
+    for const in code.co_consts:
+        if isinstance(const, CodeType) and _loads_names(const, names):
+            return True
+    return False
+
+
 class Looper(Templated):
     """ A templated object that repeats its templates over an iterable.
 
@@ -25,12 +53,26 @@ class Looper(Templated):
     it creates. When the iterable for the looper is changed, the old
     items will be destroyed.
 
+    If a `key` callable is provided, the looper operates in keyed mode.
+    When the iterable changes, the items for loop values whose keys are
+    present in both the old and new iterables are kept and moved into
+    their new position, items are only created for new keys, and only
+    the items for removed keys are destroyed. If a kept item's index or
+    value changes, the bound expressions of its objects which read the
+    changed loop variable are refreshed.
+
     Creating a `Looper` without a parent is a programming error.
 
     """
     #: The iterable to use when creating the items for the looper.
     iterable = Instance(Iterable)
 
+    #: An optional callable which takes a loop value and returns a
+    #: hashable key which identifies it across changes to the iterable.
+    #: The keys for the values of an iterable must be unique. If this
+    #: is None, all items are recreated when the iterable changes.
+    key = Callable
+
     #: A read-only property which returns the tuple of items created
     #: by the looper when it passes over the objects in the iterable.
     #: Each item in the tuple represents one iteration of the loop and
@@ -40,6 +82,10 @@ class Looper(Templated):
     #: Private storage for the `items` property.
     _items = Tuple
 
+    #: Private storage which maps the loop keys to a 2-tuple of the
+    #: iteration scopes and iteration items when in keyed mode.
+    _keyed_items = Dict
+
     #--------------------------------------------------------------------------
     # Lifetime API
     #--------------------------------------------------------------------------
@@ -81,6 +127,7 @@ class Looper(Templated):
         super(Looper, self).post_destroy()
         self.iterable = None
         self._items = ()
+        self._keyed_items = {}
 
     #--------------------------------------------------------------------------
     # Private API
@@ -95,41 +142,114 @@ class Looper(Templated):
         if self.is_active:
             self._refresh_loop_items()
 
+    def _key_changed(self):
+        """ A private change handler for the `key` attribute.
+
+        The existing items cannot be matched against keys computed by
+        a different function, so they are discarded and recreated.
+
+        """
+        self._keyed_items = {}
+        if self.is_active:
+            self._refresh_loop_items()
+
+    def _create_iteration(self, loop_index, loop_item):
+        """ Create the items for a single iteration of the loop.
+
+        Parameters
+        ----------
+        loop_index : int
+            The index of the iteration.
+
+        loop_item : object
+            The value of the iterable for the iteration.
+
+        Returns
+        -------
+        result : tuple
+            A 2-tuple of the list of scope dicts created for the
+            iteration, and the tuple of items created for it.
+
+        """
+        scopes = []
+        iteration = []
+        # Each template is a 3-tuple of identifiers, globals, and list
+        # of description dicts. There will only typically be one
+        # template, but more can exist if the looper was subclassed via
+        # enamldef to provided default children.
+        for identifiers, f_globals, descriptions in self._templates:
+            # Each iteration of the loop gets a new scope which is the
+            # union of the existing scope and the loop variables. This
+            # also allows the loop children to add their own independent
+            # identifiers. The loop items are constructed with no parent
+            # since they are parented via `insert_children` later on.
+            scope = identifiers.copy()
+            scope['loop_index'] = loop_index
+            scope['loop_item'] = loop_item
+            for descr in descriptions:
+                cls = prepare_description(descr, f_globals).resolve_type()
+                instance = cls()
+                with instance.children_event_context():
+                    instance.populate(descr, scope, f_globals)
+                iteration.append(instance)
+            scopes.append(scope)
+        return scopes, tuple(iteration)
+
+    def _update_iteration(self, scopes, iteration, loop_index, loop_item):
+        """ Update the loop variables of a kept iteration.
+
+        If the loop variables have changed, the scopes are updated in
+        place and only the bound expressions of the iteration which
+        read a changed loop variable are refreshed. Other expressions,
+        and any values the user has assigned since, are left alone.
+
+        """
+        scope = scopes[0]
+        changed = set()
+        if scope['loop_index'] != loop_index:
+            changed.add('loop_index')
+        if scope['loop_item'] is not loop_item:
+            changed.add('loop_item')
+        if not changed:
+            return
+        for scope in scopes:
+            scope['loop_index'] = loop_index
+            scope['loop_item'] = loop_item
+        scope_ids = set(id(scope) for scope in scopes)
+        for item in iteration:
+            for obj in item.traverse():
+                if not isinstance(obj, Declarative):
+                    continue
+                for name, expr in obj._expressions.items():
+                    # Only the expressions declared in the scope of the
+                    # iteration can see its loop variables.
+                    if id(getattr(expr, '_f_locals', None)) not in scope_ids:
+                        continue
+                    func = getattr(expr, '_func', None)
+                    if func is not None and _loads_names(func.func_code,
+                                                         changed):
+                        obj.refresh_expression(name)
+
     def _refresh_loop_items(self):
         """ A private method which refreshes the loop items.
 
         This method destroys the old items and creates and initializes
-        the new items.
+        the new items. In keyed mode, only the items for the removed
+        keys are destroyed and only the items for new keys are created.
 
         """
+        if self.key is not None:
+            self._refresh_keyed_loop_items()
+            return
+
         items = []
         iterable = self.iterable
-        templates = self._templates
-
-        if iterable is not None and len(templates) > 0:
+        if iterable is not None and len(self._templates) > 0:
             for loop_index, loop_item in enumerate(iterable):
-                # Each template is a 3-tuple of identifiers, globals, and
-                # list of description dicts. There will only typically be
-                # one template, but more can exist if the looper was
-                # subclassed via enamldef to provided default children.
-                iteration = []
-                for identifiers, f_globals, descriptions in templates:
-                    # Each iteration of the loop gets a new scope which
-                    # is the union of the existing scope and the loop
-                    # variables. This also allows the loop children to
-                    # add their own independent identifiers. The loop
-                    # items are constructed with no parent since they
-                    # are parented via `insert_children` later on.
-                    scope = identifiers.copy()
-                    scope['loop_index'] = loop_index
-                    scope['loop_item'] = loop_item
-                    for descr in descriptions:
-                        cls = scope_lookup(descr['type'], f_globals, descr)
-                        instance = cls()
-                        with instance.children_event_context():
-                            instance.populate(descr, scope, f_globals)
-                        iteration.append(instance)
-                items.append(tuple(iteration))
+                scopes, iteration = self._create_iteration(
+                    loop_index, loop_item
+                )
+                items.append(iteration)
 
         old_items = self._items
         self._items = items = tuple(items)
@@ -141,8 +261,56 @@ class Looper(Templated):
                             if not old.is_destroyed:
                                 old.destroy()
                 if len(items) > 0:
-                    flat = sum(items, ())
+                    flat = tuple(chain.from_iterable(items))
                     self.parent.insert_children(self, flat)
                     for item in flat:
                         item.initialize()
 
+    def _refresh_keyed_loop_items(self):
+        """ A private method which refreshes the loop items by key.
+
+        """
+        iterable = self.iterable
+        if iterable is None or len(self._templates) == 0:
+            loop_items = []
+        else:
+            loop_items = list(iterable)
+        key = self.key
+        keys = [key(loop_item) for loop_item in loop_items]
+        if len(set(keys)) != len(keys):
+            raise ValueError('looper keys must be unique')
+
+        items = []
+        created = []
+        old_keyed = self._keyed_items
+        new_keyed = {}
+        for loop_index, loop_item in enumerate(loop_items):
+            loop_key = keys[loop_index]
+            entry = old_keyed.pop(loop_key, None)
+            if entry is None:
+                entry = self._create_iteration(loop_index, loop_item)
+                created.extend(entry[1])
+            else:
+                scopes, iteration = entry
+                self._update_iteration(
+                    scopes, iteration, loop_index, loop_item
+                )
+            new_keyed[loop_key] = entry
+            items.append(entry[1])
+
+        kept = set(id(iteration) for iteration in items)
+        old_items = self._items
+        self._keyed_items = new_keyed
+        self._items = items = tuple(items)
+        if len(old_items) > 0 or len(items) > 0:
+            with self.parent.children_event_context():
+                for iteration in old_items:
+                    if id(iteration) not in kept:
+                        for old in iteration:
+                            if not old.is_destroyed:
+                                old.destroy()
+                if len(items) > 0:
+                    flat = tuple(chain.from_iterable(items))
+                    self.parent.insert_children(self, flat)
+                    for item in created:
+                        item.initialize()
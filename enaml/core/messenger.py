@@ -31,6 +31,31 @@ class PublishAttributeNotifier(object):
 PublishAttributeNotifier = PublishAttributeNotifier()
 
 
+class CoalescePublishAttributeNotifier(object):
+    """ A trait change notifier which publishes coalesced changes.
+
+    Repeated changes to the same attribute within a single cycle of
+    the event loop are collapsed into a single 'set_*' action which
+    carries the last value.
+
+    """
+    def __call__(self, obj, name, old, new):
+        """ Called by traits to dispatch the notifier.
+
+        """
+        if old is not Uninitialized and name not in obj.loopback_guard:
+            obj.coalesce_action('set_' + name, {name: new})
+
+    def equals(self, other):
+        """ Compares this notifier against another for equality.
+
+        """
+        return False
+
+# Only a single instance of CoalescePublishAttributeNotifier is needed.
+CoalescePublishAttributeNotifier = CoalescePublishAttributeNotifier()
+
+
 class ChildrenChangedTask(object):
     """ A task for posting a children changed event to a client.
 
@@ -213,7 +238,7 @@ class Messenger(Declarative):
             for name, value in attrs.iteritems():
                 setattr(self, name, value)
 
-    def publish_attributes(self, *attrs):
+    def publish_attributes(self, *attrs, **kwargs):
         """ A convenience method provided for subclasses to publish
         attribute changes as actions to the client.
 
@@ -231,9 +256,24 @@ class Messenger(Declarative):
             The values of these attributes should be JSON serializable.
             More complex values should use their own dispatch handlers.
 
+        coalesce : bool, optional
+            If True, the changes are batched and repeated changes to
+            an attribute within a single cycle of the event loop are
+            collapsed into one action carrying the last value. This is
+            suitable for rapidly updated values such as a progress bar
+            value. The default is False and sends each change as it
+            occurs.
+
         """
+        if kwargs.pop('coalesce', False):
+            notifier = CoalescePublishAttributeNotifier
+        else:
+            notifier = PublishAttributeNotifier
+        if kwargs:
+            msg = 'unexpected keyword arguments: %s' % ', '.join(kwargs)
+            raise TypeError(msg)
         for attr in attrs:
-            self.add_notifier(attr, PublishAttributeNotifier)
+            self.add_notifier(attr, notifier)
 
     def children_event(self, event):
         """ Handle a `ChildrenEvent` for the widget.
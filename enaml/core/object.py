@@ -12,7 +12,9 @@ from traits.api import (
 
 from enaml.utils import make_dispatcher, id_generator
 
+from .dynamic_scope import invalidate_scope_caches
 from .trait_types import EnamlEvent
+from .tree_index import TreeIndex
 
 
 logger = logging.getLogger(__name__)
@@ -187,6 +189,7 @@ class Object(HasStrictTraits):
     _parent = Any       # Object or None
     _children = Any     # tuple of Object
     _session = Any      # Session or None
+    _tree_index = Any   # TreeIndex or None
 
     def __init__(self, parent=None, **kwargs):
         """ Initialize an Object.
@@ -308,14 +311,23 @@ class Object(HasStrictTraits):
         considered invalid and should no longer be used.
 
         """
-        # Only send the destroy message if the object's parent is not
-        # being destroyed. This reduces the number of messages since
-        # the automatic destruction of children is assumed.
+        # Only the root of the destroyed subtree sends a message and
+        # unregisters the subtree from the session. The destruction of
+        # the children is implied, which allows the client to tear down
+        # its hierarchy at once.
         parent = self._parent
-        if parent is None or not parent.is_destroying:
-            self.batch_action('destroy', {})
+        is_root = parent is None or not parent.is_destroying
+        session = self._session
+        if is_root:
+            self.batch_action('destroy_subtree', {})
+            if session is not None:
+                session.unregister_subtree(self)
         self.state = 'destroying'
         self.pre_destroy()
+        index = self._tree_index
+        if index is not None:
+            index.discard(self)
+            self._tree_index = None
         if self._children:
             for child in self._children:
                 child.destroy()
@@ -325,9 +337,6 @@ class Object(HasStrictTraits):
                 self._parent = None
             else:
                 self.set_parent(None)
-        session = self._session
-        if session is not None:
-            session.unregister(self)
         self.state = 'destroyed'
         self.post_destroy()
 
@@ -383,6 +392,8 @@ class Object(HasStrictTraits):
         if parent is not None and not isinstance(parent, Object):
             raise TypeError('parent must be an Object or None')
         self._parent = parent
+        invalidate_scope_caches()
+        self._reindex(parent)
         self.parent_event(ParentEvent(old_parent, parent))
         if old_parent is not None:
             old_kids = old_parent._children
@@ -442,6 +453,8 @@ class Object(HasStrictTraits):
             old_parent = child._parent
             if old_parent is not self:
                 child._parent = self
+                invalidate_scope_caches()
+                child._reindex(self)
                 child.parent_event(ParentEvent(old_parent, self))
                 if old_parent is not None:
                     old_kids = old_parent._children
@@ -453,6 +466,33 @@ class Object(HasStrictTraits):
         with self.children_event_context():
             self._children = tuple(new)
 
+    def _reindex(self, parent):
+        """ Move the subtree of this object to the index of a new
+        parent.
+
+        This is called after the parent of the object has changed. If
+        the object was the root of an index, the index is dropped.
+
+        """
+        old = self._tree_index
+        new = None if parent is None else parent._tree_index
+        if old is new:
+            return
+        for obj in self.traverse():
+            if old is not None:
+                old.discard(obj)
+            obj._tree_index = new
+            if new is not None:
+                new.add(obj)
+
+    def _name_changed(self, old, new):
+        """ The change handler for the 'name' attribute.
+
+        """
+        index = self._tree_index
+        if index is not None:
+            index.rename(self, old, new)
+
     def parent_event(self, event):
         """ Handle a `ParentEvent` posted to this object.
 
@@ -549,6 +589,26 @@ class Object(HasStrictTraits):
         if self.is_active:
             self._session.batch(self.object_id, action, content)
 
+    def coalesce_action(self, action, content):
+        """ Batch an action which replaces any pending action of the
+        same name for this object.
+
+        The action will only be batched if the current state of the
+        object is `active`. Only the most recent content for the
+        action is sent to the client when the batch is released.
+
+        Parameters
+        ----------
+        action : str
+            The name of the action which the client should perform.
+
+        content : dict
+            The content data for the action.
+
+        """
+        if self.is_active:
+            self._session.coalesce(self.object_id, action, content)
+
     def batch_action_task(self, action, task):
         """ Similar to `batch_action` but takes a callable task.
 
@@ -669,10 +729,18 @@ class Object(HasStrictTraits):
             object is found with the given name.
 
         """
+        index = self._tree_index
         if regex:
             rgx = re.compile(name)
+            # Unnamed objects are not indexed by name.
+            if index is not None and not rgx.match(''):
+                found = index.find_all(self, name, rgx)
+                return found[0] if found else None
             match = lambda n: bool(rgx.match(n))
         else:
+            if index is not None and name:
+                found = index.find_all(self, name)
+                return found[0] if found else None
             match = lambda n: n == name
         for obj in self.traverse():
             if match(obj.name):
@@ -703,10 +771,16 @@ class Object(HasStrictTraits):
             list if no objects are found with the given name.
 
         """
+        index = self._tree_index
         if regex:
             rgx = re.compile(name)
+            # Unnamed objects are not indexed by name.
+            if index is not None and not rgx.match(''):
+                return index.find_all(self, name, rgx)
             match = lambda n: bool(rgx.match(n))
         else:
+            if index is not None and name:
+                return index.find_all(self, name)
             match = lambda n: n == name
         res = []
         push = res.append
@@ -715,6 +789,56 @@ class Object(HasStrictTraits):
                 push(obj)
         return res
 
+    def find_by_type(self, kind):
+        """ Find all objects in the subtree which are of a given type.
+
+        Parameters
+        ----------
+        kind : type or tuple of types
+            The type of the objects for which to search. Instances of
+            subclasses of the type are included.
+
+        Returns
+        -------
+        result : list of Object
+            The list of objects found, in breadth first order, or an
+            empty list if no objects of the given type are found.
+
+        """
+        index = self._tree_index
+        if index is not None:
+            return index.find_by_type(self, kind)
+        return [obj for obj in self.traverse() if isinstance(obj, kind)]
+
+    def enable_index(self):
+        """ Enable an index of the objects of this tree.
+
+        The index maps the names and types of the objects in the tree
+        to the objects, and it is updated incrementally as the tree is
+        modified. While it is enabled, the `find`, `find_all` and
+        `find_by_type` methods of the objects of the tree do not need
+        to traverse the tree. The index is meant to be enabled on the
+        root of a large tree which is searched frequently, and it is
+        dropped if this object is later given a parent.
+
+        """
+        if self._parent is not None:
+            raise ValueError('an index can only be enabled on a root object')
+        if self._tree_index is None:
+            index = TreeIndex(self)
+            for obj in self.traverse():
+                obj._tree_index = index
+                index.add(obj)
+
+    def disable_index(self):
+        """ Disable the index of this tree, if it is enabled.
+
+        """
+        index = self._tree_index
+        if index is not None and index.root is self:
+            for obj in self.traverse():
+                obj._tree_index = None
+
     #--------------------------------------------------------------------------
     # HasTraits Fixes
     #--------------------------------------------------------------------------
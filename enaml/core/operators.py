@@ -32,7 +32,7 @@ identifiers : dict
 """
 from .expressions import (
     SimpleExpression, NotificationExpression, SubscriptionExpression,
-    UpdateExpression, DelegationExpression
+    StaticSubscriptionExpression, UpdateExpression, DelegationExpression
 )
 
 
@@ -83,10 +83,16 @@ def op_subscribe(obj, name, func, identifiers):
     attribute on the object. The function takes one argument: a code
     tracer, and returns the value of the expression. It is patched for
     dynamic scoping and code tracing and it should be invoked with
-    `funchelper.call_func(...)`.
+    `funchelper.call_func(...)`. If the function has a `_chain`
+    attribute, the expression is a plain dotted chain of names and a
+    StaticSubscriptionExpression is bound instead.
 
     """
-    expr = SubscriptionExpression(func, identifiers)
+    chain = getattr(func, '_chain', None)
+    if chain is not None:
+        expr = StaticSubscriptionExpression(func, identifiers, chain)
+    else:
+        expr = SubscriptionExpression(func, identifiers)
     obj.bind_expression(name, expr)
 
 
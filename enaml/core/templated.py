@@ -4,7 +4,7 @@
 #------------------------------------------------------------------------------
 from traits.api import List
 
-from .declarative import Declarative, setup_bindings
+from .declarative import Declarative, prepare_description
 
 
 class Templated(Declarative):
@@ -48,9 +48,10 @@ class Templated(Declarative):
         ident = description['identifier']
         if ident:
             identifiers[ident] = self
-        bindings = description['bindings']
-        if len(bindings) > 0:
-            setup_bindings(self, bindings, identifiers, f_globals)
+        if len(description['bindings']) > 0:
+            prepared = prepare_description(description, f_globals)
+            for operator, name, func in prepared.bindings(self.operators):
+                operator(self, name, func, identifiers)
         children = description['children']
         if len(children) > 0:
             template = (identifiers, f_globals, children)
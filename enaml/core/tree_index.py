@@ -0,0 +1,190 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import defaultdict
+
+
+#: The number of candidates above which the results of a lookup are
+#: ordered by a traversal of the subtree instead of by sorting.
+SORT_LIMIT = 32
+
+
+def _bfs_key(obj, root):
+    """ Compute a key which sorts objects in breadth first order.
+
+    Parameters
+    ----------
+    obj : Object
+        An object in the subtree of the root.
+
+    root : Object
+        The root of the subtree.
+
+    Returns
+    -------
+    result : tuple
+        A tuple of the depth of the object and the path of child
+        indices from the root to the object. Sorting on this key is
+        equivalent to the order of a breadth first traversal.
+
+    """
+    path = []
+    while obj is not root:
+        parent = obj._parent
+        path.append(parent._children.index(obj))
+        obj = parent
+    path.reverse()
+    return (len(path), path)
+
+
+class TreeIndex(object):
+    """ An index of the objects of a tree by name and by type.
+
+    A TreeIndex is created by `Object.enable_index` for a root object,
+    and it is kept up to date by the Object tree as objects are added,
+    removed, renamed or destroyed. Unnamed objects are only indexed by
+    type. The lookup methods return the objects of a subtree of the
+    indexed tree in breadth first order, which is the order in which a
+    traversal of the subtree would find them.
+
+    """
+    __slots__ = ('root', '_names', '_types')
+
+    def __init__(self, root):
+        """ Initialize a TreeIndex.
+
+        Parameters
+        ----------
+        root : Object
+            The root object of the tree to index.
+
+        """
+        self.root = root
+        self._names = defaultdict(set)
+        self._types = defaultdict(set)
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _select(self, candidates, subtree):
+        """ Select and order the candidates in a subtree.
+
+        """
+        # Computing the sort key of a candidate walks up the tree, so
+        # a traversal is cheaper when there are many candidates.
+        if len(candidates) > SORT_LIMIT:
+            selected = set(candidates)
+            return [obj for obj in subtree.traverse() if obj in selected]
+        root = self.root
+        if subtree is not root:
+            selected = []
+            for obj in candidates:
+                node = obj
+                while node is not None and node is not subtree:
+                    node = node._parent
+                if node is not None:
+                    selected.append(obj)
+            candidates = selected
+        if len(candidates) < 2:
+            return list(candidates)
+        return sorted(candidates, key=lambda obj: _bfs_key(obj, root))
+
+    #--------------------------------------------------------------------------
+    # Maintenance API
+    #--------------------------------------------------------------------------
+    def add(self, obj):
+        """ Add an object to the index.
+
+        """
+        name = obj.name
+        if name:
+            self._names[name].add(obj)
+        self._types[type(obj)].add(obj)
+
+    def discard(self, obj):
+        """ Remove an object from the index, if it is present.
+
+        """
+        self._discard_name(obj, obj.name)
+        objs = self._types.get(type(obj))
+        if objs is not None:
+            objs.discard(obj)
+            if not objs:
+                del self._types[type(obj)]
+
+    def rename(self, obj, old, new):
+        """ Update the index for an object which has been renamed.
+
+        """
+        self._discard_name(obj, old)
+        if new:
+            self._names[new].add(obj)
+
+    def _discard_name(self, obj, name):
+        """ Remove the named entry of an object, if it is present.
+
+        """
+        if name:
+            objs = self._names.get(name)
+            if objs is not None:
+                objs.discard(obj)
+                if not objs:
+                    del self._names[name]
+
+    #--------------------------------------------------------------------------
+    # Lookup API
+    #--------------------------------------------------------------------------
+    def find_all(self, subtree, name, regex=None):
+        """ Find the objects of a subtree with a given name.
+
+        Parameters
+        ----------
+        subtree : Object
+            The object in the indexed tree at which to search.
+
+        name : str
+            The non-empty name of the objects to find.
+
+        regex : compiled regex, optional
+            If given, the objects with a name which matches the regex
+            are found instead, and the name is ignored.
+
+        Returns
+        -------
+        result : list
+            The list of objects found, in breadth first order.
+
+        """
+        names = self._names
+        if regex is None:
+            candidates = names.get(name, ())
+        else:
+            candidates = []
+            for key, objs in names.iteritems():
+                if regex.match(key):
+                    candidates.extend(objs)
+        return self._select(candidates, subtree)
+
+    def find_by_type(self, subtree, kind):
+        """ Find the objects of a subtree which are instances of a type.
+
+        Parameters
+        ----------
+        subtree : Object
+            The object in the indexed tree at which to search.
+
+        kind : type or tuple of types
+            The type of the objects to find.
+
+        Returns
+        -------
+        result : list
+            The list of objects found, in breadth first order.
+
+        """
+        candidates = []
+        for cls, objs in self._types.iteritems():
+            if issubclass(cls, kind):
+                candidates.extend(objs)
+        return self._select(candidates, subtree)
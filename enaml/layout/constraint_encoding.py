@@ -0,0 +1,141 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" A compact encoding of linear constraints for the wire.
+
+The constraints of a widget are encoded as a table which holds a single
+list of the constraint variables and, for each constraint, the indices
+of its variables and their coefficients. Each constraint `lhs op rhs`
+is first normalized to `lhs - rhs op 0`, so that it is described by a
+flat list of terms and a constant. An encoded table has the following
+keys.
+
+'variables'
+    A flat list of alternating owner ids and variable names. The
+    variable at index `i` is the pair at positions `2 * i` and
+    `2 * i + 1` of the list.
+
+'constraints'
+    A list of `[op, strength, weight, constant, indices, coeffs]`
+    lists, one for each constraint, where `indices` and `coeffs` are
+    equal length lists of variable indices and term coefficients.
+
+A table is decoded by the client into a list of flat constraint info
+tuples of the form `(op, strength, weight, constant, owner, name,
+coeff, owner, name, coeff, ...)`. The terms of an info tuple are in a
+canonical order, so two info tuples which describe the same constraint
+are equal, and an info tuple can be used as its own key in a dict.
+
+"""
+from .constraint_variable import ConstraintVariable, Term
+
+
+#: The info tuple index of the first term of a constraint.
+TERMS_START = 4
+
+
+def _add_terms(symbolic, sign, terms):
+    """ Add the terms of a linear symbolic object to a dict of terms.
+
+    Parameters
+    ----------
+    symbolic : LinearSymbolic
+        The ConstraintVariable, Term or LinearExpression to add.
+
+    sign : float
+        The factor by which to scale the coefficients of the terms.
+
+    terms : dict
+        The dict of (owner, name) to coefficient to update.
+
+    Returns
+    -------
+    result : float
+        The constant of the symbolic object, scaled by the sign.
+
+    """
+    if isinstance(symbolic, ConstraintVariable):
+        key = (symbolic.owner, symbolic.name)
+        terms[key] = terms.get(key, 0.0) + sign
+        return 0.0
+    if isinstance(symbolic, Term):
+        var = symbolic.var
+        key = (var.owner, var.name)
+        terms[key] = terms.get(key, 0.0) + sign * symbolic.coeff
+        return 0.0
+    for term in symbolic.terms:
+        var = term.var
+        key = (var.owner, var.name)
+        terms[key] = terms.get(key, 0.0) + sign * term.coeff
+    return sign * symbolic.constant
+
+
+def encode_constraints(constraints):
+    """ Encode an iterable of linear constraints as a compact table.
+
+    Parameters
+    ----------
+    constraints : iterable
+        An iterable of LinearConstraint instances.
+
+    Returns
+    -------
+    result : dict
+        The encoded table of the constraints. It contains only lists,
+        strings and numbers, and can be serialized by any of the codecs
+        used to send messages to clients.
+
+    """
+    variables = []
+    indices = {}
+    rows = []
+    add_terms = _add_terms
+    for cn in constraints:
+        terms = {}
+        constant = add_terms(cn.lhs, 1.0, terms)
+        constant += add_terms(cn.rhs, -1.0, terms)
+        cn_indices = []
+        cn_coeffs = []
+        # The terms are sorted so that the decoded info tuple of a
+        # constraint does not depend on the order of dict iteration.
+        for key, coeff in sorted(terms.iteritems()):
+            idx = indices.get(key)
+            if idx is None:
+                idx = indices[key] = len(indices)
+                variables.extend(key)
+            cn_indices.append(idx)
+            cn_coeffs.append(coeff)
+        rows.append(
+            [cn.op, cn.strength, cn.weight, constant, cn_indices, cn_coeffs]
+        )
+    return {'variables': variables, 'constraints': rows}
+
+
+def decode_constraints(table):
+    """ Decode a table of constraints into a list of info tuples.
+
+    Parameters
+    ----------
+    table : dict
+        A table created by a call to `encode_constraints`.
+
+    Returns
+    -------
+    result : list
+        The list of constraint info tuples for the constraints in the
+        table, in the order in which they were encoded.
+
+    """
+    variables = table['variables']
+    pairs = zip(variables[::2], variables[1::2])
+    result = []
+    append = result.append
+    for op, strength, weight, constant, idxs, coeffs in table['constraints']:
+        info = [op, strength, weight, constant]
+        extend = info.extend
+        for idx, coeff in zip(idxs, coeffs):
+            extend(pairs[idx])
+            info.append(coeff)
+        append(tuple(info))
+    return result
@@ -0,0 +1,284 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .constraint_encoding import TERMS_START
+from .solver_backend import create_variable
+
+
+class LayoutBox(object):
+    """ A class which encapsulates a layout box using the constraint
+    variables of the default solver backend.
+
+    The constraint variables are created on an as-needed basis, this
+    allows Enaml widgets to define new constraints and build layouts
+    with them, without having to specifically update this client code.
+    A LayoutBox does not depend on a gui toolkit, and is used by the
+    clients of all of the toolkits.
+
+    """
+    def __init__(self, name, owner):
+        """ Initialize a LayoutBox.
+
+        Parameters
+        ----------
+        name : str
+            A name to use in the label for the constraint variables in
+            this layout box.
+
+        owner : str
+            The owner id to use in the label for the constraint variables
+            in this layout box.
+
+        """
+        self._name = name
+        self._owner = owner
+        self._primitives = {}
+
+    def primitive(self, name):
+        """ Returns a primitive constraint variable for the given name.
+
+        Parameters
+        ----------
+        name : str
+            The name of the constraint variable to return.
+
+        """
+        primitives = self._primitives
+        if name in primitives:
+            res = primitives[name]
+        else:
+            label = '{0}|{1}|{2}'.format(self._name, self._owner, name)
+            res = primitives[name] = create_variable(label)
+        return res
+
+
+def hard_constraints(box):
+    """ Create the constraints which must always apply to a box.
+
+    Parameters
+    ----------
+    box : LayoutBox
+        The layout box of a constraints widget.
+
+    Returns
+    -------
+    result : list
+        The list of linear constraints which keep the origin and size
+        of the box non-negative.
+
+    """
+    primitive = box.primitive
+    left = primitive('left')
+    top = primitive('top')
+    width = primitive('width')
+    height = primitive('height')
+    return [left >= 0, top >= 0, width >= 0, height >= 0]
+
+
+def size_hint_constraints(box, width_hint, height_hint, hug, resist):
+    """ Create the size hint constraints for a box.
+
+    Parameters
+    ----------
+    box : LayoutBox
+        The layout box of a constraints widget.
+
+    width_hint : int
+        The width of the size hint. No width constraints are created
+        if it is negative.
+
+    height_hint : int
+        The height of the size hint. No height constraints are created
+        if it is negative.
+
+    hug : tuple
+        The (width, height) strengths with which the box hugs its size
+        hint. A strength of 'ignore' creates no constraint.
+
+    resist : tuple
+        The (width, height) strengths with which the box resists being
+        made smaller than its size hint. A strength of 'ignore' creates
+        no constraint.
+
+    Returns
+    -------
+    result : list
+        The list of linear constraints for the size hint.
+
+    """
+    cns = []
+    push = cns.append
+    primitive = box.primitive
+    hug_width, hug_height = hug
+    resist_width, resist_height = resist
+    if width_hint >= 0:
+        width = primitive('width')
+        if hug_width != 'ignore':
+            push((width == width_hint) | hug_width)
+        if resist_width != 'ignore':
+            push((width >= width_hint) | resist_width)
+    if height_hint >= 0:
+        height = primitive('height')
+        if hug_height != 'ignore':
+            push((height == height_hint) | hug_height)
+        if resist_height != 'ignore':
+            push((height >= height_hint) | resist_height)
+    return cns
+
+
+def contents_constraints(box, margins):
+    """ Create the contents constraints for the box of a container.
+
+    Parameters
+    ----------
+    box : LayoutBox
+        The layout box of a container.
+
+    margins : tuple
+        The (top, right, bottom, left) distances of the contents from
+        the edges of the box, which combine the padding of the
+        container with the margins of its toolkit widget.
+
+    Returns
+    -------
+    result : list
+        The list of linear constraints which place the contents
+        boundaries of the box.
+
+    """
+    tval, rval, bval, lval = margins
+    primitive = box.primitive
+    top = primitive('top')
+    left = primitive('left')
+    width = primitive('width')
+    height = primitive('height')
+    return [
+        primitive('contents_top') == (top + tval),
+        primitive('contents_left') == (left + lval),
+        primitive('contents_right') == (left + width - rval),
+        primitive('contents_bottom') == (top + height - bval),
+    ]
+
+
+def as_linear_constraint(info, owners):
+    """ Converts a constraint info tuple into a linear constraint of
+    the default solver backend.
+
+    For constraints specified in the info tuple which do not have a
+    corresponding owner (e.g. those created by box helpers) a
+    constraint variable will be synthesized.
+
+    Parameters
+    ----------
+    info : tuple
+        A constraint info tuple decoded from the table of constraints
+        sent from an Enaml widget.
+
+    owners : dict
+        A mapping from constraint id to an owner object which holds
+        the actual casuarius constraint variables as attributes.
+
+    Returns
+    -------
+    result : LinearConstraint
+        A linear constraint for the given info tuple.
+
+    """
+    terms = []
+    for idx in xrange(TERMS_START, len(info), 3):
+        owner_id = info[idx]
+        owner = owners.get(owner_id)
+        if owner is None:
+            owner = owners[owner_id] = LayoutBox('_virtual', owner_id)
+        terms.append(info[idx + 2] * owner.primitive(info[idx + 1]))
+    expr = sum(terms) + info[3]
+    op = info[0]
+    if op == '==':
+        cn = expr == 0.0
+    elif op == '<=':
+        cn = expr <= 0.0
+    elif op == '>=':
+        cn = expr >= 0.0
+    else:
+        msg = 'Unhandled constraint operator `%s`' % op
+        raise ValueError(msg)
+    return cn | info[1] | info[2]
+
+
+def convert_user_constraints(cn_infos, cn_owners, old_cn_map, old_owners):
+    """ Convert user constraint info tuples, reusing the constraints
+    converted in a previous layout pass.
+
+    The constraints converted in the previous pass are reused for the
+    info tuples which are unchanged, so that a relayout which does not
+    change the user constraints does not convert them again. An info
+    tuple holds the ids of the owners of its variables, so the previous
+    conversions are only reused if those ids map to the same owner
+    objects as in the previous pass.
+
+    Parameters
+    ----------
+    cn_infos : list
+        The list of user constraint info tuples for the layout.
+
+    cn_owners : dict
+        The mapping of owner id to LayoutBox for the layout. The
+        virtual owners referenced by the reused constraints are carried
+        over from the previous pass, and virtual owners are created for
+        the newly converted constraints as needed.
+
+    old_cn_map : dict
+        The dict mapping info tuple to the list of constraints which
+        was returned for the previous pass. It is not modified.
+
+    old_owners : dict
+        The mapping of owner id to LayoutBox of the previous pass.
+
+    Returns
+    -------
+    result : (dict, list, list, list)
+        The dict mapping info tuple to the list of constraints for the
+        layout, the list of those constraints in the order of the info
+        tuples, the list of constraints which were newly converted, and
+        the list of constraints of the previous pass which are no longer
+        used.
+
+    """
+    # If an owner id now maps to a different owner, nothing is reused.
+    for owner_id, owner in cn_owners.iteritems():
+        if old_owners.get(owner_id, owner) is not owner:
+            removed = [cn for cns in old_cn_map.itervalues() for cn in cns]
+            old_cn_map = {}
+            break
+    else:
+        removed = []
+
+    # The reused constraints are matched first, so that the virtual
+    # owners they reference are carried over before any conversion
+    # creates a new virtual owner with the same id.
+    buckets = dict((info, list(cns)) for info, cns in old_cn_map.iteritems())
+    user_cns = []
+    for info in cn_infos:
+        bucket = buckets.get(info)
+        if bucket:
+            cn = bucket.pop()
+            for idx in xrange(TERMS_START, len(info), 3):
+                owner_id = info[idx]
+                if owner_id not in cn_owners:
+                    cn_owners[owner_id] = old_owners[owner_id]
+        else:
+            cn = None
+        user_cns.append(cn)
+
+    new_cn_map = {}
+    added = []
+    for idx, info in enumerate(cn_infos):
+        cn = user_cns[idx]
+        if cn is None:
+            cn = user_cns[idx] = as_linear_constraint(info, cn_owners)
+            added.append(cn)
+        new_cn_map.setdefault(info, []).append(cn)
+    for bucket in buckets.itervalues():
+        removed.extend(bucket)
+    return new_cn_map, user_cns, added, removed
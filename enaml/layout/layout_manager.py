@@ -2,18 +2,34 @@
 #  Copyright (c) 2011, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from casuarius import Solver, medium
+from .solver_backend import backend_class
 
 
 class LayoutManager(object):
-    """ A class which uses a casuarius solver to manage a system
-    of constraints.
+    """ A class which uses a solver backend to manage a system of
+    constraints.
 
     """
     def __init__(self):
-        self._solver = Solver(autosolve=False)
+        """ Initialize a LayoutManager.
+
+        The manager uses the default solver backend at the time it is
+        created. The variables of its constraints must be created with
+        the same backend, which is the case for the variables of a
+        LayoutBox created while that backend is the default.
+
+        """
+        self._solver = backend_class()()
         self._initialized = False
         self._running = False
+        self._size_cache = {}
+        #: The number of times the solver has solved the system. This
+        #: is provided for instrumentation and should not be modified.
+        self.solver_passes = 0
+        #: The number of min/max size requests which were satisfied by
+        #: the size cache. This is provided for instrumentation and
+        #: should not be modified.
+        self.size_cache_hits = 0
 
     def initialize(self, constraints):
         """ Initialize the solver with the given constraints.
@@ -27,11 +43,9 @@ class LayoutManager(object):
         """
         if self._initialized:
             raise RuntimeError('Solver already initialized')
-        solver = self._solver
-        solver.autosolve = False
-        for cn in constraints:
-            solver.add_constraint(cn)
-        solver.autosolve = True
+        self._solver.add_constraints(constraints)
+        self.solver_passes += 1
+        self._size_cache.clear()
         self._initialized = True
 
     def replace_constraints(self, old_cns, new_cns):
@@ -40,24 +54,23 @@ class LayoutManager(object):
         Parameters
         ----------
         old_cns : list
-            The list of casuarius constraints to remove from the
-            solver.
+            The list of constraints to remove from the solver.
 
         new_cns : list
-            The list of casuarius constraints to add to the solver.
+            The list of constraints to add to the solver.
 
         """
         if not self._initialized:
             raise RuntimeError('Solver not yet initialized')
-        solver = self._solver
-        solver.autosolve = False
-        for cn in old_cns:
-            solver.remove_constraint(cn)
-        for cn in new_cns:
-            solver.add_constraint(cn)
-        solver.autosolve = True
-
-    def layout(self, cb, width, height, size, strength=medium, weight=1.0):
+        if not old_cns and not new_cns:
+            return
+        # The cached sizes are cleared before touching the solver so
+        # that a failure cannot leave stale sizes behind.
+        self._size_cache.clear()
+        self._solver.replace_constraints(old_cns, new_cns)
+        self.solver_passes += 1
+
+    def layout(self, cb, width, height, size, strength='medium', weight=1.0):
         """ Perform an iteration of the solver for the new width and
         height constraint variables.
 
@@ -82,10 +95,10 @@ class LayoutManager(object):
             The (width, height) size tuple which is the current size
             of the main layout container.
 
-        strength : casuarius strength, optional
-            The strength with which to perform the layout using the
-            current size of the container. i.e. the strength of the
-            resize. The default is casuarius.medium.
+        strength : str, optional
+            The name of the strength with which to perform the layout
+            using the current size of the container. i.e. the strength
+            of the resize. The default is 'medium'.
 
         weight : float, optional
             The weight to apply to the strength. The default is 1.0
@@ -99,16 +112,17 @@ class LayoutManager(object):
             self._running = True
             w, h = size
             values = [(width, w), (height, h)]
+            self.solver_passes += 1
             with self._solver.suggest_values(values, strength, weight):
                 cb()
         finally:
             self._running = False
 
-    def get_min_size(self, width, height, strength=medium, weight=0.1):
+    def get_min_size(self, width, height, strength='medium', weight=0.1):
         """ Run an iteration of the solver with the suggested size of the
         component set to (0, 0). This will cause the solver to effectively
         compute the minimum size that the window can be to solve the
-        system.
+        system. The result is cached until the constraints change.
 
         Parameters
         ----------
@@ -120,10 +134,10 @@ class LayoutManager(object):
             The constraint variable representing the height of the
             main layout container.
 
-        strength : casuarius strength, optional
-            The strength with which to perform the layout using the
-            current size of the container. i.e. the strength of the
-            resize. The default is casuarius.medium.
+        strength : str, optional
+            The name of the strength with which to perform the layout
+            using the current size of the container. i.e. the strength
+            of the resize. The default is 'medium'.
 
         weight : float, optional
             The weight to apply to the strength. The default is 0.1
@@ -139,19 +153,27 @@ class LayoutManager(object):
         """
         if not self._initialized:
             raise RuntimeError('Get min size on uninitialized solver')
+        key = ('min', id(width), id(height), strength, weight)
+        cache = self._size_cache
+        if key in cache:
+            self.size_cache_hits += 1
+            return cache[key]
         values = [(width, 0.0), (height, 0.0)]
+        self.solver_passes += 1
         with self._solver.suggest_values(values, strength, weight):
             min_width = width.value
             min_height = height.value
-        return (min_width, min_height)
+        res = cache[key] = (min_width, min_height)
+        return res
 
-    def get_max_size(self, width, height, strength=medium, weight=0.1):
+    def get_max_size(self, width, height, strength='medium', weight=0.1):
         """ Run an iteration of the solver with the suggested size of
         the component set to a very large value. This will cause the
         solver to effectively compute the maximum size that the window
         can be to solve the system. The return value is a tuple numbers.
         If one of the numbers is -1, it indicates there is no maximum in
-        that direction.
+        that direction. The result is cached until the constraints
+        change.
 
         Parameters
         ----------
@@ -163,10 +185,10 @@ class LayoutManager(object):
             The constraint variable representing the height of the
             main layout container.
 
-        strength : casuarius strength, optional
-            The strength with which to perform the layout using the
-            current size of the container. i.e. the strength of the
-            resize. The default is casuarius.medium.
+        strength : str, optional
+            The name of the strength with which to perform the layout
+            using the current size of the container. i.e. the strength
+            of the resize. The default is 'medium'.
 
         weight : float, optional
             The weight to apply to the strength. The default is 0.1
@@ -182,8 +204,14 @@ class LayoutManager(object):
         """
         if not self._initialized:
             raise RuntimeError('Get max size on uninitialized solver')
+        key = ('max', id(width), id(height), strength, weight)
+        cache = self._size_cache
+        if key in cache:
+            self.size_cache_hits += 1
+            return cache[key]
         max_val = 2**24 - 1 # Arbitrary, but the max allowed by Qt.
         values = [(width, max_val), (height, max_val)]
+        self.solver_passes += 1
         with self._solver.suggest_values(values, strength, weight):
             max_width = width.value
             max_height = height.value
@@ -193,5 +221,6 @@ class LayoutManager(object):
             max_width = -1
         if height_diff <= 1:
             max_height = -1
-        return (max_width, max_height)
+        res = cache[key] = (max_width, max_height)
+        return res
 
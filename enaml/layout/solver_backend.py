@@ -0,0 +1,280 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+
+import casuarius
+
+
+class abstractstaticmethod(staticmethod):
+    """ A staticmethod which is an abstract member of an ABCMeta class.
+
+    """
+    __isabstractmethod__ = True
+
+    def __init__(self, function):
+        # A subclass looks up the inherited member through the class,
+        # which yields the plain function, so it is marked as well.
+        function.__isabstractmethod__ = True
+        super(abstractstaticmethod, self).__init__(function)
+
+
+class SolverBackend(object):
+    """ An abstract base class defining a constraint solver backend.
+
+    A LayoutManager delegates the solving of its system of constraints
+    to an instance of a backend. A backend also creates the constraint
+    variables from which the toolkit builds its constraints, since the
+    variables and the constraints built from them belong to a specific
+    solver implementation.
+
+    The variables created by a backend must support the arithmetic and
+    comparison operators which build linear expressions and linear
+    constraints, a constraint must accept a strength name or a float
+    weight with the `|` operator, and a variable must have a `value`
+    attribute which holds its most recently solved value.
+
+    """
+    __metaclass__ = ABCMeta
+
+    #: The names of the strengths which a backend must understand.
+    STRENGTHS = ('required', 'strong', 'medium', 'weak')
+
+    @abstractstaticmethod
+    def variable(name):
+        """ Create a new constraint variable for the backend.
+
+        Parameters
+        ----------
+        name : str
+            The name of the variable.
+
+        Returns
+        -------
+        result : object
+            The constraint variable.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_constraints(self, cns):
+        """ Add constraints to the solver and solve the system.
+
+        Parameters
+        ----------
+        cns : iterable
+            The constraints to add to the solver.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def replace_constraints(self, old_cns, new_cns):
+        """ Replace constraints in the solver and solve the system.
+
+        Parameters
+        ----------
+        old_cns : iterable
+            The constraints to remove from the solver.
+
+        new_cns : iterable
+            The constraints to add to the solver.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def suggest_values(self, values, strength, weight):
+        """ Get a context manager which solves the system for suggested
+        values of variables.
+
+        The variables hold the values solved for the suggestions inside
+        the context. The suggestions are withdrawn when the context is
+        exited.
+
+        Parameters
+        ----------
+        values : list
+            A list of (variable, value) pairs to suggest.
+
+        strength : str or object
+            The name of the strength of the suggestions, or a strength
+            object native to the backend.
+
+        weight : float
+            The weight of the suggestions.
+
+        """
+        raise NotImplementedError
+
+
+class CasuariusBackend(SolverBackend):
+    """ A SolverBackend which uses the casuarius Cassowary solver.
+
+    """
+    variable = staticmethod(casuarius.ConstraintVariable)
+
+    def __init__(self):
+        """ Initialize a CasuariusBackend.
+
+        """
+        self._solver = casuarius.Solver(autosolve=False)
+
+    def add_constraints(self, cns):
+        """ Add constraints to the solver and solve the system.
+
+        """
+        solver = self._solver
+        solver.autosolve = False
+        for cn in cns:
+            solver.add_constraint(cn)
+        solver.autosolve = True
+
+    def replace_constraints(self, old_cns, new_cns):
+        """ Replace constraints in the solver and solve the system.
+
+        """
+        solver = self._solver
+        solver.autosolve = False
+        for cn in old_cns:
+            solver.remove_constraint(cn)
+        for cn in new_cns:
+            solver.add_constraint(cn)
+        solver.autosolve = True
+
+    def suggest_values(self, values, strength, weight):
+        """ Get a context manager which solves the system for suggested
+        values of variables.
+
+        """
+        if isinstance(strength, basestring):
+            strength = casuarius.STRENGTH_MAP[strength]
+        return self._solver.suggest_values(values, strength, weight)
+
+
+#------------------------------------------------------------------------------
+# Backend Registry
+#------------------------------------------------------------------------------
+#: The mapping of backend name to SolverBackend subclass.
+_backends = {'casuarius': CasuariusBackend}
+
+#: The name of the backend used when a name is not given.
+_default_backend = 'casuarius'
+
+
+def register_backend(name, backend_class):
+    """ Register a solver backend by name.
+
+    Parameters
+    ----------
+    name : str
+        The name of the backend. An existing registration with the same
+        name is replaced.
+
+    backend_class : type
+        A subclass of SolverBackend which can be created without any
+        arguments.
+
+    """
+    if not issubclass(backend_class, SolverBackend):
+        msg = 'Expected a SolverBackend subclass. Got %r instead.'
+        raise TypeError(msg % backend_class)
+    _backends[name] = backend_class
+
+
+def registered_backends():
+    """ Get the names of the registered backends.
+
+    Returns
+    -------
+    result : list
+        The sorted list of the names of the registered backends.
+
+    """
+    return sorted(_backends)
+
+
+def backend_class(name=None):
+    """ Get the class of a registered backend.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the backend. The default backend is used if a name
+        is not given.
+
+    Returns
+    -------
+    result : type
+        The SolverBackend subclass registered with the name.
+
+    """
+    if name is None:
+        name = _default_backend
+    try:
+        return _backends[name]
+    except KeyError:
+        raise ValueError('Unknown solver backend %r' % name)
+
+
+def set_default_backend(name):
+    """ Set the backend used by the layouts of the application.
+
+    The variables of a layout are created with the default backend, so
+    an application should select its backend before any layouts are
+    created.
+
+    Parameters
+    ----------
+    name : str
+        The name of a registered backend.
+
+    """
+    global _default_backend
+    backend_class(name)
+    _default_backend = name
+
+
+def default_backend():
+    """ Get the name of the default backend.
+
+    """
+    return _default_backend
+
+
+@contextmanager
+def using_backend(name):
+    """ A context manager which temporarily sets the default backend.
+
+    Parameters
+    ----------
+    name : str
+        The name of a registered backend.
+
+    """
+    old = _default_backend
+    set_default_backend(name)
+    try:
+        yield
+    finally:
+        set_default_backend(old)
+
+
+def create_variable(name):
+    """ Create a constraint variable with the default backend.
+
+    Parameters
+    ----------
+    name : str
+        The name of the variable.
+
+    Returns
+    -------
+    result : object
+        The constraint variable.
+
+    """
+    return backend_class().variable(name)
@@ -0,0 +1,251 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import defaultdict
+import json
+import time
+import types
+
+from enaml.socket_interface import ActionSocketInterface
+from enaml.weakmethod import WeakMethod
+
+
+def message_size(content):
+    """ Compute the approximate wire size of a message content.
+
+    The size is the length of the JSON encoding of the content. Content
+    which cannot be JSON encoded is measured by the length of its repr.
+
+    Parameters
+    ----------
+    content : object
+        The content of a message.
+
+    Returns
+    -------
+    result : int
+        The approximate number of bytes of the content.
+
+    """
+    try:
+        return len(json.dumps(content))
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return len(repr(content))
+
+
+class MessageStats(object):
+    """ An object which accumulates statistics about received messages.
+
+    """
+    def __init__(self, measure_size=True):
+        """ Initialize a MessageStats.
+
+        Parameters
+        ----------
+        measure_size : bool, optional
+            Whether or not to measure the approximate size in bytes of
+            the messages. Measuring requires encoding each message, so
+            it may be disabled when only counts and latencies are of
+            interest. The default is True.
+
+        """
+        self.measure_size = measure_size
+        self.reset()
+
+    def reset(self):
+        """ Reset the statistics to their initial state.
+
+        """
+        #: The total number of messages received.
+        self.message_count = 0
+        #: The total approximate size in bytes of the messages.
+        self.total_bytes = 0
+        #: The sum of the latencies of the messages, in seconds.
+        self.total_latency = 0.0
+        #: The maximum latency of a message, in seconds.
+        self.max_latency = 0.0
+        #: A mapping of action name to number of messages. The items
+        #: of a 'message_batch' are counted by their own actions.
+        self.action_counts = defaultdict(int)
+        #: A mapping of action name to approximate size in bytes.
+        self.action_bytes = defaultdict(int)
+
+    def record(self, action, content, latency):
+        """ Record a received message.
+
+        Parameters
+        ----------
+        action : str
+            The action of the message.
+
+        content : dict
+            The content of the message.
+
+        latency : float
+            The time in seconds between sending and receiving the
+            message.
+
+        """
+        self.message_count += 1
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+        self.action_counts[action] += 1
+        if action == 'message_batch':
+            counts = self.action_counts
+            for item in content['batch']:
+                counts[item[1]] += 1
+        if self.measure_size:
+            size = message_size(content)
+            self.total_bytes += size
+            self.action_bytes[action] += size
+
+    def mean_latency(self):
+        """ Get the mean latency of the received messages.
+
+        Returns
+        -------
+        result : float
+            The mean latency in seconds, or 0.0 if no messages have
+            been received.
+
+        """
+        if self.message_count == 0:
+            return 0.0
+        return self.total_latency / self.message_count
+
+    def as_dict(self):
+        """ Get a dictionary representation of the statistics.
+
+        Returns
+        -------
+        result : dict
+            A JSON serializable dictionary of the statistics.
+
+        """
+        return {
+            'message_count': self.message_count,
+            'total_bytes': self.total_bytes,
+            'mean_latency': self.mean_latency(),
+            'max_latency': self.max_latency,
+            'action_counts': dict(self.action_counts),
+            'action_bytes': dict(self.action_bytes),
+        }
+
+
+class NullActionSocket(object):
+    """ A concrete implementation of ActionSocketInterface.
+
+    A NullActionSocket delivers the messages sent on it to the `receive`
+    method of its peer socket on the next cycle of the event loop of a
+    NullApplication. This mimics the queued connection which is used
+    between the sockets of a QtApplication.
+
+    """
+    def __init__(self, app, stats=None):
+        """ Initialize a NullActionSocket.
+
+        Parameters
+        ----------
+        app : NullApplication
+            The application which provides the event loop used for
+            delivering messages.
+
+        stats : MessageStats, optional
+            The object which records the statistics of the messages
+            received by this socket. If not provided, no statistics
+            are recorded.
+
+        """
+        self._app = app
+        self._peer = None
+        self._callback = None
+        self.stats = stats
+
+    def connect(self, peer):
+        """ Connect this socket to the socket which receives its
+        messages.
+
+        Parameters
+        ----------
+        peer : NullActionSocket
+            The socket which should receive the messages sent on this
+            socket.
+
+        """
+        self._peer = peer
+
+    def on_message(self, callback):
+        """ Register a callback for receiving messages sent by a client
+        object.
+
+        Parameters
+        ----------
+        callback : callable
+            A callable with an argument signature that is equivalent to
+            the `send` method. If the callback is a bound method, then
+            the lifetime of the callback will be bound to lifetime of
+            the method owner object.
+
+        """
+        if isinstance(callback, types.MethodType):
+            callback = WeakMethod(callback)
+        self._callback = callback
+
+    def send(self, object_id, action, content):
+        """ Send the action to the peer socket.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the target object.
+
+        action : str
+            The action that should be performed by the object.
+
+        content : dict
+            The content dictionary for the action.
+
+        """
+        peer = self._peer
+        if peer is not None:
+            self._app.deferred_call(
+                peer.receive, object_id, action, content, time.time()
+            )
+
+    def receive(self, object_id, action, content, sent_time=None):
+        """ Receive a message sent to the socket.
+
+        The message will be routed to the registered callback, if one
+        exists.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the target object.
+
+        action : str
+            The action that should be performed by the object.
+
+        content : dict
+            The content dictionary for the action.
+
+        sent_time : float, optional
+            The time at which the message was sent. This is used to
+            compute the latency of the message.
+
+        """
+        stats = self.stats
+        if stats is not None:
+            if sent_time is None:
+                latency = 0.0
+            else:
+                latency = time.time() - sent_time
+            stats.record(action, content, latency)
+        callback = self._callback
+        if callback is not None:
+            callback(object_id, action, content)
+
+
+ActionSocketInterface.register(NullActionSocket)
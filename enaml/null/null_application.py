@@ -0,0 +1,305 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+import logging
+import threading
+import time
+
+from enaml.application import Application
+
+from .null_action_socket import NullActionSocket, MessageStats
+from .null_session import NullSession
+
+
+logger = logging.getLogger(__name__)
+
+
+class NullApplication(Application):
+    """ A headless implementation of an Enaml application.
+
+    A NullApplication runs its own event loop of deferred and timed
+    calls, and pairs each server session with a NullSession client
+    which consumes the messages without a toolkit. It is intended for
+    load testing and benchmarking on machines without a display.
+
+    """
+    def __init__(self, factories, measure_size=True):
+        """ Initialize a NullApplication.
+
+        Parameters
+        ----------
+        factories : iterable
+            An iterable of SessionFactory instances to pass to the
+            superclass constructor.
+
+        measure_size : bool, optional
+            Whether or not the client message statistics should measure
+            the approximate size in bytes of the messages. The default
+            is True.
+
+        """
+        super(NullApplication, self).__init__(factories)
+        self._measure_size = measure_size
+        self._thread = threading.current_thread()
+        self._call_lock = threading.Lock()
+        self._deferred = deque()
+        self._timed = []
+        self._timed_counter = count()
+        self._running = False
+        self._sessions = {}
+        self._null_sessions = {}
+        self._client_stats = {}
+
+    #--------------------------------------------------------------------------
+    # Abstract API Implementation
+    #--------------------------------------------------------------------------
+    def start_session(self, name):
+        """ Start a new session of the given name.
+
+        This method will create a new session object for the requested
+        session type and return the new session_id. If the session name
+        is invalid, an exception will be raised.
+
+        Parameters
+        ----------
+        name : str
+            The name of the session to start.
+
+        Returns
+        -------
+        result : str
+            The unique identifier for the created session.
+
+        """
+        if name not in self._named_factories:
+            raise ValueError('Invalid session name')
+
+        # Create and open a new server-side session.
+        factory = self._named_factories[name]
+        session = factory.open_session()
+        session_id = session.session_id
+        self._sessions[session_id] = session
+
+        # Create and open a new client-side session.
+        null_session = NullSession(session_id)
+        self._null_sessions[session_id] = null_session
+        null_session.open(session.snapshot())
+
+        # Setup the sockets for the session pair. Only the messages
+        # received by the client are recorded.
+        stats = MessageStats(self._measure_size)
+        self._client_stats[session_id] = stats
+        server_socket = NullActionSocket(self)
+        client_socket = NullActionSocket(self, stats)
+        server_socket.connect(client_socket)
+        client_socket.connect(server_socket)
+
+        # Activate the server and client sessions. The server session
+        # is activated first so that it is ready to receive messages
+        # sent by the client during activation.
+        session.activate(server_socket)
+        null_session.activate(client_socket)
+
+        return session_id
+
+    def end_session(self, session_id):
+        """ End the session with the given session id.
+
+        This method will close down the existing session. If the session
+        id is not valid, an exception will be raised.
+
+        Parameters
+        ----------
+        session_id : str
+            The unique identifier for the session to close.
+
+        """
+        if session_id not in self._sessions:
+            raise ValueError('Invalid session id')
+        self._sessions.pop(session_id).close()
+        del self._null_sessions[session_id]
+        del self._client_stats[session_id]
+
+    def session(self, session_id):
+        """ Get the session for the given session id.
+
+        Parameters
+        ----------
+        session_id : str
+            The unique identifier for the session to retrieve.
+
+        Returns
+        -------
+        result : Session or None
+            The session object with the given id, or None if the id
+            does not correspond to an active session.
+
+        """
+        return self._sessions.get(session_id)
+
+    def sessions(self):
+        """ Get the currently active sessions for the application.
+
+        Returns
+        -------
+        result : list
+            The list of currently active sessions for the application.
+
+        """
+        return self._sessions.values()
+
+    def start(self):
+        """ Start the application's main event loop.
+
+        The loop runs until `stop` is called or there are no pending
+        deferred or timed calls remaining.
+
+        """
+        if self._running:
+            return
+        self._running = True
+        try:
+            while self._running:
+                self.process_events()
+                with self._call_lock:
+                    if self._deferred:
+                        continue
+                    if not self._timed:
+                        break
+                    delay = self._timed[0][0] - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            self._running = False
+
+    def stop(self):
+        """ Stop the application's main event loop.
+
+        """
+        self._running = False
+
+    def deferred_call(self, callback, *args, **kwargs):
+        """ Invoke a callable on the next cycle of the main event loop
+        thread.
+
+        Parameters
+        ----------
+        callback : callable
+            The callable object to execute at some point in the future.
+
+        *args, **kwargs
+            Any additional positional and keyword arguments to pass to
+            the callback.
+
+        """
+        with self._call_lock:
+            self._deferred.append((callback, args, kwargs))
+
+    def timed_call(self, ms, callback, *args, **kwargs):
+        """ Invoke a callable on the main event loop thread at a
+        specified time in the future.
+
+        Parameters
+        ----------
+        ms : int
+            The time to delay, in milliseconds, before executing the
+            callable.
+
+        callback : callable
+            The callable object to execute at some point in the future.
+
+        *args, **kwargs
+            Any additional positional and keyword arguments to pass to
+            the callback.
+
+        """
+        deadline = time.time() + ms / 1000.0
+        item = (deadline, self._timed_counter.next(), callback, args, kwargs)
+        with self._call_lock:
+            heappush(self._timed, item)
+
+    def is_main_thread(self):
+        """ Indicates whether the caller is on the main gui thread.
+
+        Returns
+        -------
+        result : bool
+            True if called from the main gui thread. False otherwise.
+
+        """
+        return threading.current_thread() is self._thread
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def process_events(self):
+        """ Process the pending events of the event loop.
+
+        This runs the deferred calls which are pending, including those
+        posted while processing, and the timed calls which are due. It
+        returns once the deferred call queue is empty.
+
+        Returns
+        -------
+        result : int
+            The number of calls which were processed.
+
+        """
+        processed = 0
+        deferred = self._deferred
+        timed = self._timed
+        lock = self._call_lock
+        while True:
+            with lock:
+                now = time.time()
+                while timed and timed[0][0] <= now:
+                    item = heappop(timed)
+                    deferred.append(item[2:])
+                if not deferred:
+                    break
+                callback, args, kwargs = deferred.popleft()
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                logger.exception('Exception in event loop callback:')
+            processed += 1
+        return processed
+
+    def client_session(self, session_id):
+        """ Get the client session for the given session id.
+
+        Parameters
+        ----------
+        session_id : str
+            The unique identifier for the session.
+
+        Returns
+        -------
+        result : NullSession or None
+            The client session with the given id, or None if the id
+            does not correspond to an active session.
+
+        """
+        return self._null_sessions.get(session_id)
+
+    def client_stats(self, session_id):
+        """ Get the statistics of the messages received by a client.
+
+        Parameters
+        ----------
+        session_id : str
+            The unique identifier for the session.
+
+        Returns
+        -------
+        result : MessageStats or None
+            The statistics of the messages received by the client of
+            the session, or None if the id does not correspond to an
+            active session.
+
+        """
+        return self._client_stats.get(session_id)
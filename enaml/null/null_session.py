@@ -0,0 +1,175 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class NullSession(object):
+    """ A client session which consumes messages without a toolkit.
+
+    A NullSession keeps track of the object ids of the client tree so
+    that it can detect messages which are sent to unknown objects, and
+    of the child ids of each object so that a destroyed subtree can be
+    forgotten at once. It otherwise does no work. The statistics of
+    the received messages are recorded by the action socket of the
+    session.
+
+    """
+    def __init__(self, session_id):
+        """ Initialize a NullSession.
+
+        Parameters
+        ----------
+        session_id : str
+            The string identifier for this session.
+
+        """
+        self._session_id = session_id
+        self._object_ids = set()
+        self._children = {}
+        self._socket = None
+        #: The number of messages received for unknown object ids.
+        self.invalid_count = 0
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _add_tree(self, tree):
+        """ Add the object ids of a snapshot tree to the session.
+
+        """
+        stack = [tree]
+        add = self._object_ids.add
+        children = self._children
+        while stack:
+            item = stack.pop()
+            kids = item['children']
+            add(item['object_id'])
+            children[item['object_id']] = [k['object_id'] for k in kids]
+            stack.extend(kids)
+
+    def _discard_tree(self, object_id):
+        """ Discard the object ids of a subtree from the session.
+
+        """
+        stack = [object_id]
+        discard = self._object_ids.discard
+        pop = self._children.pop
+        while stack:
+            item = stack.pop()
+            discard(item)
+            stack.extend(pop(item, ()))
+
+    def _dispatch(self, object_id, action, content):
+        """ Handle a message sent to a client object.
+
+        """
+        ids = self._object_ids
+        if object_id not in ids:
+            self.invalid_count += 1
+            msg = "Invalid object id sent to NullSession: %s:%s"
+            logger.warn(msg % (object_id, action))
+            return
+        if action == 'children_changed':
+            for tree in content['added']:
+                self._add_tree(tree)
+            self._children[object_id] = list(content['order'])
+        elif action == 'destroy_subtree' or action == 'destroy':
+            self._discard_tree(object_id)
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def open(self, snapshot):
+        """ Open the session using the given snapshot.
+
+        Parameters
+        ----------
+        snapshot : list of dicts
+            The list of tree snapshots for this session.
+
+        """
+        for tree in snapshot:
+            self._add_tree(tree)
+
+    def activate(self, socket):
+        """ Active the session.
+
+        Parameters
+        ----------
+        socket : ActionSocketInterface
+            The socket interface to use for messaging with the server
+            side Enaml objects.
+
+        """
+        self._socket = socket
+        socket.on_message(self.on_message)
+
+    def object_count(self):
+        """ Get the number of client objects known to the session.
+
+        Returns
+        -------
+        result : int
+            The number of object ids known to the session.
+
+        """
+        return len(self._object_ids)
+
+    #--------------------------------------------------------------------------
+    # Messaging API
+    #--------------------------------------------------------------------------
+    def send(self, object_id, action, content):
+        """ Send a message to a server object.
+
+        This can be used to simulate the actions of a user of the
+        client session.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the server object.
+
+        action : str
+            The action that should be performed by the object.
+
+        content : dict
+            The content dictionary for the action.
+
+        """
+        socket = self._socket
+        if socket is not None:
+            socket.send(object_id, action, content)
+
+    def on_message(self, object_id, action, content):
+        """ Receive a message sent to an object owned by this session.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the target object.
+
+        action : str
+            The action that should be performed by the object.
+
+        content : dict
+            The content dictionary for the action.
+
+        """
+        if object_id == self._session_id:
+            if action == 'add_window':
+                self._add_tree(content['window'])
+            elif action == 'message_batch':
+                for item in content['batch']:
+                    self._dispatch(*item)
+            elif action == 'close':
+                self._object_ids = set()
+                self._children = {}
+                self._socket.on_message(None)
+                self._socket = None
+        else:
+            self._dispatch(object_id, action, content)
@@ -3,7 +3,6 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 import logging
-import uuid
 
 from enaml.application import Application
 
@@ -71,9 +70,8 @@ class QtApplication(Application):
 
         # Create and open a new server-side session.
         factory = self._named_factories[name]
-        session = factory()
-        session_id = uuid.uuid4().hex
-        session.open(session_id)
+        session = factory.open_session()
+        session_id = session.session_id
         self._sessions[session_id] = session
 
         # Create and open a new client-side session.
@@ -4,7 +4,10 @@
 #------------------------------------------------------------------------------
 from contextlib import contextmanager
 
-from casuarius import ConstraintVariable
+from enaml.layout.constraint_encoding import decode_constraints
+from enaml.layout.layout_box import (
+    LayoutBox, hard_constraints, size_hint_constraints
+)
 
 from .qt.QtCore import QRect
 from .qt_widget import QtWidget
@@ -28,52 +31,6 @@ def size_hint_guard(obj):
         obj.size_hint_updated()
 
 
-class LayoutBox(object):
-    """ A class which encapsulates a layout box using casuarius
-    constraint variables.
-
-    The constraint variables are created on an as-needed basis, this
-    allows Enaml widgets to define new constraints and build layouts
-    with them, without having to specifically update this client code.
-
-    """
-    def __init__(self, name, owner):
-        """ Initialize a LayoutBox.
-
-        Parameters
-        ----------
-        name : str
-            A name to use in the label for the constraint variables in
-            this layout box.
-
-        owner : str
-            The owner id to use in the label for the constraint variables
-            in this layout box.
-
-        """
-        self._name = name
-        self._owner = owner
-        self._primitives = {}
-
-    def primitive(self, name):
-        """ Returns a primitive casuarius constraint variable for the
-        given name.
-
-        Parameters
-        ----------
-        name : str
-            The name of the constraint variable to return.
-
-        """
-        primitives = self._primitives
-        if name in primitives:
-            res = primitives[name]
-        else:
-            label = '{0}|{1}|{2}'.format(self._name, self._owner, name)
-            res = primitives[name] = ConstraintVariable(label)
-        return res
-
-
 class QtConstraintsWidget(QtWidget):
     """ A Qt implementation of an Enaml ConstraintsWidget.
 
@@ -95,8 +52,8 @@ class QtConstraintsWidget(QtWidget):
     #: be called to trigger an appropriate relayout of the widget.
     _size_hint_cns = []
 
-    #: The list of constraint dictionaries defined by the user on
-    #: the server side Enaml widget.
+    #: The list of constraint info tuples defined by the user on the
+    #: server side Enaml widget.
     _user_cns = []
 
     #--------------------------------------------------------------------------
@@ -111,7 +68,7 @@ class QtConstraintsWidget(QtWidget):
         self.layout_box = LayoutBox(type(self).__name__, self.object_id())
         self._hug = layout['hug']
         self._resist = layout['resist']
-        self._user_cns = layout['constraints']
+        self._user_cns = decode_constraints(layout['constraints'])
 
     #--------------------------------------------------------------------------
     # Message Handlers
@@ -124,7 +81,7 @@ class QtConstraintsWidget(QtWidget):
         # share_layout flag.
         self._hug = content['hug']
         self._resist = content['resist']
-        self._user_cns = content['constraints']
+        self._user_cns = decode_constraints(content['constraints'])
         self.clear_size_hint_constraints()
         self.relayout()
 
@@ -207,31 +164,15 @@ class QtConstraintsWidget(QtWidget):
         """
         cns = self._size_hint_cns
         if not cns:
-            cns = self._size_hint_cns = []
-            push = cns.append
             hint = self.widget_item().sizeHint()
             if hint.isValid():
-                width_hint = hint.width()
-                height_hint = hint.height()
-                primitive = self.layout_box.primitive
-                width = primitive('width')
-                height = primitive('height')
-                hug_width, hug_height = self._hug
-                resist_width, resist_height = self._resist
-                if width_hint >= 0:
-                    if hug_width != 'ignore':
-                        cn = (width == width_hint) | hug_width
-                        push(cn)
-                    if resist_width != 'ignore':
-                        cn = (width >= width_hint) | resist_width
-                        push(cn)
-                if height_hint >= 0:
-                    if hug_height != 'ignore':
-                        cn = (height == height_hint) | hug_height
-                        push(cn)
-                    if resist_height != 'ignore':
-                        cn = (height >= height_hint) | resist_height
-                        push(cn)
+                cns = size_hint_constraints(
+                    self.layout_box, hint.width(), hint.height(),
+                    self._hug, self._resist,
+                )
+            else:
+                cns = []
+            self._size_hint_cns = cns
         return cns
 
     def size_hint_updated(self):
@@ -277,13 +218,7 @@ class QtConstraintsWidget(QtWidget):
         """
         cns = self._hard_cns
         if not cns:
-            primitive = self.layout_box.primitive
-            left = primitive('left')
-            top = primitive('top')
-            width = primitive('width')
-            height = primitive('height')
-            cns = [left >= 0, top >= 0, width >= 0, height >= 0]
-            self._hard_cns = cns
+            cns = self._hard_cns = hard_constraints(self.layout_box)
         return cns
 
     def user_constraints(self):
@@ -295,7 +230,7 @@ class QtConstraintsWidget(QtWidget):
         Returns
         -------
         result : list
-            The list of dictionaries which represent the user defined
+            The list of info tuples which represent the user defined
             linear constraints.
 
         """
@@ -4,87 +4,18 @@
 #------------------------------------------------------------------------------
 from collections import deque
 
-from casuarius import weak
+from enaml.layout.layout_box import (
+    contents_constraints, convert_user_constraints
+)
 from enaml.layout.layout_manager import LayoutManager
 
 from .qt.QtCore import QSize, Signal
 from .qt.QtGui import QFrame
 from .qt_constraints_widget import (
-    QtConstraintsWidget, LayoutBox, size_hint_guard,
+    QtConstraintsWidget, size_hint_guard,
 )
 
 
-def _convert_cn_info(info, owners):
-    """ Converts the lhs or rhs of a linear constraint info dict into
-    its corresponding casuarius object.
-
-    """
-    cn_type = info['type']
-    if cn_type == 'linear_expression':
-        const = info['constant']
-        terms = info['terms']
-        convert = _convert_cn_info
-        res = sum(convert(t, owners) for t in terms) + const
-    elif cn_type == 'term':
-        coeff = info['coeff']
-        var = info['var']
-        res = coeff * _convert_cn_info(var, owners)
-    elif cn_type == 'linear_symbolic':
-        sym_name = info['name']
-        owner_id = info['owner']
-        owner = owners.get(owner_id, None)
-        if owner is None:
-            owner = owners[owner_id] = LayoutBox('_virtual', owner_id)
-        res = owner.primitive(sym_name)
-    else:
-        msg = 'Unhandled constraint info type `%s`' % cn_type
-        raise ValueError(msg)
-    return res
-
-
-def as_linear_constraint(info, owners):
-    """ Converts a constraint info dict into a casuarius linear
-    constraint.
-
-    For constraints specified in the info dict which do not have a
-    corresponding owner (e.g. those created by box helpers) a
-    constraint variable will be synthesized.
-
-    Parameters
-    ----------
-    info : dict
-        A dictionary sent from an Enaml widget which specifies the
-        information for a linear constraint.
-
-    owners : dict
-        A mapping from constraint id to an owner object which holds
-        the actual casuarius constraint variables as attributes.
-
-    Returns
-    -------
-    result : LinearConstraint
-        A casuarius linear constraint for the given dict.
-
-    """
-    if info['type'] != 'linear_constraint':
-        msg = 'The info dict does not specify a linear constraint.'
-        raise ValueError(msg)
-    convert = _convert_cn_info
-    lhs = convert(info['lhs'], owners)
-    rhs = convert(info['rhs'], owners)
-    op = info['op']
-    if op == '==':
-        cn = lhs == rhs
-    elif op == '<=':
-        cn = lhs <= rhs
-    elif op == '>=':
-        cn = lhs >= rhs
-    else:
-        msg = 'Unhandled constraint operator `%s`' % op
-        raise ValueError(msg)
-    return cn | info['strength'] | info['weight']
-
-
 class QContainer(QFrame):
     """ A subclass of QFrame which behaves as a container.
 
@@ -164,6 +95,20 @@ class QtContainer(QtConstraintsWidget):
     #: A dict mapping constraint owner id to associated LayoutBox
     _cn_owners = {}
 
+    #: A tuple which describes the shape of the layout table used to
+    #: build the current layout manager. If the shape is unchanged on
+    #: a relayout, the constraints are updated incrementally.
+    _layout_shape = None
+
+    #: A dict mapping the id of a raw casuarius constraint to the
+    #: constraint, for the raw constraints held by the layout manager.
+    _raw_cns = {}
+
+    #: A dict mapping a constraint info tuple to the list of casuarius
+    #: constraints converted from the user constraint info tuples held
+    #: by the layout manager.
+    _user_cn_map = {}
+
     #: A list of the current contents constraints for the widget.
     _contents_cns = []
 
@@ -210,6 +155,7 @@ class QtContainer(QtConstraintsWidget):
             manager.initialize(cns)
             self._offset_table = offset_table
             self._layout_table = layout_table
+            self._layout_shape = self._compute_layout_shape(layout_table)
             self._layout_manager = manager
             self._refresh = self._build_refresher(manager)
             self.refresh_sizes()
@@ -225,7 +171,8 @@ class QtContainer(QtConstraintsWidget):
         if self._owns_layout:
             item = self.widget_item()
             old_hint = item.sizeHint()
-            self.init_layout()
+            if not self._update_layout():
+                self.init_layout()
             self.refresh()
             new_hint = item.sizeHint()
             # If the size hint constraints are empty, it indicates that
@@ -282,6 +229,7 @@ class QtContainer(QtConstraintsWidget):
             if manager is not None:
                 with size_hint_guard(self):
                     manager.replace_constraints(old_cns, new_cns)
+                    self._track_raw_constraints(old_cns, new_cns)
                     self.refresh_sizes()
                     self.refresh()
         else:
@@ -301,6 +249,7 @@ class QtContainer(QtConstraintsWidget):
             manager = self._layout_manager
             if manager is not None:
                 manager.replace_constraints(cns, [])
+                self._track_raw_constraints(cns, [])
         else:
             self._layout_owner.clear_constraints(cns)
 
@@ -369,22 +318,8 @@ class QtContainer(QtConstraintsWidget):
         if not cns:
             padding = self._padding
             margins = self.contents_margins()
-            tval, rval, bval, lval = map(sum, zip(padding, margins))
-            primitive = self.layout_box.primitive
-            top = primitive('top')
-            left = primitive('left')
-            width = primitive('width')
-            height = primitive('height')
-            contents_top = primitive('contents_top')
-            contents_left = primitive('contents_left')
-            contents_right = primitive('contents_right')
-            contents_bottom = primitive('contents_bottom')
-            cns = [
-                contents_top == (top + tval),
-                contents_left == (left + lval),
-                contents_right == (left + width - rval),
-                contents_bottom == (top + height - bval),
-            ]
+            offsets = map(sum, zip(padding, margins))
+            cns = contents_constraints(self.layout_box, offsets)
             self._contents_cns = cns
         return cns
 
@@ -485,14 +420,33 @@ class QtContainer(QtConstraintsWidget):
 
         return offset_table, layout_table
 
-    def _generate_constraints(self, layout_table):
-        """ Creates the list of casuarius LinearConstraint objects for
-        the widgets for which this container owns the layout.
+    def _compute_layout_shape(self, layout_table):
+        """ Compute the shape of the given layout table.
+
+        Parameters
+        ----------
+        layout_table : list
+            The layout table created by a call to _build_layout_table.
+
+        Returns
+        -------
+        result : tuple
+            A tuple of (offset index, object id) pairs for the items
+            in the layout table. Two layout tables with equal shapes
+            lay out the same widgets with the same structure.
+
+        """
+        return tuple(
+            (idx, updater.item.object_id()) for idx, updater in layout_table
+        )
+
+    def _collect_constraints(self, layout_table):
+        """ Collects the constraints for the widgets for which this
+        container owns the layout.
 
         This method walks over the items in the given layout table and
-        aggregates their constraints into a single list of casuarius
-        LinearConstraint objects which can be given to the layout
-        manager.
+        aggregates their raw casuarius constraints and their user
+        constraint info tuples.
 
         Parameters
         ----------
@@ -501,13 +455,14 @@ class QtContainer(QtConstraintsWidget):
 
         Returns
         -------
-        result : list
-            The list of casuarius LinearConstraints instances to pass to
-            the layout manager.
+        result : (list, list, dict)
+            The list of raw casuarius constraints, the list of user
+            constraint info tuples, and the dict mapping constraint
+            owner id to the associated LayoutBox.
 
         """
         # The mapping of constraint owners and the list of constraint
-        # info dictionaries provided by the Enaml widgets.
+        # info tuples provided by the Enaml widgets.
         box = self.layout_box
         cn_owners = {self.object_id(): box}
         cn_dicts = list(self.user_constraints())
@@ -536,12 +491,38 @@ class QtContainer(QtConstraintsWidget):
                 raw_cns_extend(child.size_hint_constraints())
                 cn_dicts_extend(child.user_constraints())
 
-        # Convert the list of Enaml constraints info dicts to actual
-        # casuarius LinearConstraint objects for the solver.
-        add_cn = raw_cns.append
-        as_cn = as_linear_constraint
-        for info in cn_dicts:
-            add_cn(as_cn(info, cn_owners))
+        return raw_cns, cn_dicts, cn_owners
+
+    def _generate_constraints(self, layout_table):
+        """ Creates the list of casuarius LinearConstraint objects for
+        the widgets for which this container owns the layout.
+
+        This method aggregates the constraints of the items in the
+        given layout table into a single list of casuarius constraint
+        objects which can be given to the layout manager.
+
+        Parameters
+        ----------
+        layout_table : list
+            The layout table created by a call to _build_layout_table.
+
+        Returns
+        -------
+        result : list
+            The list of casuarius LinearConstraints instances to pass to
+            the layout manager.
+
+        """
+        raw_cns, cn_dicts, cn_owners = self._collect_constraints(layout_table)
+        self._raw_cns = dict((id(cn), cn) for cn in raw_cns)
+
+        # Convert the list of Enaml constraint info tuples to actual
+        # casuarius LinearConstraint objects for the solver. The ones
+        # which are unchanged since the last pass are reused.
+        result = self._convert_user_constraints(cn_dicts, cn_owners)
+        user_cn_map, user_cns = result[:2]
+        raw_cns.extend(user_cns)
+        self._user_cn_map = user_cn_map
 
         # We keep a strong reference to the constraint owners dict,
         # since it may include instances of LayoutBox which were
@@ -551,6 +532,105 @@ class QtContainer(QtConstraintsWidget):
 
         return raw_cns
 
+    def _update_layout(self):
+        """ Incrementally update the constraints of the current layout.
+
+        If the shape of the layout table is unchanged since the layout
+        manager was created, only the constraints which were removed or
+        added since the last layout pass are replaced in the solver.
+        User constraints are matched by their info tuple and raw
+        constraints are matched by identity.
+
+        Returns
+        -------
+        result : bool
+            True if the layout was updated, False if a full rebuild of
+            the layout is required.
+
+        """
+        manager = self._layout_manager
+        if manager is None or self.will_transfer():
+            return False
+        offset_table, layout_table = self._build_layout_table()
+        if self._compute_layout_shape(layout_table) != self._layout_shape:
+            return False
+
+        raw_cns, cn_dicts, cn_owners = self._collect_constraints(layout_table)
+        old_raw = self._raw_cns
+        new_raw = dict((id(cn), cn) for cn in raw_cns)
+        removed = [cn for key, cn in old_raw.iteritems() if key not in new_raw]
+        added = [cn for key, cn in new_raw.iteritems() if key not in old_raw]
+
+        result = self._convert_user_constraints(cn_dicts, cn_owners)
+        new_user, user_cns, user_added, user_removed = result
+        added.extend(user_added)
+        removed.extend(user_removed)
+
+        # A failure to update the solver leaves it in an unknown state,
+        # so a full rebuild is performed, which will report the error.
+        try:
+            manager.replace_constraints(removed, added)
+        except Exception:
+            return False
+
+        self._raw_cns = new_raw
+        self._user_cn_map = new_user
+        self._cn_owners = cn_owners
+        self._offset_table = offset_table
+        self._layout_table = layout_table
+        self.refresh_sizes()
+        return True
+
+    def _convert_user_constraints(self, cn_infos, cn_owners):
+        """ Convert user constraint info tuples to casuarius constraints.
+
+        The constraints converted in the previous layout pass are
+        reused for the unchanged info tuples. See the function
+        `convert_user_constraints` for details.
+
+        Parameters
+        ----------
+        cn_infos : list
+            The list of user constraint info tuples for the layout.
+
+        cn_owners : dict
+            The mapping of owner id to LayoutBox for the layout. The
+            virtual owners of the constraints are added to the dict.
+
+        Returns
+        -------
+        result : (dict, list, list, list)
+            The dict mapping info tuple to the list of casuarius
+            constraints for the layout, the list of those constraints
+            in the order of the info tuples, the list of constraints
+            which were newly converted, and the list of constraints of
+            the previous pass which are no longer used.
+
+        """
+        return convert_user_constraints(
+            cn_infos, cn_owners, self._user_cn_map, self._cn_owners
+        )
+
+    def _track_raw_constraints(self, old_cns, new_cns):
+        """ Update the record of the raw constraints in the solver.
+
+        Parameters
+        ----------
+        old_cns : list
+            The list of casuarius constraints which were removed from
+            the layout manager.
+
+        new_cns : list
+            The list of casuarius constraints which were added to the
+            layout manager.
+
+        """
+        raw_cns = self._raw_cns
+        for cn in old_cns:
+            raw_cns.pop(id(cn), None)
+        for cn in new_cns:
+            raw_cns[id(cn)] = cn
+
     #--------------------------------------------------------------------------
     # Auxiliary Methods
     #--------------------------------------------------------------------------
@@ -585,6 +665,9 @@ class QtContainer(QtConstraintsWidget):
         self._offset_table = []
         self._layout_table = []
         self._cn_owners = {}
+        self._layout_shape = None
+        self._raw_cns = {}
+        self._user_cn_map = {}
         return True
 
     def will_transfer(self):
@@ -655,7 +738,7 @@ class QtContainer(QtConstraintsWidget):
             primitive = self.layout_box.primitive
             width = primitive('width')
             height = primitive('height')
-            w, h = self._layout_manager.get_min_size(width, height, weak)
+            w, h = self._layout_manager.get_min_size(width, height, 'weak')
             return QSize(w, h)
         return QSize()
 
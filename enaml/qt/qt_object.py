@@ -301,10 +301,15 @@ class QtObject(object):
 
         # Fire the child_removed event immediately, so a child can be
         # removed from any auxiliary container they parent may have
-        # placed it in, before the underlying widget is destroyed.
+        # placed it in, before the underlying widget is destroyed. If
+        # the parent is also being destroyed, the child is left in
+        # place and its widget is released along with the widget of
+        # the root of the destroyed subtree. This tears down the widget
+        # hierarchy at once instead of one child at a time.
         parent = self._parent
+        in_subtree = parent is not None and parent._destroying
         if parent is not None:
-            if self in parent._children:
+            if not in_subtree and self in parent._children:
                 parent._children.remove(self)
                 if parent._initialized:
                     parent.child_removed(self)
@@ -316,7 +321,8 @@ class QtObject(object):
         # approach than calling widget.deleteLater().
         widget = self._widget
         if widget is not None:
-            widget.setParent(None)
+            if not in_subtree:
+                widget.setParent(None)
             self._widget = None
 
         # Remove what should be the last remaining strong references to
@@ -534,10 +540,11 @@ class QtObject(object):
         ordered.extend(curr_set)
         self._children = ordered
 
-    def on_action_destroy(self, content):
-        """ Handle the 'destroy' action from the Enaml object.
+    def on_action_destroy_subtree(self, content):
+        """ Handle the 'destroy_subtree' action from the Enaml object.
 
-        This method will call the `destroy` method on the object.
+        This method will call the `destroy` method on the object, which
+        destroys the object and all of its descendants.
 
         """
         if self._initialized:
@@ -545,3 +552,11 @@ class QtObject(object):
         else:
             deferredCall(self.destroy)
 
+    def on_action_destroy(self, content):
+        """ Handle the 'destroy' action from the Enaml object.
+
+        This is the action sent by older versions of the server.
+
+        """
+        self.on_action_destroy_subtree(content)
+
@@ -5,7 +5,8 @@
 import logging
 
 from traits.api import (
-    HasTraits, Instance, List, Str, ReadOnly, Enum, Property, on_trait_change
+    HasTraits, Instance, List, Str, Int, ReadOnly, Enum, Property,
+    on_trait_change
 )
 
 from enaml.widgets.window import Window
@@ -99,6 +100,41 @@ class DeferredBatch(object):
         self._tick += 1
 
 
+class CoalescedTask(object):
+    """ A batch task which releases the latest content of a coalesced
+    message.
+
+    Instances of this class are added to the deferred batch of a
+    Session when a coalesced message is first queued. When the batch
+    is released, the task pops the most recent content for its key.
+
+    """
+    __slots__ = ('_pending', '_key')
+
+    def __init__(self, pending, key):
+        """ Initialize a CoalescedTask.
+
+        Parameters
+        ----------
+        pending : dict
+            The session dictionary which maps (object_id, action) keys
+            to the most recent content for the message.
+
+        key : tuple
+            The (object_id, action) key for the coalesced message.
+
+        """
+        self._pending = pending
+        self._key = key
+
+    def __call__(self):
+        """ Create the message tuple for the task.
+
+        """
+        object_id, action = key = self._key
+        return (object_id, action, self._pending.pop(key))
+
+
 class URLReply(object):
     """ A reply object for sending a loaded resource to a client session.
 
@@ -208,10 +244,25 @@ class Session(HasTraits):
     #: A read-only property which is True if the session is closed.
     is_closed = Property(fget=lambda self: self.state == 'closed')
 
+    #: The number of coalesced messages which have been queued for the
+    #: client. This value should not be manipulated by user code.
+    coalesced_count = Int
+
+    #: The number of coalesced messages which were suppressed because
+    #: a newer message with the same object id and action replaced it
+    #: before being sent. This value should not be manipulated by user
+    #: code.
+    suppressed_count = Int
+
     #: A private dictionary of objects registered with this session.
     #: This value should not be manipulated by user code.
     _registered_objects = Instance(dict, ())
 
+    #: A private dictionary mapping (object_id, action) to the pending
+    #: content of a coalesced message. This value should not be
+    #: manipulated by user code.
+    _coalesced = Instance(dict, ())
+
     #: The private deferred message batch used for collapsing layout
     #: related messages into a single batch to send to the client
     #: session for more efficient handling.
@@ -362,6 +413,7 @@ class Session(HasTraits):
             window.destroy()
         self.windows = []
         self._registered_objects = {}
+        self._coalesced = {}
         self.socket.on_message(None)
         self.socket = None
         self.state = 'closed'
@@ -432,6 +484,39 @@ class Session(HasTraits):
         """
         self._registered_objects.pop(obj.object_id, None)
 
+    def unregister_subtree(self, obj):
+        """ Unregister an object and its descendants from the session.
+
+        This method is called by the root Object of a subtree which is
+        being destroyed. It should never be called by user code.
+
+        Parameters
+        ----------
+        obj : Object
+            The root object of the subtree to unregister.
+
+        """
+        pop = self._registered_objects.pop
+        for item in obj.traverse():
+            pop(item.object_id, None)
+
+    def lookup(self, object_id):
+        """ Lookup a registered object with the given object id.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id for the object to lookup.
+
+        Returns
+        -------
+        result : Object or None
+            The registered Object with the given identifier, or None
+            if no registered object is found.
+
+        """
+        return self._registered_objects.get(object_id)
+
     #--------------------------------------------------------------------------
     # Messaging API
     #--------------------------------------------------------------------------
@@ -501,6 +586,38 @@ class Session(HasTraits):
         ctask = lambda: (object_id, action, task())
         self._batch.append(ctask)
 
+    def coalesce(self, object_id, action, content):
+        """ Batch a message which replaces any pending message with the
+        same object id and action.
+
+        This is similar to `batch`, except that only the most recent
+        content for a given (object_id, action) pair is sent when the
+        batch is released. The message retains the position in the
+        batch at which it was first queued. This is useful for messages
+        which carry the full state of an attribute, where intermediate
+        values may be safely dropped.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the client object.
+
+        action : str
+            The action that should be performed by the object.
+
+        content : dict
+            The content dictionary for the action.
+
+        """
+        key = (object_id, action)
+        pending = self._coalesced
+        if key in pending:
+            self.suppressed_count += 1
+        else:
+            self.coalesced_count += 1
+            self._batch.append(CoalescedTask(pending, key))
+        pending[key] = content
+
     def on_message(self, object_id, action, content):
         """ Receive a message sent to an object owned by this session.
 
@@ -2,10 +2,20 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from collections import deque
+import time
+import uuid
+
+
 class SessionFactory(object):
     """ A class whose instances are used by an Enaml Application to
     create Session instances.
 
+    A factory can optionally keep a pool of sessions which have been
+    created and opened ahead of time. The pool is replenished using
+    low priority tasks on the application scheduler, so that sessions
+    are warmed up while the event loop is otherwise idle.
+
     """
     def __init__(self, name, description, session_class, *args, **kwargs):
         """ Initialize a SessionFactory.
@@ -33,6 +43,13 @@ class SessionFactory(object):
         self.session_class = session_class
         self.args = args
         self.kwargs = kwargs
+        self._pool = deque()
+        self._pool_size = 0
+        self._warm_task = None
+        self._hits = 0
+        self._misses = 0
+        self._warm_count = 0
+        self._warm_time = 0.0
 
     def __call__(self):
         """ Called by the Enaml Application to create an instance of
@@ -46,3 +63,132 @@ class SessionFactory(object):
         """
         return self.session_class(*self.args, **self.kwargs)
 
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _create_opened(self):
+        """ Create a new session and open it with a new session id.
+
+        """
+        session = self()
+        session.open(uuid.uuid4().hex)
+        return session
+
+    @staticmethod
+    def _discard(session):
+        """ Destroy the windows of a pooled session which will never
+        be activated.
+
+        """
+        for window in session.windows[:]:
+            window.destroy()
+
+    def _replenish(self):
+        """ Schedule a task to warm a session if the pool is not full.
+
+        """
+        if self._warm_task is None and len(self._pool) < self._pool_size:
+            from enaml.application import schedule
+            self._warm_task = schedule(self._warm_one, priority=-1)
+
+    def _warm_one(self):
+        """ Warm a single session and add it to the pool.
+
+        This is invoked as a scheduled task. If the pool is still not
+        full, another task is scheduled, which allows other work to be
+        processed between the warming of each session.
+
+        """
+        self._warm_task = None
+        if len(self._pool) < self._pool_size:
+            start = time.time()
+            session = self._create_opened()
+            self._warm_time += time.time() - start
+            self._warm_count += 1
+            self._pool.append(session)
+            self._replenish()
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def open_session(self):
+        """ Get a new opened session for the application to activate.
+
+        If the pool holds a pre-opened session, it is returned. Otherwise
+        a new session is created and opened. In either case, the pool is
+        replenished in the background.
+
+        Returns
+        -------
+        result : Session
+            An opened session which has a unique session id.
+
+        """
+        pool = self._pool
+        if pool:
+            self._hits += 1
+            session = pool.popleft()
+        else:
+            if self._pool_size > 0:
+                self._misses += 1
+            session = self._create_opened()
+        self._replenish()
+        return session
+
+    def prewarm(self, size):
+        """ Set the number of sessions to keep pre-opened in the pool.
+
+        The pool is filled in the background by low priority tasks on
+        the application scheduler, so an Application instance must
+        exist when this method is called with a positive size. Sessions
+        in the pool have had their `on_open` method called and their
+        windows initialized, but are not yet activated.
+
+        Parameters
+        ----------
+        size : int
+            The number of sessions to keep in the pool. A size of zero
+            disables the pool and discards any pooled sessions.
+
+        """
+        self._pool_size = max(0, size)
+        pool = self._pool
+        while len(pool) > self._pool_size:
+            self._discard(pool.pop())
+        self._replenish()
+
+    def clear_pool(self):
+        """ Discard the sessions in the pool and disable pooling.
+
+        """
+        self.prewarm(0)
+        task = self._warm_task
+        if task is not None:
+            task.unschedule()
+            self._warm_task = None
+
+    def pool_stats(self):
+        """ Get the metrics of the session pool.
+
+        Returns
+        -------
+        result : dict
+            A dict with the configured 'pool_size', the number of
+            'available' sessions, the number of 'hits' and 'misses'
+            served by the pool, the 'hit_rate', and the number and
+            mean time in seconds of the session warm ups.
+
+        """
+        requests = self._hits + self._misses
+        hit_rate = float(self._hits) / requests if requests else 0.0
+        count = self._warm_count
+        mean_warm = self._warm_time / count if count else 0.0
+        return {
+            'pool_size': self._pool_size,
+            'available': len(self._pool),
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': hit_rate,
+            'warm_count': count,
+            'mean_warm_time': mean_warm,
+        }
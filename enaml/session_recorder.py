@@ -0,0 +1,361 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Tools for recording and replaying the messages of a Session.
+
+A recording is a stream of JSON lines. The first line is a header dict
+and every following line is a record list of the form:
+
+    [time, direction, target, action, content]
+
+The `time` is the number of seconds since the start of the recording.
+The `direction` is 's' for a message sent by the server session and
+'c' for a message sent by the client. The `target` of a server message
+is the object id of the client object. The `target` of a client message
+is the path of child indices from the session windows to the server
+object, or None if the message targets the session. Paths are used for
+client messages since object ids are not stable across processes.
+
+"""
+from collections import defaultdict
+import json
+import logging
+import time
+
+from .socket_interface import ActionSocketInterface
+
+
+logger = logging.getLogger(__name__)
+
+
+#: The version of the recording format.
+RECORDING_VERSION = 1
+
+
+def object_path(session, obj):
+    """ Compute the path of child indices for an object of a session.
+
+    Parameters
+    ----------
+    session : Session
+        The session which owns the object.
+
+    obj : Object
+        The object for which to compute the path.
+
+    Returns
+    -------
+    result : list or None
+        The list of child indices from the session windows to the
+        object, or None if the object is not in a session window.
+
+    """
+    path = []
+    while obj.parent is not None:
+        parent = obj.parent
+        path.append(parent.children.index(obj))
+        obj = parent
+    windows = session.windows
+    if obj not in windows:
+        return None
+    path.append(windows.index(obj))
+    path.reverse()
+    return path
+
+
+def resolve_path(session, path):
+    """ Resolve a path of child indices to an object of a session.
+
+    Parameters
+    ----------
+    session : Session
+        The session which owns the object.
+
+    path : list
+        The list of child indices computed by `object_path`.
+
+    Returns
+    -------
+    result : Object or None
+        The object at the given path, or None if the path does not
+        resolve to an object.
+
+    """
+    try:
+        obj = session.windows[path[0]]
+        for idx in path[1:]:
+            obj = obj.children[idx]
+    except IndexError:
+        return None
+    return obj
+
+
+class RecordingSocket(object):
+    """ An ActionSocketInterface which records the messages of a session.
+
+    A RecordingSocket wraps the socket of an active session and writes
+    the messages which pass through it in both directions to a stream.
+
+    """
+    def __init__(self, session, socket, stream):
+        """ Initialize a RecordingSocket.
+
+        Parameters
+        ----------
+        session : Session
+            The session whose messages are recorded.
+
+        socket : ActionSocketInterface
+            The socket to wrap.
+
+        stream : file
+            The writable stream to which the records are written.
+
+        """
+        self._session = session
+        self._socket = socket
+        self._stream = stream
+        self._callback = None
+        self._start = time.time()
+        header = {
+            'version': RECORDING_VERSION,
+            'session_id': session.session_id,
+            'start': self._start,
+        }
+        self._write(header)
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _write(self, item):
+        """ Write an item to the stream as a compact JSON line.
+
+        """
+        data = json.dumps(item, separators=(',', ':'), default=repr)
+        self._stream.write(data + '\n')
+
+    def _on_client_message(self, object_id, action, content):
+        """ Record a message from the client and forward it.
+
+        """
+        session = self._session
+        if object_id == session.session_id:
+            target = None
+        else:
+            obj = session.lookup(object_id)
+            target = None if obj is None else object_path(session, obj)
+            if target is None:
+                msg = "Unable to record client message for %s:%s"
+                logger.warn(msg % (object_id, action))
+        if object_id == session.session_id or target is not None:
+            dt = time.time() - self._start
+            self._write([dt, 'c', target, action, content])
+        callback = self._callback
+        if callback is not None:
+            callback(object_id, action, content)
+
+    #--------------------------------------------------------------------------
+    # ActionSocketInterface API
+    #--------------------------------------------------------------------------
+    def on_message(self, callback):
+        """ Register a callback for receiving messages sent by a
+        client object.
+
+        Parameters
+        ----------
+        callback : callable
+            A callable with an argument signature that is equivalent to
+            the `send` method.
+
+        """
+        self._callback = callback
+        if callback is None:
+            self._socket.on_message(None)
+        else:
+            self._socket.on_message(self._on_client_message)
+
+    def send(self, object_id, action, content):
+        """ Record a message from the server and send it to the client.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id for the Object sending the message.
+
+        action : str
+            The action that should be take by the client object.
+
+        content : dict
+            The dictionary of content needed to perform the action.
+
+        """
+        dt = time.time() - self._start
+        self._write([dt, 's', object_id, action, content])
+        self._socket.send(object_id, action, content)
+
+
+ActionSocketInterface.register(RecordingSocket)
+
+
+def record_session(session, stream):
+    """ Start recording the messages of an active session.
+
+    Parameters
+    ----------
+    session : Session
+        The active session to record.
+
+    stream : file
+        The writable stream to which the records are written.
+
+    Returns
+    -------
+    result : RecordingSocket
+        The socket which was installed on the session.
+
+    """
+    if not session.is_active:
+        raise RuntimeError('Only an active session can be recorded')
+    socket = RecordingSocket(session, session.socket, stream)
+    session.socket = socket
+    socket.on_message(session.on_message)
+    return socket
+
+
+def load_recording(stream):
+    """ Load a recording from a stream.
+
+    Parameters
+    ----------
+    stream : file
+        The readable stream which holds the recording.
+
+    Returns
+    -------
+    result : (dict, list)
+        The header dict and the list of records of the recording.
+
+    """
+    lines = iter(stream)
+    header = json.loads(next(lines))
+    if header.get('version') != RECORDING_VERSION:
+        raise ValueError('Unsupported recording version')
+    records = [json.loads(line) for line in lines if line.strip()]
+    return header, records
+
+
+class ReplayStats(object):
+    """ An object which accumulates the server latency of replayed
+    actions.
+
+    """
+    def __init__(self):
+        """ Initialize a ReplayStats.
+
+        """
+        self.latencies = defaultdict(list)
+        #: The number of recorded messages which could not be resolved
+        #: to an object of the replay session.
+        self.unresolved = 0
+
+    def record(self, action, latency):
+        """ Record the server latency of a replayed action.
+
+        """
+        self.latencies[action].append(latency)
+
+    def as_dict(self):
+        """ Get a dictionary summary of the statistics.
+
+        Returns
+        -------
+        result : dict
+            A JSON serializable dict which maps action name to a dict
+            of the 'count', 'mean' and 'max' latency in seconds, and
+            the number of 'unresolved' messages.
+
+        """
+        actions = {}
+        for action, values in self.latencies.iteritems():
+            actions[action] = {
+                'count': len(values),
+                'mean': sum(values) / len(values),
+                'max': max(values),
+            }
+        return {'actions': actions, 'unresolved': self.unresolved}
+
+
+class SessionReplayer(object):
+    """ A driver which replays a recorded client stream into a fresh
+    session.
+
+    """
+    def __init__(self, app, name, records):
+        """ Initialize a SessionReplayer.
+
+        Parameters
+        ----------
+        app : Application
+            The application used to start the replay session. If the
+            application has a `process_events` method, such as the
+            NullApplication, the events caused by each replayed action
+            are processed and included in its latency.
+
+        name : str
+            The name of the session to start for the replay.
+
+        records : list
+            The list of records of a recording, as returned by the
+            `load_recording` function.
+
+        """
+        self._app = app
+        self._name = name
+        self._records = [r for r in records if r[1] == 'c']
+
+    def replay(self, speed=None):
+        """ Replay the recorded client messages into a new session.
+
+        Parameters
+        ----------
+        speed : float, optional
+            The speed factor relative to the original timing of the
+            recording. A value of 2.0 replays twice as fast. If None,
+            the messages are replayed as fast as possible.
+
+        Returns
+        -------
+        result : (str, ReplayStats)
+            The id of the replay session and the latency statistics
+            of the replayed actions.
+
+        """
+        app = self._app
+        process = getattr(app, 'process_events', None)
+        session_id = app.start_session(self._name)
+        session = app.session(session_id)
+        if process is not None:
+            process()
+        stats = ReplayStats()
+        clock = time.time
+        start = clock()
+        for dt, direction, target, action, content in self._records:
+            if speed is not None:
+                delay = start + dt / speed - clock()
+                if delay > 0:
+                    time.sleep(delay)
+            if target is None:
+                object_id = session_id
+            else:
+                obj = resolve_path(session, target)
+                if obj is None:
+                    stats.unresolved += 1
+                    continue
+                object_id = obj.object_id
+            t0 = clock()
+            session.on_message(object_id, action, content)
+            if process is not None:
+                process()
+            stats.record(action, clock() - t0)
+        return session_id, stats
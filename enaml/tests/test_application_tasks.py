@@ -0,0 +1,133 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.application import schedule
+from enaml.null.null_application import NullApplication
+
+
+class TestTaskBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.app = NullApplication([])
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def test_drain_in_one_cycle(self):
+        """ Test that tasks within the budget run in a single cycle.
+
+        """
+        app = self.app
+        ran = []
+        for i in range(10):
+            schedule(ran.append, (i,))
+        app.process_events()
+        self.assertEqual(ran, range(10))
+        stats = app.task_stats()
+        self.assertEqual(stats['executed'], 10)
+        self.assertEqual(stats['cycles'], 1)
+        self.assertEqual(stats['max_depth'], 10)
+        self.assertEqual(stats['pending'], 0)
+
+    def test_zero_budget(self):
+        """ Test that a zero budget runs one task per cycle.
+
+        """
+        app = self.app
+        app.task_budget_ms = 0
+        ran = []
+        for i in range(5):
+            schedule(ran.append, (i,))
+        app.process_events()
+        self.assertEqual(ran, range(5))
+        self.assertEqual(app.task_stats()['cycles'], 5)
+
+    def test_priority_order(self):
+        """ Test that draining respects the task priority.
+
+        """
+        app = self.app
+        ran = []
+        schedule(ran.append, ('low',), priority=-1)
+        schedule(ran.append, ('mid',))
+        schedule(ran.append, ('high',), priority=1)
+        app.process_events()
+        self.assertEqual(ran, ['high', 'mid', 'low'])
+
+    def test_failing_task(self):
+        """ Test that a failing task does not stop the drain.
+
+        """
+        app = self.app
+        ran = []
+        schedule(lambda: 1 / 0)
+        schedule(ran.append, (1,))
+        app.process_events()
+        self.assertEqual(ran, [1])
+
+
+class TestTaskCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.app = NullApplication([])
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def test_same_key(self):
+        """ Test that tasks with the same key are coalesced.
+
+        """
+        app = self.app
+        ran = []
+        first = schedule(ran.append, (1,), key='push')
+        second = schedule(ran.append, (2,), key='push')
+        schedule(ran.append, (3,), key='other')
+        app.process_events()
+        self.assertTrue(first is second)
+        self.assertEqual(ran, [2, 3])
+        self.assertEqual(app.task_stats()['coalesced'], 1)
+
+    def test_key_after_execution(self):
+        """ Test that a key is released once its task is executed.
+
+        """
+        app = self.app
+        ran = []
+        schedule(ran.append, (1,), key='push')
+        app.process_events()
+        schedule(ran.append, (2,), key='push')
+        app.process_events()
+        self.assertEqual(ran, [1, 2])
+
+    def test_promotion(self):
+        """ Test that a coalesced task is promoted to a higher priority.
+
+        """
+        app = self.app
+        ran = []
+        schedule(ran.append, ('a',), key='a', priority=-1)
+        schedule(ran.append, ('b',))
+        schedule(ran.append, ('a',), key='a', priority=1)
+        app.process_events()
+        self.assertEqual(ran, ['a', 'b'])
+
+    def test_deadline(self):
+        """ Test that a task is dropped after its deadline.
+
+        """
+        app = self.app
+        ran = []
+        task = schedule(ran.append, (1,), deadline=-1)
+        schedule(ran.append, (2,), deadline=10000)
+        app.process_events()
+        self.assertEqual(ran, [2])
+        self.assertFalse(task.pending())
+        self.assertEqual(app.task_stats()['dropped'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.core.binding_table import BindingTable, EMPTY_TABLE
+
+
+class TestBindingTable(unittest.TestCase):
+
+    def test_empty(self):
+        """ Test the behavior of the shared empty table.
+
+        """
+        self.assertEqual(len(EMPTY_TABLE), 0)
+        self.assertFalse('a' in EMPTY_TABLE)
+        self.assertIsNone(EMPTY_TABLE.get('a'))
+        self.assertRaises(KeyError, lambda: EMPTY_TABLE['a'])
+
+    def test_set_returns_new_table(self):
+        """ Test that setting a key does not mutate the table.
+
+        """
+        table = EMPTY_TABLE.set('a', 1)
+        self.assertEqual(len(EMPTY_TABLE), 0)
+        self.assertEqual(table['a'], 1)
+        other = table.set('a', 2).set('b', 3)
+        self.assertEqual(table['a'], 1)
+        self.assertEqual(other.items(), [('a', 2), ('b', 3)])
+        self.assertIsInstance(other, BindingTable)
+
+    def test_value_equal_to_key(self):
+        """ Test that a value equal to a key is not found as a key.
+
+        """
+        table = BindingTable([('a', 'b'), ('b', 'c')])
+        self.assertEqual(table['b'], 'c')
+        self.assertFalse('c' in table)
+        self.assertEqual(list(table), ['a', 'b'])
+        self.assertEqual(table.values(), ['b', 'c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from traits.api import Int
+
+from enaml.null.null_application import NullApplication
+from enaml.session import Session
+from enaml.widgets.control import Control
+from enaml.widgets.window import Window
+
+
+class Gauge(Control):
+    """ A control which publishes coalesced changes to its level.
+
+    """
+    level = Int
+
+    def bind(self):
+        super(Gauge, self).bind()
+        self.publish_attributes('level', coalesce=True)
+
+
+class GaugeSession(Session):
+    """ A session with a window which holds a gauge.
+
+    """
+    def on_open(self):
+        window = Window()
+        self.gauge = Gauge(window)
+        self.windows.append(window)
+
+
+class TestCoalesce(unittest.TestCase):
+
+    def setUp(self):
+        self.app = NullApplication([GaugeSession.factory('gauge')])
+        session_id = self.app.start_session('gauge')
+        self.app.process_events()
+        self.session = self.app.session(session_id)
+        self.stats = self.app.client_stats(session_id)
+        self.stats.reset()
+        # Record the messages which are dispatched to client objects.
+        self.messages = messages = []
+        client = self.app.client_session(session_id)
+        dispatch = client._dispatch
+
+        def record(object_id, action, content):
+            messages.append((object_id, action, content))
+            dispatch(object_id, action, content)
+
+        client._dispatch = record
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def test_last_value_wins(self):
+        """ Test that changes in one cycle send one action with the
+        last value.
+
+        """
+        gauge = self.session.gauge
+        for level in xrange(1, 11):
+            gauge.level = level
+        self.app.process_events()
+        self.assertEqual(self.stats.action_counts['set_level'], 1)
+        self.assertEqual(
+            self.messages, [(gauge.object_id, 'set_level', {'level': 10})]
+        )
+
+    def test_counts(self):
+        """ Test that the queued and suppressed messages are counted.
+
+        """
+        session = self.session
+        gauge = session.gauge
+        for level in xrange(1, 6):
+            gauge.level = level
+        self.assertEqual(session.coalesced_count, 1)
+        self.assertEqual(session.suppressed_count, 4)
+        self.app.process_events()
+        gauge.level = 20
+        self.app.process_events()
+        self.assertEqual(session.coalesced_count, 2)
+        self.assertEqual(session.suppressed_count, 4)
+        self.assertEqual(self.stats.action_counts['set_level'], 2)
+        self.assertEqual(self.messages[-1][2], {'level': 20})
+
+    def test_unknown_keyword(self):
+        """ Test that an unknown keyword argument is rejected.
+
+        """
+        gauge = self.session.gauge
+        self.assertRaises(
+            TypeError, gauge.publish_attributes, 'level', coalesce=True,
+            delay=10,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
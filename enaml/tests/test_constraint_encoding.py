@@ -0,0 +1,52 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import json
+from unittest import TestCase
+
+from ..layout.constraint_encoding import (
+    TERMS_START, decode_constraints, encode_constraints
+)
+from ..layout.constraint_variable import ConstraintVariable
+
+
+class TestConstraintEncoding(TestCase):
+    """ Test the compact encoding of linear constraints.
+
+    """
+    def setUp(self):
+        self.left = ConstraintVariable('left', 'a')
+        self.width = ConstraintVariable('width', 'a')
+        self.other = ConstraintVariable('left', 'b')
+
+    def test_round_trip(self):
+        """ Test that a constraint is decoded to its normalized terms.
+
+        """
+        cn = (self.left + 2 * self.width == self.other + 10) | 'strong'
+        table = encode_constraints([cn])
+        info, = decode_constraints(json.loads(json.dumps(table)))
+        self.assertEqual(info[:TERMS_START], ('==', 'strong', 1.0, -10.0))
+        terms = info[TERMS_START:]
+        self.assertEqual(
+            terms, ('a', 'left', 1.0, 'a', 'width', 2.0, 'b', 'left', -1.0)
+        )
+
+    def test_shared_variables(self):
+        """ Test that a variable used by many constraints is encoded once.
+
+        """
+        cns = [self.left >= 0, self.left + self.width <= 100]
+        table = encode_constraints(cns)
+        self.assertEqual(table['variables'], ['a', 'left', 'a', 'width'])
+        self.assertEqual(table['constraints'][0][4], [0])
+        self.assertEqual(table['constraints'][1][4], [0, 1])
+
+    def test_canonical_info(self):
+        """ Test that equal constraints decode to equal info tuples.
+
+        """
+        first = encode_constraints([self.left + self.width >= self.other])
+        second = encode_constraints([self.width >= self.other - self.left])
+        self.assertEqual(decode_constraints(first), decode_constraints(second))
@@ -6,7 +6,11 @@ from unittest import TestCase
 
 from traits.api import TraitError
 
-from ..widgets.constraints_widget import ConstraintsWidget
+from ..layout.layout_helpers import DefaultSpacing, hbox
+from ..widgets.constraints_widget import (
+    ConstraintsWidget, layout_cache_stats, reset_layout_cache_stats
+)
+from ..widgets.container import Container
 
 
 class TestLayoutComponent(TestCase):
@@ -51,3 +55,68 @@ class TestLayoutComponent(TestCase):
             self.assertRaises(TraitError, comp.trait_set, resist_width=bad_val)
             self.assertRaises(TraitError, comp.trait_set, resist_height=bad_val)
 
+
+class TestLayoutCache(TestCase):
+    """ Test the caching of the generated constraints.
+
+    """
+    def setUp(self):
+        reset_layout_cache_stats()
+        self.container = Container()
+        self.widgets = [ConstraintsWidget() for i in range(3)]
+        for widget in self.widgets:
+            widget.set_parent(self.container)
+
+    def test_reuse(self):
+        """ Test that unchanged inputs reuse the generated constraints.
+
+        """
+        first = self.container._layout_info()['constraints']
+        self.container.hug_width = 'weak'
+        second = self.container._layout_info()
+        self.assertIs(second['constraints'], first)
+        self.assertEqual(second['hug'], ('weak', 'ignore'))
+        stats = layout_cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_children_change(self):
+        """ Test that a change in the children regenerates the constraints.
+
+        """
+        first = self.container._generate_constraints()
+        self.widgets[-1].set_parent(None)
+        second = self.container._generate_constraints()
+        self.assertIsNot(second, first)
+        self.assertNotEqual(
+            len(second['constraints']), len(first['constraints'])
+        )
+        self.assertEqual(layout_cache_stats()['hits'], 0)
+
+    def test_constraints_change(self):
+        """ Test that new user constraints regenerate the constraints.
+
+        """
+        first = self.container._generate_constraints()
+        self.container.constraints = [hbox(*self.widgets)]
+        second = self.container._generate_constraints()
+        self.assertIsNot(second, first)
+        self.container.constraints = [hbox(*self.widgets)]
+        third = self.container._generate_constraints()
+        self.assertIsNot(third, second)
+        self.assertEqual(layout_cache_stats()['hits'], 0)
+
+    def test_spacing_change(self):
+        """ Test that a change in default spacing regenerates the
+        constraints.
+
+        """
+        first = self.container._generate_constraints()
+        old = DefaultSpacing.ABUTMENT
+        DefaultSpacing.ABUTMENT = old + 5
+        try:
+            second = self.container._generate_constraints()
+        finally:
+            DefaultSpacing.ABUTMENT = old
+        self.assertIsNot(second, first)
@@ -0,0 +1,256 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import gc
+import unittest
+import weakref
+
+from traits.api import HasTraits, Int
+
+from enaml.core.declarative import prepare_description
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.core.parser import parse
+
+
+SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Child(Declarative):
+    attr text = ''
+
+enamldef Main(Declarative):
+    attr label = 'main'
+    Child:
+        text << label
+"""
+
+
+LAZY_SOURCE = """
+from enaml.widgets.widget import Widget
+
+enamldef Cell(Widget):
+    attr value = 0
+    attr seen = 0
+    value ::
+        self.seen += 1
+
+enamldef Panel(Widget):
+    attr model
+    lazy = True
+    Cell:
+        value << track(model.count * 2)
+"""
+
+
+STACK_SOURCE = """
+from enaml.widgets.stack import Stack
+from enaml.widgets.stack_item import StackItem
+from enaml.widgets.widget import Widget
+
+enamldef Cell(Widget):
+    attr value = 0
+
+enamldef Page(StackItem):
+    lazy = True
+    Cell:
+        value << track(model.count)
+
+enamldef Pages(Stack):
+    attr model
+    index = 0
+    Page:
+        pass
+    Page:
+        pass
+    Page:
+        pass
+"""
+
+
+class Model(HasTraits):
+
+    count = Int(0)
+
+
+def load(source=SOURCE):
+    code = EnamlCompiler.compile(parse(source), '<test_declarative>')
+    namespace = {}
+    exec code in namespace
+    return namespace
+
+
+class TestPreparedDescription(unittest.TestCase):
+
+    def test_functions_shared(self):
+        """ Test that instances share the prepared binding functions.
+
+        """
+        Main = load()['Main']
+        first = Main()
+        second = Main()
+        expr1 = first.children[0]._expressions['text']
+        expr2 = second.children[0]._expressions['text']
+        self.assertTrue(expr1._func is expr2._func)
+        second.label = 'changed'
+        self.assertEqual(first.children[0].text, 'main')
+        self.assertEqual(second.children[0].text, 'changed')
+
+    def test_child_types_cached(self):
+        """ Test that the child types are resolved once.
+
+        """
+        namespace = load()
+        Main = namespace['Main']
+        Main()
+        Child = namespace.pop('Child')
+        # The resolved type is reused even though the name is gone.
+        self.assertTrue(type(Main().children[0]) is Child)
+
+    def test_globals_keyed(self):
+        """ Test that a description is prepared per globals dict.
+
+        """
+        Main = load()['Main']
+        description, f_globals = Main._descriptions[-1]
+        prepared = prepare_description(description, f_globals)
+        again = prepare_description(description, f_globals)
+        self.assertTrue(again is prepared)
+        other = prepare_description(description, dict(f_globals))
+        self.assertFalse(other is prepared)
+
+    def test_module_released(self):
+        """ Test that the prepared state does not keep the globals of
+        a discarded module alive.
+
+        """
+        namespace = load()
+        namespace['Main']()
+        ref = weakref.ref(namespace['Main'])
+        del namespace
+        gc.collect()
+        self.assertTrue(ref() is None)
+
+
+class TestLazyEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        namespace = load(LAZY_SOURCE)
+        self.evaluations = []
+
+        def track(value):
+            self.evaluations.append(value)
+            return value
+
+        namespace['track'] = track
+        self.model = Model()
+        self.panel = namespace['Panel'](model=self.model)
+        self.child = self.panel.children[0]
+        self.assertEqual(self.child.value, 0)
+        del self.evaluations[:]
+
+    def tearDown(self):
+        self.panel.destroy()
+
+    def test_visible_is_eager(self):
+        """ Test that a visible lazy subtree is evaluated eagerly.
+
+        """
+        self.model.count = 1
+        self.assertEqual(self.evaluations, [2])
+
+    def test_hidden_is_deferred(self):
+        """ Test that a hidden subtree defers until shown.
+
+        """
+        self.panel.visible = False
+        self.model.count = 1
+        self.model.count = 2
+        self.model.count = 3
+        self.assertEqual(self.evaluations, [])
+        self.panel.visible = True
+        self.assertEqual(self.evaluations, [6])
+        self.assertEqual(self.child.value, 6)
+        self.assertEqual(self.child.seen, 1)
+        self.model.count = 4
+        self.assertEqual(self.evaluations, [6, 8])
+
+    def test_read_evaluates(self):
+        """ Test that reading a dirty attribute evaluates it once.
+
+        """
+        self.panel.visible = False
+        self.model.count = 5
+        self.assertEqual(self.child.value, 10)
+        self.assertEqual(self.child.seen, 1)
+        self.assertEqual(self.child.value, 10)
+        self.panel.visible = True
+        self.assertEqual(self.evaluations, [10])
+
+    def test_not_lazy(self):
+        """ Test that a hidden object which is not lazy is eager.
+
+        """
+        self.panel.lazy = False
+        self.panel.visible = False
+        self.model.count = 1
+        self.assertEqual(self.evaluations, [2])
+
+
+class TestLazyStack(unittest.TestCase):
+
+    def setUp(self):
+        namespace = load(STACK_SOURCE)
+        self.evaluations = []
+
+        def track(value):
+            self.evaluations.append(value)
+            return value
+
+        namespace['track'] = track
+        self.model = Model()
+        self.stack = namespace['Pages'](model=self.model)
+        self.stack.initialize()
+        self.pages = self.stack.stack_items
+        for page in self.pages:
+            self.assertEqual(page.children[0].value, 0)
+        del self.evaluations[:]
+
+    def tearDown(self):
+        self.stack.destroy()
+
+    def test_initial_state(self):
+        """ Test that the items which are not current are hidden once
+        the stack is initialized.
+
+        """
+        hidden = [page._lazy_hidden for page in self.pages]
+        self.assertEqual(hidden, [False, True, True])
+        self.model.count = 1
+        self.assertEqual(self.evaluations, [1])
+
+    def test_index_changed(self):
+        """ Test that the current item is shown when the index changes.
+
+        """
+        self.model.count = 1
+        del self.evaluations[:]
+        self.stack.index = 2
+        self.assertEqual(self.evaluations, [1])
+        hidden = [page._lazy_hidden for page in self.pages]
+        self.assertEqual(hidden, [True, True, False])
+
+    def test_item_removed(self):
+        """ Test that the lazy state follows a change to the items.
+
+        """
+        first = self.pages[0]
+        first.set_parent(None)
+        hidden = [page._lazy_hidden for page in self.stack.stack_items]
+        self.assertEqual(hidden, [False, True])
+        self.assertFalse(first._lazy_hidden)
+        first.destroy()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.core import dynamic_scope
+from enaml.core.dynamic_scope import DynamicScope, invalidate_scope_caches
+from enaml.core.object import Object
+
+
+class Node(object):
+    """ A simple tree node which counts its failed attribute lookups.
+
+    """
+    def __init__(self, parent=None, **attrs):
+        self.parent = parent
+        self.misses = 0
+        self.__dict__.update(attrs)
+
+    def __getattr__(self, name):
+        self.misses += 1
+        raise AttributeError(name)
+
+
+def make_chain(depth, **attrs):
+    """ Make a chain of nodes and return the root and the leaf.
+
+    """
+    root = node = Node(**attrs)
+    for ignored in xrange(depth):
+        node = Node(node)
+    return root, node
+
+
+class TestScopeCache(unittest.TestCase):
+
+    def test_cached_depth(self):
+        """ Test that a resolved depth avoids the failing lookups.
+
+        """
+        root, leaf = make_chain(5, model='model')
+        scope = DynamicScope(leaf, {}, {}, None)
+        self.assertEqual(scope['model'], 'model')
+        self.assertEqual(leaf.misses, 1)
+        scope.reset(leaf, None)
+        self.assertEqual(scope['model'], 'model')
+        self.assertEqual(leaf.misses, 1)
+
+    def test_invalidation(self):
+        """ Test that the cache is invalidated on reparenting.
+
+        """
+        root, leaf = make_chain(3, model='old')
+        scope = DynamicScope(leaf, {}, {}, None)
+        self.assertEqual(scope['model'], 'old')
+        leaf.parent = Node(model='new')
+        invalidate_scope_caches()
+        self.assertEqual(scope['model'], 'new')
+
+    def test_reset_other_object(self):
+        """ Test that the cache is cleared when reset for a new object.
+
+        """
+        root, leaf = make_chain(3, model='first')
+        scope = DynamicScope(leaf, {}, {}, None)
+        self.assertEqual(scope['model'], 'first')
+        other_root, other_leaf = make_chain(1, model='second')
+        scope.reset(other_leaf, None)
+        self.assertEqual(scope['model'], 'second')
+
+    def test_object_reparenting(self):
+        """ Test that reparenting an Object invalidates the caches.
+
+        """
+        parent = Object()
+        child = Object()
+        generation = dynamic_scope._tree_generation
+        child.set_parent(parent)
+        self.assertNotEqual(dynamic_scope._tree_generation, generation)
+        generation = dynamic_scope._tree_generation
+        Object().insert_children(None, [child])
+        self.assertNotEqual(dynamic_scope._tree_generation, generation)
+
+    def test_missing_name(self):
+        """ Test that a missing name raises a KeyError.
+
+        """
+        root, leaf = make_chain(2)
+        scope = DynamicScope(leaf, {}, {}, None)
+        with self.assertRaises(KeyError):
+            scope['model']
+
+
+if __name__ == '__main__':
+    unittest.main()
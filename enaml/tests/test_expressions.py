@@ -0,0 +1,347 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from traits.api import HasTraits, Instance, Int, push_exception_handler, \
+    pop_exception_handler
+
+import ast
+
+from enaml.core.enaml_compiler import EnamlCompiler, static_chain
+from enaml.core.expressions import (
+    RefreshBatch, StaticSubscriptionExpression, live_handler_count
+)
+from enaml.core.parser import parse
+
+
+SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr model
+    attr total = 0
+    attr value << model.count + 1
+    attr scaled << nonlocals.value * 2
+    attr echo := model.count
+    model ::
+        self.total += 1
+"""
+
+
+CHAIN_SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Chain(Declarative):
+    attr model
+    attr value << model.child.count
+"""
+
+
+DIAMOND_SOURCE = """
+from enaml.core.declarative import Declarative
+
+enamldef Diamond(Declarative):
+    attr model
+    attr seen = []
+    attr left << model.count + 1
+    attr right << model.count * 2
+    attr bottom << left + right
+    attr pair << model.count + model.other
+    bottom ::
+        seen.append(event.new)
+"""
+
+
+STATIC_SOURCE = """
+import math
+from enaml.core.declarative import Declarative
+
+enamldef Static(Declarative):
+    attr model
+    attr pi << math.pi
+    attr length << len
+    attr count << model.count
+    attr traced << model.count + 1
+"""
+
+
+class Model(HasTraits):
+    count = Int()
+    other = Int()
+
+
+class Parent(HasTraits):
+    child = Instance(Model)
+
+
+def compile_source(source, name):
+    """ Compile an Enaml source string and return the named object.
+
+    """
+    code = EnamlCompiler.compile(parse(source), '<test_expressions>')
+    namespace = {}
+    exec code in namespace
+    return namespace[name]
+
+
+class TestExpressions(unittest.TestCase):
+
+    def setUp(self):
+        push_exception_handler(reraise_exceptions=True)
+        self.Main = compile_source(SOURCE, 'Main')
+
+    def tearDown(self):
+        pop_exception_handler()
+
+    def test_subscription(self):
+        """ Test that a subscription is reevaluated on a change.
+
+        """
+        model = Model()
+        main = self.Main(model=model)
+        main.initialize()
+        self.assertEqual(main.value, 1)
+        model.count = 4
+        self.assertEqual(main.value, 5)
+        model.count = 9
+        self.assertEqual(main.value, 10)
+
+    def test_nonlocals(self):
+        """ Test that the nonlocals name is available in a scope.
+
+        """
+        model = Model(count=1)
+        main = self.Main(model=model)
+        main.initialize()
+        self.assertEqual(main.scaled, 4)
+        model.count = 2
+        self.assertEqual(main.scaled, 6)
+
+    def test_delegation(self):
+        """ Test that a delegation writes back to the model.
+
+        """
+        model = Model()
+        main = self.Main(model=model)
+        main.initialize()
+        main.echo = 7
+        self.assertEqual(model.count, 7)
+        self.assertEqual(main.value, 8)
+
+    def test_notification(self):
+        """ Test that a notification is run on each change.
+
+        """
+        main = self.Main(model=Model())
+        main.initialize()
+        total = main.total
+        main.model = Model()
+        main.model = Model()
+        self.assertEqual(main.total, total + 2)
+
+    def test_scope_reuse(self):
+        """ Test that a cached scope does not hold its owner.
+
+        """
+        model = Model()
+        main = self.Main(model=model)
+        main.initialize()
+        self.assertEqual(main.value, 1)
+        expr = main._expressions['value']
+        scope = expr._scope
+        model.count = 1
+        self.assertEqual(main.value, 2)
+        self.assertTrue(expr._scope is scope)
+        self.assertTrue(scope._obj is None)
+        self.assertEqual(len(expr._tracer.traced_items), 0)
+
+
+class TestSubscriptionRewiring(unittest.TestCase):
+
+    def setUp(self):
+        push_exception_handler(reraise_exceptions=True)
+        self.Chain = compile_source(CHAIN_SOURCE, 'Chain')
+
+    def tearDown(self):
+        pop_exception_handler()
+
+    def test_rewire(self):
+        """ Test that only the changed dependencies are rewired.
+
+        """
+        first = Model(count=1)
+        second = Model(count=2)
+        parent = Parent(child=first)
+        chain = self.Chain(model=parent)
+        chain.initialize()
+        self.assertEqual(chain.value, 1)
+        self.assertEqual(live_handler_count(first), 1)
+        parent.child = second
+        self.assertEqual(chain.value, 2)
+        self.assertEqual(live_handler_count(first), 0)
+        self.assertEqual(live_handler_count(second), 1)
+        self.assertEqual(live_handler_count(parent), 1)
+        first.count = 10
+        self.assertEqual(chain.value, 2)
+        second.count = 20
+        self.assertEqual(chain.value, 20)
+
+    def test_unchanged_dependencies(self):
+        """ Test that a handler is not rehooked for the same dependencies.
+
+        """
+        model = Model(count=1)
+        parent = Parent(child=model)
+        chain = self.Chain(model=parent)
+        chain.initialize()
+        chain.value
+        notifier = chain._expressions['value']._notifier
+        deps = notifier.deps
+        model.count = 3
+        self.assertEqual(chain.value, 3)
+        self.assertTrue(notifier.deps is deps)
+        self.assertEqual(live_handler_count(model), 1)
+
+
+class TestStaticChain(unittest.TestCase):
+
+    def setUp(self):
+        push_exception_handler(reraise_exceptions=True)
+        self.Static = compile_source(STATIC_SOURCE, 'Static')
+
+    def tearDown(self):
+        pop_exception_handler()
+
+    def test_static_chain(self):
+        """ Test the detection of static chains in expressions.
+
+        """
+        def chain(source):
+            return static_chain(ast.parse(source, mode='eval'))
+        self.assertEqual(chain('model'), ('model',))
+        self.assertEqual(chain('model.a.b'), ('model', 'a', 'b'))
+        self.assertEqual(chain('model.a + 1'), None)
+        self.assertEqual(chain('model.a()'), None)
+        self.assertEqual(chain('model[0].a'), None)
+        self.assertEqual(chain('nonlocals.a'), None)
+
+    def test_static_expressions(self):
+        """ Test that static chains use the static expression.
+
+        """
+        model = Model(count=2)
+        static = self.Static(model=model)
+        static.initialize()
+        exprs = static._expressions
+        cls = StaticSubscriptionExpression
+        self.assertTrue(isinstance(exprs['count'], cls))
+        self.assertFalse(isinstance(exprs['traced'], cls))
+        self.assertEqual(static.count, 2)
+        self.assertEqual(static.traced, 3)
+        model.count = 5
+        self.assertEqual(static.count, 5)
+        self.assertEqual(static.traced, 6)
+
+    def test_globals_and_builtins(self):
+        """ Test that a static chain can load globals and builtins.
+
+        """
+        import math
+        static = self.Static(model=Model())
+        static.initialize()
+        self.assertEqual(static.pi, math.pi)
+        self.assertTrue(static.length is len)
+
+    def test_model_swap(self):
+        """ Test that a static chain follows a new root object.
+
+        """
+        first = Model(count=1)
+        static = self.Static(model=first)
+        static.initialize()
+        self.assertEqual(static.count, 1)
+        second = Model(count=2)
+        static.model = second
+        self.assertEqual(static.count, 2)
+        first.count = 10
+        self.assertEqual(static.count, 2)
+        self.assertEqual(live_handler_count(first), 0)
+
+
+class TestRefreshBatch(unittest.TestCase):
+
+    def setUp(self):
+        push_exception_handler(reraise_exceptions=True)
+        Diamond = compile_source(DIAMOND_SOURCE, 'Diamond')
+        self.model = Model()
+        self.diamond = Diamond(model=self.model)
+        self.diamond.initialize()
+        self.assertEqual(self.diamond.bottom, 1)
+        self.assertEqual(self.diamond.pair, 0)
+
+    def tearDown(self):
+        pop_exception_handler()
+
+    def test_unbatched_glitch(self):
+        """ Test that an unbatched change evaluates intermediate states.
+
+        """
+        self.model.count = 1
+        self.assertEqual(len(self.diamond.seen), 2)
+        self.assertEqual(self.diamond.seen[-1], 4)
+
+    def test_diamond(self):
+        """ Test that a batch evaluates a diamond without glitches.
+
+        """
+        with RefreshBatch() as batch:
+            self.model.count = 1
+            self.assertEqual(self.diamond.left, 1)
+        self.assertEqual(self.diamond.seen, [4])
+        self.assertEqual(self.diamond.bottom, 4)
+        self.assertEqual(batch.evaluated, 4)
+        self.assertEqual(batch.saved, 1)
+
+    def test_multiple_changes(self):
+        """ Test that several changes evaluate an expression once.
+
+        """
+        with RefreshBatch() as batch:
+            self.model.count = 1
+            self.model.other = 2
+            self.model.count = 3
+        self.assertEqual(self.diamond.pair, 5)
+        self.assertEqual(self.diamond.seen, [10])
+        self.assertEqual(batch.evaluated, 4)
+
+    def test_nested(self):
+        """ Test that a nested batch joins the outer batch.
+
+        """
+        with RefreshBatch() as outer:
+            with RefreshBatch():
+                self.model.count = 1
+            self.assertEqual(self.diamond.bottom, 1)
+        self.assertEqual(self.diamond.bottom, 4)
+        self.assertEqual(outer.evaluated, 4)
+        self.assertTrue(RefreshBatch.active_batch() is None)
+
+    def test_flush_on_error(self):
+        """ Test that a batch which exits with an error still flushes
+        its dirty expressions and re-raises the error.
+
+        """
+        with self.assertRaises(ValueError):
+            with RefreshBatch() as batch:
+                self.model.count = 1
+                raise ValueError('failed')
+        self.assertEqual(self.diamond.bottom, 4)
+        self.assertEqual(self.diamond.seen, [4])
+        self.assertEqual(batch.evaluated, 4)
+        self.assertTrue(RefreshBatch.active_batch() is None)
+
+
+if __name__ == '__main__':
+    unittest.main()
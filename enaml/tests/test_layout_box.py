@@ -0,0 +1,189 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from ..layout.constraint_encoding import decode_constraints, encode_constraints
+from ..layout.constraint_variable import ConstraintVariable
+from ..layout.layout_box import (
+    LayoutBox, as_linear_constraint, contents_constraints,
+    convert_user_constraints, hard_constraints, size_hint_constraints
+)
+from ..layout.layout_manager import LayoutManager
+
+
+class TestLayoutBox(TestCase):
+    """ Test the conversion of constraint info to solver constraints.
+
+    """
+    def test_primitive(self):
+        """ Test that a primitive is created once for each name.
+
+        """
+        box = LayoutBox('box', 'a')
+        self.assertIs(box.primitive('width'), box.primitive('width'))
+        self.assertIsNot(box.primitive('width'), box.primitive('height'))
+
+    def test_as_linear_constraint(self):
+        """ Test that converted constraints are solved.
+
+        """
+        width = ConstraintVariable('width', 'a')
+        left = ConstraintVariable('left', 'b')
+        cns = [width == 100, (left == width + 10) | 'strong']
+        infos = decode_constraints(encode_constraints(cns))
+        box = LayoutBox('box', 'a')
+        owners = {'a': box}
+        manager = LayoutManager()
+        manager.initialize([as_linear_constraint(i, owners) for i in infos])
+        self.assertAlmostEqual(box.primitive('width').value, 100)
+        # A virtual box is created for the owner which is not given.
+        self.assertIn('b', owners)
+        self.assertAlmostEqual(owners['b'].primitive('left').value, 110)
+
+    def test_invalid_operator(self):
+        """ Test that an unknown operator is rejected.
+
+        """
+        info = ('!=', 'required', 1.0, 0.0, 'a', 'width', 1.0)
+        self.assertRaises(ValueError, as_linear_constraint, info, {})
+
+
+class TestConstraintGenerators(TestCase):
+    """ Test the generators of the client constraints of a box.
+
+    """
+    def setUp(self):
+        self.box = LayoutBox('box', 'a')
+        self.width = self.box.primitive('width')
+        self.height = self.box.primitive('height')
+
+    def solve(self, cns):
+        manager = LayoutManager()
+        manager.initialize(cns)
+        return manager
+
+    def test_size_hint(self):
+        """ Test that a box is sized by its hint.
+
+        """
+        cns = hard_constraints(self.box)
+        cns.extend(size_hint_constraints(
+            self.box, 80, 24, ('strong', 'strong'), ('strong', 'strong'),
+        ))
+        self.assertEqual(len(cns), 8)
+        self.solve(cns)
+        self.assertAlmostEqual(self.width.value, 80)
+        self.assertAlmostEqual(self.height.value, 24)
+
+    def test_size_hint_ignored(self):
+        """ Test that ignored policies and an invalid hint create no
+        constraints.
+
+        """
+        cns = size_hint_constraints(
+            self.box, 80, -1, ('ignore', 'strong'), ('strong', 'strong'),
+        )
+        self.assertEqual(len(cns), 1)
+
+    def test_contents(self):
+        """ Test that the contents boundaries are offset by margins.
+
+        """
+        primitive = self.box.primitive
+        cns = hard_constraints(self.box)
+        cns.extend(contents_constraints(self.box, (1, 2, 3, 4)))
+        cns.extend([self.width == 100, self.height == 50])
+        self.solve(cns)
+        self.assertAlmostEqual(primitive('contents_top').value, 1)
+        self.assertAlmostEqual(primitive('contents_right').value, 98)
+        self.assertAlmostEqual(primitive('contents_bottom').value, 47)
+        self.assertAlmostEqual(primitive('contents_left').value, 4)
+
+
+def ids(cns):
+    """ Get the ids of a list of constraints, which are compared by
+    identity since `==` builds a new constraint.
+
+    """
+    return [id(cn) for cn in cns]
+
+
+def infos_for(*cns):
+    """ Encode and decode constraints into a list of info tuples.
+
+    """
+    return decode_constraints(encode_constraints(cns))
+
+
+class TestConvertUserConstraints(TestCase):
+    """ Test the reuse of converted user constraints across passes.
+
+    """
+    def setUp(self):
+        self.width = ConstraintVariable('width', 'a')
+        self.left = ConstraintVariable('left', 'b')
+        self.infos = infos_for(
+            self.width == 100, self.left == self.width + 10
+        )
+        self.box = LayoutBox('box', 'a')
+        self.owners = {'a': self.box}
+        self.first = convert_user_constraints(self.infos, self.owners, {}, {})
+
+    def test_first_pass(self):
+        """ Test that every constraint is converted on the first pass.
+
+        """
+        cn_map, cns, added, removed = self.first
+        self.assertEqual(len(cns), 2)
+        self.assertEqual(ids(added), ids(cns))
+        self.assertEqual(removed, [])
+        self.assertEqual(sorted(cn_map), sorted(self.infos))
+        self.assertIn('b', self.owners)
+
+    def test_reuse(self):
+        """ Test that unchanged constraints and their virtual owners
+        are reused.
+
+        """
+        cn_map, cns = self.first[:2]
+        owners = {'a': self.box}
+        result = convert_user_constraints(
+            self.infos, owners, cn_map, self.owners
+        )
+        self.assertEqual(ids(result[1]), ids(cns))
+        self.assertEqual(result[2], [])
+        self.assertEqual(result[3], [])
+        self.assertIs(owners['b'], self.owners['b'])
+        # The map of the previous pass is left intact.
+        self.assertEqual(len(cn_map[self.infos[0]]), 1)
+
+    def test_removed(self):
+        """ Test that the constraints of removed infos are reported and
+        that their virtual owners are dropped.
+
+        """
+        cn_map, cns = self.first[:2]
+        owners = {'a': self.box}
+        result = convert_user_constraints(
+            self.infos[:1], owners, cn_map, self.owners
+        )
+        self.assertEqual(ids(result[1]), ids(cns[:1]))
+        self.assertEqual(result[2], [])
+        self.assertEqual(ids(result[3]), ids(cns[1:]))
+        self.assertNotIn('b', owners)
+
+    def test_owner_remap(self):
+        """ Test that nothing is reused when an owner id maps to a
+        different owner.
+
+        """
+        cn_map, cns = self.first[:2]
+        owners = {'a': LayoutBox('box', 'a')}
+        result = convert_user_constraints(
+            self.infos, owners, cn_map, self.owners
+        )
+        self.assertEqual(len(result[2]), 2)
+        self.assertEqual(sorted(ids(result[3])), sorted(ids(cns)))
+        self.assertIsNot(owners['b'], self.owners['b'])
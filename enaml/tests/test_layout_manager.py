@@ -0,0 +1,71 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from casuarius import ConstraintVariable
+
+from enaml.layout.layout_manager import LayoutManager
+
+
+class TestLayoutManagerSizeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.width = ConstraintVariable('width')
+        self.height = ConstraintVariable('height')
+        self.manager = LayoutManager()
+        self.manager.initialize([
+            self.width >= 100, self.height >= 50,
+            self.width <= 400, self.height <= 300,
+        ])
+
+    def test_min_size_cached(self):
+        """ Test that repeated min size requests do not solve again.
+
+        """
+        manager = self.manager
+        first = manager.get_min_size(self.width, self.height)
+        passes = manager.solver_passes
+        second = manager.get_min_size(self.width, self.height)
+        self.assertEqual(first, second)
+        self.assertEqual(manager.solver_passes, passes)
+        self.assertEqual(manager.size_cache_hits, 1)
+
+    def test_max_size_cached(self):
+        """ Test that repeated max size requests do not solve again.
+
+        """
+        manager = self.manager
+        first = manager.get_max_size(self.width, self.height)
+        passes = manager.solver_passes
+        second = manager.get_max_size(self.width, self.height)
+        self.assertEqual(first, second)
+        self.assertEqual(manager.solver_passes, passes)
+
+    def test_cache_invalidated(self):
+        """ Test that replacing constraints invalidates the cache.
+
+        """
+        manager = self.manager
+        min_w, min_h = manager.get_min_size(self.width, self.height)
+        self.assertAlmostEqual(min_w, 100)
+        manager.replace_constraints([], [self.width >= 200])
+        min_w, min_h = manager.get_min_size(self.width, self.height)
+        self.assertAlmostEqual(min_w, 200)
+        self.assertEqual(manager.size_cache_hits, 0)
+
+    def test_empty_replace_keeps_cache(self):
+        """ Test that an empty replacement keeps the cached sizes.
+
+        """
+        manager = self.manager
+        manager.get_min_size(self.width, self.height)
+        passes = manager.solver_passes
+        manager.replace_constraints([], [])
+        manager.get_min_size(self.width, self.height)
+        self.assertEqual(manager.solver_passes, passes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from traits.api import push_exception_handler, pop_exception_handler
+
+from enaml.core.declarative import Declarative
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.core.looper import Looper
+from enaml.core.parser import parse
+
+
+SOURCE = """
+from enaml.core.declarative import Declarative
+from enaml.core.looper import Looper
+
+enamldef Row(Declarative):
+    attr index = -1
+    attr label = ''
+    attr note = ''
+
+enamldef Main(Declarative):
+    attr model
+    Looper:
+        iterable << model
+        key = lambda value: value
+        Row:
+            index << loop_index
+            label = 'row %s' % loop_item
+            note = 'note'
+"""
+
+
+class FakeSession(object):
+    def register(self, obj):
+        pass
+
+    def unregister(self, obj):
+        pass
+
+    def unregister_subtree(self, obj):
+        pass
+
+    def batch(self, object_id, action, content):
+        pass
+
+    def batch_task(self, object_id, action, task):
+        pass
+
+
+def make_looper(iterable, key=None):
+    """ Create an active looper with a single Declarative template.
+
+    """
+    parent = Declarative()
+    looper = Looper(parent, key=key, iterable=iterable)
+    descr = {
+        'type': 'Declarative', 'identifier': '', 'bindings': [],
+        'children': [],
+    }
+    template = ({}, {'Declarative': Declarative}, [descr])
+    looper._templates.append(template)
+    parent.initialize()
+    parent.activate(FakeSession())
+    return parent, looper
+
+
+def make_main(model):
+    """ Create an active `Main` from the compiled SOURCE.
+
+    """
+    code = EnamlCompiler.compile(parse(SOURCE), '<test_looper>')
+    namespace = {}
+    exec code in namespace
+    main = namespace['Main'](model=model)
+    main.initialize()
+    main.activate(FakeSession())
+    return main
+
+
+class TestKeyedLooper(unittest.TestCase):
+
+    def setUp(self):
+        push_exception_handler(reraise_exceptions=True)
+
+    def tearDown(self):
+        pop_exception_handler()
+
+    def test_append_reuses_items(self):
+        """ Test that appending to the iterable only creates one item.
+
+        """
+        parent, looper = make_looper(['a', 'b'], key=lambda item: item)
+        old = looper.items
+        looper.iterable = ['a', 'b', 'c']
+        self.assertEqual(len(looper.items), 3)
+        self.assertTrue(looper.items[0] is old[0])
+        self.assertTrue(looper.items[1] is old[1])
+        self.assertTrue(looper.items[2][0].is_initialized)
+
+    def test_remove_and_move(self):
+        """ Test that removed items are destroyed and kept items move.
+
+        """
+        parent, looper = make_looper(['a', 'b', 'c'], key=lambda item: item)
+        a, b, c = [iteration[0] for iteration in looper.items]
+        looper.iterable = ['c', 'a']
+        self.assertTrue(b.is_destroyed)
+        self.assertFalse(a.is_destroyed)
+        self.assertEqual(parent.children, (c, a, looper))
+
+    def test_duplicate_keys(self):
+        """ Test that duplicate keys raise a ValueError.
+
+        """
+        parent, looper = make_looper(['a'], key=lambda item: item)
+        with self.assertRaises(ValueError):
+            looper.iterable = ['b', 'b']
+
+    def test_unkeyed_recreates_items(self):
+        """ Test that an unkeyed looper recreates all of its items.
+
+        """
+        parent, looper = make_looper(['a', 'b'])
+        old = looper.items
+        looper.iterable = ['a', 'b', 'c']
+        self.assertTrue(old[0][0].is_destroyed)
+        self.assertFalse(looper.items[0] is old[0])
+
+    def test_refresh_loop_variables(self):
+        """ Test that only the expressions reading a changed loop
+        variable are refreshed.
+
+        """
+        main = make_main(['a', 'b', 'c'])
+        a, b, c = main.children[:3]
+        b.label = 'edited'
+        c.note = 'edited'
+        main.model = ['b', 'c']
+        self.assertTrue(a.is_destroyed)
+        self.assertEqual(main.children[:2], (b, c))
+        self.assertEqual((b.index, c.index), (0, 1))
+        # The loop items did not change, so user assigned values which
+        # are bound to `loop_item` or to no loop variable are kept.
+        self.assertEqual(b.label, 'edited')
+        self.assertEqual(c.note, 'edited')
+        self.assertEqual(c.label, 'row c')
+
+
+if __name__ == '__main__':
+    unittest.main()
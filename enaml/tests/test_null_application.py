@@ -0,0 +1,117 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.application import schedule
+from enaml.null.null_application import NullApplication
+from enaml.session import Session
+from enaml.widgets.container import Container
+from enaml.widgets.label import Label
+from enaml.widgets.window import Window
+
+
+class SimpleSession(Session):
+    """ A session with a single window.
+
+    """
+    def on_open(self):
+        self.windows.append(Window(title='first'))
+
+
+class PanelSession(Session):
+    """ A session with a window which holds a panel of labels.
+
+    """
+    def on_open(self):
+        window = Window(title='panel')
+        self.panel = Container(window)
+        for ignored in xrange(5):
+            row = Container(self.panel)
+            for ignored in xrange(3):
+                Label(row, text='label')
+        self.windows.append(window)
+
+
+class TestNullApplication(unittest.TestCase):
+
+    def setUp(self):
+        self.app = NullApplication([
+            SimpleSession.factory('simple'), PanelSession.factory('panel'),
+        ])
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def test_start_session(self):
+        """ Test that a session is started with a null client.
+
+        """
+        app = self.app
+        session_id = app.start_session('simple')
+        self.assertTrue(app.session(session_id).is_active)
+        client = app.client_session(session_id)
+        self.assertEqual(client.object_count(), 1)
+
+    def test_message_stats(self):
+        """ Test that messages sent to the client are recorded.
+
+        """
+        app = self.app
+        session_id = app.start_session('simple')
+        window = app.session(session_id).windows[0]
+        window.title = 'second'
+        window.title = 'third'
+        app.process_events()
+        stats = app.client_stats(session_id)
+        self.assertEqual(stats.action_counts['set_title'], 2)
+        self.assertTrue(stats.total_bytes > 0)
+        self.assertEqual(app.client_session(session_id).invalid_count, 0)
+
+    def test_end_session(self):
+        """ Test that ending a session removes the client session.
+
+        """
+        app = self.app
+        session_id = app.start_session('simple')
+        app.end_session(session_id)
+        self.assertTrue(app.session(session_id) is None)
+        self.assertTrue(app.client_session(session_id) is None)
+
+    def test_event_loop(self):
+        """ Test that the event loop runs deferred and timed calls.
+
+        """
+        app = self.app
+        results = []
+        app.timed_call(1, results.append, 'timed')
+        app.deferred_call(results.append, 'deferred')
+        schedule(results.append, ('scheduled',))
+        app.start()
+        self.assertEqual(results, ['deferred', 'scheduled', 'timed'])
+
+    def test_destroy_subtree(self):
+        """ Test that a subtree is destroyed with a single action.
+
+        """
+        app = self.app
+        session_id = app.start_session('panel')
+        app.process_events()
+        session = app.session(session_id)
+        client = app.client_session(session_id)
+        self.assertEqual(client.object_count(), 22)
+        stats = app.client_stats(session_id)
+        stats.reset()
+        session.panel.destroy()
+        app.process_events()
+        self.assertEqual(stats.action_counts['destroy_subtree'], 1)
+        self.assertFalse('destroy' in stats.action_counts)
+        self.assertEqual(client.object_count(), 1)
+        self.assertEqual(client.invalid_count, 0)
+        registered = session._registered_objects.keys()
+        self.assertEqual(registered, [session.windows[0].object_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.null.null_application import NullApplication
+from enaml.session import Session
+from enaml.widgets.window import Window
+
+
+class SimpleSession(Session):
+    """ A session with a single window.
+
+    """
+    def on_open(self):
+        self.windows.append(Window())
+
+
+class TestSessionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = SimpleSession.factory('simple')
+        self.app = NullApplication([self.factory])
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def test_prewarm(self):
+        """ Test that the pool is filled during idle processing.
+
+        """
+        self.factory.prewarm(3)
+        self.app.process_events()
+        stats = self.factory.pool_stats()
+        self.assertEqual(stats['available'], 3)
+        self.assertEqual(stats['warm_count'], 3)
+
+    def test_pool_hit(self):
+        """ Test that a session is handed out from the pool.
+
+        """
+        factory = self.factory
+        factory.prewarm(1)
+        self.app.process_events()
+        pooled = factory._pool[0]
+        session_id = self.app.start_session('simple')
+        self.assertTrue(self.app.session(session_id) is pooled)
+        self.assertTrue(pooled.is_active)
+        self.app.process_events()
+        stats = factory.pool_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['available'], 1)
+
+    def test_pool_miss(self):
+        """ Test that an empty pool still opens a session.
+
+        """
+        factory = self.factory
+        factory.prewarm(1)
+        session_id = self.app.start_session('simple')
+        self.assertTrue(self.app.session(session_id).is_active)
+        self.assertEqual(factory.pool_stats()['misses'], 1)
+
+    def test_clear_pool(self):
+        """ Test that clearing the pool destroys the pooled sessions.
+
+        """
+        factory = self.factory
+        factory.prewarm(1)
+        self.app.process_events()
+        window = factory._pool[0].windows[0]
+        factory.clear_pool()
+        self.assertTrue(window.is_destroyed)
+        self.assertEqual(factory.pool_stats()['available'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
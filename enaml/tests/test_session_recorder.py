@@ -0,0 +1,78 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from cStringIO import StringIO
+import unittest
+
+from enaml.null.null_application import NullApplication
+from enaml.session import Session
+from enaml.session_recorder import (
+    SessionReplayer, load_recording, record_session,
+)
+from enaml.widgets.slider import Slider
+from enaml.widgets.window import Window
+
+
+class SliderSession(Session):
+    """ A session with a window holding a slider.
+
+    """
+    def on_open(self):
+        window = Window()
+        Slider(window)
+        self.windows.append(window)
+
+
+class TestSessionRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.app = NullApplication([SliderSession.factory('slider')])
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def record(self):
+        """ Record a session in which the client moves the slider.
+
+        """
+        app = self.app
+        session_id = app.start_session('slider')
+        session = app.session(session_id)
+        stream = StringIO()
+        record_session(session, stream)
+        slider = session.windows[0].children[0]
+        client = app.client_session(session_id)
+        client.send(slider.object_id, 'value_changed', {'value': 42})
+        app.process_events()
+        slider.maximum = 50
+        app.process_events()
+        stream.seek(0)
+        return load_recording(stream)
+
+    def test_record(self):
+        """ Test that both directions of messages are recorded.
+
+        """
+        header, records = self.record()
+        directions = [record[1] for record in records]
+        self.assertEqual(directions, ['c', 's'])
+        self.assertEqual(records[0][2], [0, 0])
+        self.assertEqual(records[0][3], 'value_changed')
+
+    def test_replay(self):
+        """ Test that a recorded client stream is replayed by path.
+
+        """
+        header, records = self.record()
+        replayer = SessionReplayer(self.app, 'slider', records)
+        session_id, stats = replayer.replay()
+        slider = self.app.session(session_id).windows[0].children[0]
+        self.assertEqual(slider.value, 42)
+        summary = stats.as_dict()
+        self.assertEqual(summary['actions']['value_changed']['count'], 1)
+        self.assertEqual(summary['unresolved'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Conformance tests for the solver backends.
+
+A test case is generated for each registered backend, so a backend
+which is registered when this module is imported is checked against
+the behavior which the LayoutManager expects of it.
+
+"""
+import unittest
+
+from enaml.layout.layout_manager import LayoutManager
+from enaml.layout.solver_backend import (
+    SolverBackend, backend_class, default_backend, register_backend,
+    registered_backends, using_backend
+)
+
+
+class BackendConformance(object):
+    """ A mixin of the tests which every solver backend must pass.
+
+    """
+    #: The name of the backend under test.
+    backend_name = None
+
+    def setUp(self):
+        self.cls = backend_class(self.backend_name)
+        self.solver = self.cls()
+        self.x = self.cls.variable('x')
+        self.y = self.cls.variable('y')
+
+    def test_required(self):
+        """ Test that required constraints are solved.
+
+        """
+        x, y = self.x, self.y
+        self.solver.add_constraints([x == 10, y == 2 * x + 5])
+        self.assertAlmostEqual(x.value, 10)
+        self.assertAlmostEqual(y.value, 25)
+
+    def test_strengths(self):
+        """ Test that a stronger constraint takes precedence.
+
+        """
+        x = self.x
+        self.solver.add_constraints([(x >= 10) | 'strong', (x <= 5) | 'weak'])
+        self.assertAlmostEqual(x.value, 10)
+
+    def test_weights(self):
+        """ Test that a heavier constraint of equal strength wins.
+
+        """
+        x = self.x
+        self.solver.add_constraints(
+            [(x == 10) | 'medium' | 1.0, (x == 20) | 'medium' | 2.0]
+        )
+        self.assertAlmostEqual(x.value, 20)
+
+    def test_replace(self):
+        """ Test that replaced constraints are solved.
+
+        """
+        x = self.x
+        old = x == 10
+        self.solver.add_constraints([x >= 0, old])
+        new = x == 20
+        self.solver.replace_constraints([old], [new])
+        self.assertAlmostEqual(x.value, 20)
+
+    def test_suggest_values(self):
+        """ Test that suggested values are solved within the bounds.
+
+        """
+        x, y = self.x, self.y
+        self.solver.add_constraints([x >= 0, x <= 100, y == x + 1])
+        with self.solver.suggest_values([(x, 50)], 'medium', 1.0):
+            self.assertAlmostEqual(x.value, 50)
+            self.assertAlmostEqual(y.value, 51)
+        with self.solver.suggest_values([(x, 500)], 'strong', 1.0):
+            self.assertAlmostEqual(x.value, 100)
+
+    def test_layout_manager(self):
+        """ Test the size computations of a LayoutManager.
+
+        """
+        x, y = self.x, self.y
+        with using_backend(self.backend_name):
+            manager = LayoutManager()
+        manager.initialize([x >= 100, y >= 50, x <= 400])
+        min_w, min_h = manager.get_min_size(x, y)
+        self.assertAlmostEqual(min_w, 100)
+        self.assertAlmostEqual(min_h, 50)
+        max_w, max_h = manager.get_max_size(x, y)
+        self.assertAlmostEqual(max_w, 400)
+        self.assertEqual(max_h, -1)
+        sizes = []
+        manager.layout(lambda: sizes.append((x.value, y.value)), x, y,
+                       (200, 80))
+        self.assertEqual(len(sizes), 1)
+        self.assertAlmostEqual(sizes[0][0], 200)
+        self.assertAlmostEqual(sizes[0][1], 80)
+
+
+for _name in registered_backends():
+    _cls_name = 'Test%sBackend' % _name.title().replace('_', '')
+    globals()[_cls_name] = type(
+        _cls_name, (BackendConformance, unittest.TestCase),
+        {'backend_name': _name},
+    )
+del _name, _cls_name
+
+
+class TestBackendRegistry(unittest.TestCase):
+    """ Test the registration and selection of backends.
+
+    """
+    def test_register_invalid(self):
+        """ Test that a class which is not a backend is rejected.
+
+        """
+        self.assertRaises(TypeError, register_backend, 'bad', object)
+
+    def test_abstract_variable(self):
+        """ Test that a backend without a variable factory cannot be
+        instantiated.
+
+        """
+        class Incomplete(SolverBackend):
+            def add_constraints(self, cns):
+                pass
+
+            def replace_constraints(self, old_cns, new_cns):
+                pass
+
+            def suggest_values(self, values, strength, weight):
+                pass
+
+        self.assertRaises(TypeError, Incomplete)
+
+    def test_unknown_backend(self):
+        """ Test that an unknown backend name is rejected.
+
+        """
+        self.assertRaises(ValueError, backend_class, 'missing')
+
+    def test_using_backend(self):
+        """ Test that the default backend is restored.
+
+        """
+        old = default_backend()
+        with using_backend('casuarius'):
+            self.assertEqual(default_backend(), 'casuarius')
+            self.assertIs(backend_class(), backend_class('casuarius'))
+        self.assertEqual(default_backend(), old)
+        with self.assertRaises(ValueError):
+            with using_backend('missing'):
+                pass
+        self.assertEqual(default_backend(), old)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2013, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import random
+import re
+import unittest
+
+from enaml.core.object import Object
+
+
+class Leaf(Object):
+    pass
+
+
+def traversal_find_all(obj, name, regex=False):
+    """ Find all the named objects of a subtree by traversal.
+
+    """
+    if regex:
+        rgx = re.compile(name)
+        return [o for o in obj.traverse() if rgx.match(o.name)]
+    return [o for o in obj.traverse() if o.name == name]
+
+
+def build_tree(rng, count):
+    """ Build a random tree with repeated names and mixed types.
+
+    """
+    root = Object(name='root')
+    nodes = [root]
+    for idx in xrange(count):
+        parent = rng.choice(nodes)
+        cls = Leaf if idx % 3 == 0 else Object
+        nodes.append(cls(parent, name='n%d' % (idx % 7)))
+    return root, nodes
+
+
+class TestTreeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(42)
+        self.root, self.nodes = build_tree(self.rng, 60)
+        self.root.enable_index()
+
+    def check(self, subtree):
+        for idx in xrange(7):
+            name = 'n%d' % idx
+            expected = traversal_find_all(subtree, name)
+            self.assertEqual(subtree.find_all(name), expected)
+            first = expected[0] if expected else None
+            self.assertTrue(subtree.find(name) is first)
+        expected = traversal_find_all(subtree, 'n[13]', regex=True)
+        self.assertEqual(subtree.find_all('n[13]', regex=True), expected)
+        expected = [o for o in subtree.traverse() if isinstance(o, Leaf)]
+        self.assertEqual(subtree.find_by_type(Leaf), expected)
+
+    def test_matches_traversal(self):
+        """ Test that the indexed lookups match a traversal.
+
+        """
+        self.check(self.root)
+        self.check(self.nodes[5])
+
+    def test_mutations(self):
+        """ Test that the index follows the changes to the tree.
+
+        """
+        rng = self.rng
+        nodes = self.nodes[1:]
+        for ignored in xrange(40):
+            node = rng.choice(nodes)
+            if node.is_destroyed:
+                continue
+            action = rng.randrange(4)
+            if action == 0:
+                node.name = 'n%d' % rng.randrange(7)
+            elif action == 1:
+                subtree = set(node.traverse())
+                targets = [n for n in self.root.traverse()
+                           if n not in subtree]
+                if targets:
+                    node.set_parent(rng.choice(targets))
+            elif action == 2:
+                node.destroy()
+            else:
+                new = Leaf(name='n%d' % rng.randrange(7))
+                self.root.insert_children(node, [new])
+                nodes.append(new)
+            self.check(self.root)
+
+    def test_detached_subtree(self):
+        """ Test that a detached subtree leaves the index.
+
+        """
+        node = self.nodes[3]
+        node.set_parent(None)
+        self.assertEqual(self.root.find_all(node.name),
+                         traversal_find_all(self.root, node.name))
+        self.assertTrue(node._tree_index is None)
+        self.assertTrue(self.root.find_by_type(Leaf)[0] is not node)
+
+    def test_disable(self):
+        """ Test that disabling the index falls back to traversal.
+
+        """
+        self.root.disable_index()
+        self.assertTrue(self.nodes[4]._tree_index is None)
+        self.check(self.root)
+
+    def test_not_root(self):
+        """ Test that an index can only be enabled on a root object.
+
+        """
+        self.assertRaises(ValueError, self.nodes[1].enable_index)
+
+
+if __name__ == '__main__':
+    unittest.main()
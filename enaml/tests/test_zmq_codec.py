@@ -0,0 +1,57 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.zeromq import zmq_codec
+
+
+class TestZMQCodec(unittest.TestCase):
+
+    def test_json_round_trip(self):
+        """ Test that the JSON codec round trips a message part.
+
+        """
+        codec = zmq_codec.JSONCodec()
+        part = {'action': 'set_value', 'content': {'value': [1, 2.5, None]}}
+        self.assertEqual(codec.loads(codec.dumps(part)), part)
+
+    def test_detect_json(self):
+        """ Test that a JSON header is detected as the JSON codec.
+
+        """
+        data = zmq_codec.JSONCodec().dumps({'msg_type': 'enaml_request'})
+        codec = zmq_codec.detect_codec(data)
+        self.assertEqual(codec.name, 'json')
+
+    def test_detect_unknown(self):
+        """ Test that an unknown frame falls back to the default codec.
+
+        """
+        codec = zmq_codec.detect_codec('')
+        self.assertTrue(codec is zmq_codec.default_codec)
+
+    @unittest.skipIf(zmq_codec.msgpack is None, 'msgpack is not installed')
+    def test_binary_round_trip(self):
+        """ Test that the binary codec preserves text and byte strings.
+
+        """
+        codec = zmq_codec.lookup_codec('binary')
+        part = {u'action': u'set_image', u'data': '\x89PNG\x00\xff'}
+        result = codec.loads(codec.dumps(part))
+        self.assertEqual(result, part)
+        self.assertTrue(isinstance(result[u'data'], str))
+
+    @unittest.skipIf(zmq_codec.msgpack is None, 'msgpack is not installed')
+    def test_detect_binary(self):
+        """ Test that a binary header is detected as the binary codec.
+
+        """
+        codec = zmq_codec.lookup_codec('binary')
+        data = codec.dumps({u'msg_type': u'enaml_request'})
+        self.assertTrue(zmq_codec.detect_codec(data) is codec)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,8 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from enaml.layout.layout_helpers import vbox
+
 from .enaml_test_case import EnamlTestCase
 
 
@@ -39,6 +41,99 @@ enamldef MainView(Window):
         self.assertTrue(initial_size[0] < no_padding_size[0])
         self.assertTrue(initial_size[1] < no_padding_size[1])
 
+
+class TestContainerRelayout(EnamlTestCase):
+    """ Unit tests for the incremental relayout of a QtContainer.
+
+    """
+
+    def setUp(self):
+        enaml_source = """
+from enaml.widgets.api import Container, Window, Field
+from enaml.layout.layout_helpers import vbox
+
+enamldef MainView(Window):
+    Container:
+        constraints = [vbox(first, second, third)]
+        Field:
+            id: first
+        Field:
+            id: second
+        Field:
+            id: third
+"""
+        self.parse_and_create(enaml_source)
+        self.server_widget = self.find_server_widget(self.view, "Container")
+        self.client = self.find_client_object(self.client_view, "QtContainer")
+        self.manager = self.client._layout_manager
+        self.replaced = []
+        replace = self.manager.replace_constraints
+
+        def record(old_cns, new_cns):
+            self.replaced.append((list(old_cns), list(new_cns)))
+            replace(old_cns, new_cns)
+
+        self.manager.replace_constraints = record
+
+    def find_client_object(self, root, type_name):
+        """ Find the first client object of a given type in a tree.
+
+        """
+        if type_name in [cls.__name__ for cls in type(root).__mro__]:
+            return root
+        for child in root.children():
+            found = self.find_client_object(child, type_name)
+            if found is not None:
+                return found
+        return None
+
+    def test_unchanged_shape(self):
+        """ Test that a relayout with an unchanged shape replaces the
+        changed constraints in the existing layout manager.
+
+        """
+        first, second, third = self.server_widget.widgets
+        with self.app.process_events():
+            self.server_widget.constraints = [vbox(third, second, first)]
+        self.assertTrue(self.client._layout_manager is self.manager)
+        # The reordered vbox changes the user constraints, which are
+        # swapped for their new conversions in a single replacement.
+        replaced = [(old, new) for old, new in self.replaced if old and new]
+        self.assertEqual(len(replaced), 1)
+
+    def test_changed_shape(self):
+        """ Test that a relayout with a changed shape rebuilds the
+        layout manager.
+
+        """
+        third = self.server_widget.widgets[2]
+        with self.app.process_events():
+            third.destroy()
+        manager = self.client._layout_manager
+        self.assertFalse(manager is self.manager)
+        self.assertFalse(manager is None)
+
+    def test_replace_failure(self):
+        """ Test that a failure to replace the constraints rebuilds the
+        layout manager.
+
+        """
+        def fail(old_cns, new_cns):
+            raise RuntimeError('replace failed')
+
+        self.manager.replace_constraints = fail
+        first, second, third = self.server_widget.widgets
+        with self.app.process_events():
+            self.server_widget.constraints = [vbox(third, second, first)]
+        manager = self.client._layout_manager
+        self.assertFalse(manager is self.manager)
+        self.assertFalse(manager is None)
+        self.assertEqual(
+            self.client._layout_shape,
+            self.client._compute_layout_shape(self.client._layout_table),
+        )
+
+
 if __name__ == '__main__':
     import unittest
     unittest.main()
@@ -2,12 +2,13 @@
 #  Copyright (c) 2011, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import Property, Enum, Instance, List
+from traits.api import Any, Property, Enum, Instance, List
 
-from enaml.application import Application, ScheduledTask
+from enaml.application import Application
 from enaml.layout.ab_constrainable import ABConstrainable
 from enaml.layout.box_model import BoxModel
-from enaml.layout.layout_helpers import expand_constraints
+from enaml.layout.constraint_encoding import encode_constraints
+from enaml.layout.layout_helpers import DefaultSpacing, expand_constraints
 
 from .widget import Widget
 
@@ -23,6 +24,40 @@ def get_from_box_model(self, name):
     return getattr(self._box_model, name)
 
 
+#: The number of constraint generations served from, and missed by,
+#: the per-component constraint caches.
+_layout_cache_hits = 0
+_layout_cache_misses = 0
+
+
+def layout_cache_stats():
+    """ Get the metrics of the constraint generation caches.
+
+    Returns
+    -------
+    result : dict
+        A dict with the number of 'hits' and 'misses' of the caches
+        of all ConstraintsWidget instances, and the 'hit_rate'.
+
+    """
+    requests = _layout_cache_hits + _layout_cache_misses
+    hit_rate = float(_layout_cache_hits) / requests if requests else 0.0
+    return {
+        'hits': _layout_cache_hits,
+        'misses': _layout_cache_misses,
+        'hit_rate': hit_rate,
+    }
+
+
+def reset_layout_cache_stats():
+    """ Reset the metrics of the constraint generation caches.
+
+    """
+    global _layout_cache_hits, _layout_cache_misses
+    _layout_cache_hits = 0
+    _layout_cache_misses = 0
+
+
 class ConstraintsWidget(Widget):
     """ A Widget subclass which adds constraint information.
 
@@ -102,14 +137,16 @@ class ConstraintsWidget(Widget):
     #: The default is 'strong' for height.
     resist_height = PolicyEnum('strong')
 
-    #: The private application task used to collapse layout messages.
-    _layout_task = Instance(ScheduledTask)
-
     #: The private storage the box model instance for this component.
     _box_model = Instance(BoxModel)
     def __box_model_default(self):
         return BoxModel(self.object_id)
 
+    #: The private cache of the last generated constraints. This is a
+    #: tuple of (key, inputs, constraints) or None. The inputs keep the
+    #: objects whose ids are in the key alive, so the ids are not reused.
+    _layout_cache = Any
+
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
@@ -120,7 +157,8 @@ class ConstraintsWidget(Widget):
         attributes dict. The value is a dict with the following keys.
 
         'constraints'
-            A list of dictionaries representing linear constraints.
+            A table of the linear constraints of the component in the
+            compact encoding of `enaml.layout.constraint_encoding`.
 
         'resist_clip'
             A tuple containing width and height clip policies.
@@ -188,15 +226,16 @@ class ConstraintsWidget(Widget):
         # that it can be sent along with any object tree changes.
         app = Application.instance()
         if app is not None:
-            task = self._layout_task
-            if task is None:
-                def notifier(ignored):
-                    self._layout_task = None
-                def layout_task():
-                    self.batch_action('relayout', self._layout_info())
-                task = app.schedule(layout_task)
-                task.notify(notifier)
-                self._layout_task = task
+            key = (self.object_id, 'relayout')
+            app.schedule(self._batch_relayout, key=key)
+
+    def _batch_relayout(self):
+        """ Batch the 'relayout' action with the current layout info.
+
+        This is invoked as a scheduled task by `_send_relayout`.
+
+        """
+        self.batch_action('relayout', self._layout_info())
 
     #--------------------------------------------------------------------------
     # Constraints Generation
@@ -222,23 +261,57 @@ class ConstraintsWidget(Widget):
         return info
 
     def _generate_constraints(self):
-        """ Creates a list of constraint info dictionaries.
+        """ Creates the encoded table of the constraints.
 
         This method converts the list of symbolic constraints returned
-        by the call to '_collect_constraints' into a list of constraint
-        info dictionaries which can be serialized and sent to clients.
+        by the call to '_collect_constraints' into a compact table of
+        constraints which can be serialized and sent to clients. The
+        result is cached, and is reused until the inputs returned by
+        '_layout_inputs' change.
 
         Returns
         -------
-        result : list of dicts
-            A list of dictionaries which are serializable versions of
-            the symbolic constraints defined for the widget.
+        result : dict
+            The table created by `encode_constraints` for the symbolic
+            constraints defined for the widget.
 
         """
+        global _layout_cache_hits, _layout_cache_misses
+        inputs = self._layout_inputs()
+        key = tuple(map(id, inputs[0])) + tuple(map(id, inputs[1]))
+        key += inputs[2:]
+        cache = self._layout_cache
+        if cache is not None and cache[0] == key:
+            _layout_cache_hits += 1
+            return cache[2]
+        _layout_cache_misses += 1
         cns = self._collect_constraints()
-        cns = [cn.as_dict() for cn in expand_constraints(self, cns)]
+        cns = encode_constraints(expand_constraints(self, cns))
+        self._layout_cache = (key, inputs, cns)
         return cns
 
+    def _layout_inputs(self):
+        """ Returns the inputs which determine the generated constraints.
+
+        The first two items of the returned tuple are the sequences of
+        user constraints and children, which are compared by identity.
+        The remaining items are compared by equality. The default
+        inputs also include the default spacing of the layout helpers.
+        Subclasses which generate constraints from other state should
+        reimplement this method and extend the tuple.
+
+        Returns
+        -------
+        result : tuple
+            A tuple of the inputs of constraint generation.
+
+        """
+        spacing = DefaultSpacing
+        return (
+            tuple(self.constraints), tuple(self.children),
+            spacing.ABUTMENT, spacing.ALIGNMENT, spacing.BOX_MARGINS,
+        )
+
     def _collect_constraints(self):
         """ Creates a list of symbolic constraints for the component.
 
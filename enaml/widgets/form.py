@@ -38,6 +38,14 @@ class Form(Container):
     #: the height is desired.
     hug_height = 'strong'
 
+    def _layout_inputs(self):
+        """ Overridden parent class method which adds the layout strength
+        to the inputs of constraint generation.
+
+        """
+        inputs = super(Form, self)._layout_inputs()
+        return inputs + (self.layout_strength,)
+
     def _component_constraints(self):
         """ Supplies the constraints which layout the children in a
         two column form.
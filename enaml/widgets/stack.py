@@ -29,6 +29,16 @@ class Stack(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
+    def post_initialize(self):
+        """ A reimplemented initialization method.
+
+        This sets the initial lazy state of the stack items, which
+        depends on the initial index of the stack.
+
+        """
+        self._update_lazy_items()
+        super(Stack, self).post_initialize()
+
     def snapshot(self):
         """ Returns the snapshot for the control.
 
@@ -45,6 +55,23 @@ class Stack(ConstraintsWidget):
         super(Stack, self).bind()
         self.publish_attributes('index', 'transition')
 
+    #--------------------------------------------------------------------------
+    # Children Events
+    #--------------------------------------------------------------------------
+    def children_event(self, event):
+        """ Handle a `ChildrenEvent` on a stack.
+
+        A change to the children can change which item is current, so
+        the lazy state of the stack items, and of any items which were
+        removed from the stack, is updated.
+
+        """
+        super(Stack, self).children_event(event)
+        for child in event.old:
+            if child.parent is not self and isinstance(child, StackItem):
+                child.update_lazy_state()
+        self._update_lazy_items()
+
     #--------------------------------------------------------------------------
     # Message Handling
     #--------------------------------------------------------------------------
@@ -58,6 +85,21 @@ class Stack(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
+    def _update_lazy_items(self):
+        """ Update the lazy state of the stack items.
+
+        """
+        for item in self.stack_items:
+            item.update_lazy_state()
+
+    def _index_changed(self):
+        """ The change handler for the 'index' attribute.
+
+        This updates the lazy state of the stack items.
+
+        """
+        self._update_lazy_items()
+
     @cached_property
     def _get_stack_items(self):
         """ The getter for the 'stack_items' property.
@@ -38,3 +38,23 @@ class StackItem(Widget):
                 widget = child
         return widget
 
+    #--------------------------------------------------------------------------
+    # Lazy Evaluation API
+    #--------------------------------------------------------------------------
+    def is_hidden(self):
+        """ A reimplemented parent class method.
+
+        A stack item is also hidden when it is not the current item of
+        its parent Stack.
+
+        """
+        if super(StackItem, self).is_hidden():
+            return True
+        # Imported here to avoid a circular import.
+        from .stack import Stack
+        parent = self.parent
+        if isinstance(parent, Stack):
+            items = parent.stack_items
+            index = parent.index
+            return not (0 <= index < len(items) and items[index] is self)
+        return False
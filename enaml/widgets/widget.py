@@ -80,3 +80,19 @@ class Widget(Messenger):
         )
         self.publish_attributes(*attrs)
 
+    #--------------------------------------------------------------------------
+    # Lazy Evaluation API
+    #--------------------------------------------------------------------------
+    def is_hidden(self):
+        """ A reimplemented parent class method.
+
+        A widget is hidden when it is not visible.
+
+        """
+        return not self.visible
+
+    def _visible_changed(self):
+        """ The change handler for the 'visible' attribute.
+
+        """
+        self.update_lazy_state()
@@ -4,83 +4,14 @@
 #------------------------------------------------------------------------------
 from collections import deque
 
-from casuarius import weak
+from enaml.layout.layout_box import (
+    as_linear_constraint, contents_constraints
+)
 from enaml.layout.layout_manager import LayoutManager
 
 import wx
 
-from .wx_constraints_widget import WxConstraintsWidget, LayoutBox
-
-
-def _convert_cn_info(info, owners):
-    """ Converts the lhs or rhs of a linear constraint info dict into
-    its corresponding casuarius object.
-
-    """
-    cn_type = info['type']
-    if cn_type == 'linear_expression':
-        const = info['constant']
-        terms = info['terms']
-        convert = _convert_cn_info
-        res = sum(convert(t, owners) for t in terms) + const
-    elif cn_type == 'term':
-        coeff = info['coeff']
-        var = info['var']
-        res = coeff * _convert_cn_info(var, owners)
-    elif cn_type == 'linear_symbolic':
-        sym_name = info['name']
-        owner_id = info['owner']
-        owner = owners.get(owner_id, None)
-        if owner is None:
-            owner = owners[owner_id] = LayoutBox('_virtual', owner_id)
-        res = owner.primitive(sym_name)
-    else:
-        msg = 'Unhandled constraint info type `%s`' % cn_type
-        raise ValueError(msg)
-    return res
-
-
-def as_linear_constraint(info, owners):
-    """ Converts a constraint info dict into a casuarius linear
-    constraint.
-
-    For constraints specified in the info dict which do not have a
-    corresponding owner (e.g. those created by box helpers) a
-    constraint variable will be synthesized.
-
-    Parameters
-    ----------
-    info : dict
-        A dictionary sent from an Enaml widget which specifies the
-        information for a linear constraint.
-
-    owners : dict
-        A mapping from constraint id to an owner object which holds
-        the actual casuarius constraint variables as attributes.
-
-    Returns
-    -------
-    result : LinearConstraint
-        A casuarius linear constraint for the given dict.
-
-    """
-    if info['type'] != 'linear_constraint':
-        msg = 'The info dict does not specify a linear constraint.'
-        raise ValueError(msg)
-    convert = _convert_cn_info
-    lhs = convert(info['lhs'], owners)
-    rhs = convert(info['rhs'], owners)
-    op = info['op']
-    if op == '==':
-        cn = lhs == rhs
-    elif op == '<=':
-        cn = lhs <= rhs
-    elif op == '>=':
-        cn = lhs >= rhs
-    else:
-        msg = 'Unhandled constraint operator `%s`' % op
-        raise ValueError(msg)
-    return cn | info['strength'] | info['weight']
+from .wx_constraints_widget import WxConstraintsWidget
 
 
 class wxContainer(wx.PyPanel):
@@ -393,22 +324,8 @@ class WxContainer(WxConstraintsWidget):
         if not cns:
             padding = self._padding
             margins = self.contents_margins()
-            tval, rval, bval, lval = map(sum, zip(padding, margins))
-            primitive = self.layout_box.primitive
-            top = primitive('top')
-            left = primitive('left')
-            width = primitive('width')
-            height = primitive('height')
-            contents_top = primitive('contents_top')
-            contents_left = primitive('contents_left')
-            contents_right = primitive('contents_right')
-            contents_bottom = primitive('contents_bottom')
-            cns = [
-                contents_top == (top + tval),
-                contents_left == (left + lval),
-                contents_right == (left + width - rval),
-                contents_bottom == (top + height - bval),
-            ]
+            offsets = map(sum, zip(padding, margins))
+            cns = contents_constraints(self.layout_box, offsets)
             self._contents_cns = cns
         return cns
 
@@ -529,7 +446,7 @@ class WxContainer(WxConstraintsWidget):
 
         """
         # The mapping of constraint owners and the list of constraint
-        # info dictionaries provided by the Enaml widgets.
+        # info tuples provided by the Enaml widgets.
         box = self.layout_box
         cn_owners = {self.object_id(): box}
         cn_dicts = list(self.user_constraints())
@@ -558,7 +475,7 @@ class WxContainer(WxConstraintsWidget):
                 raw_cns_extend(child.size_hint_constraints())
                 cn_dicts_extend(child.user_constraints())
 
-        # Convert the list of Enaml constraints info dicts to actual
+        # Convert the list of Enaml constraint info tuples to actual
         # casuarius LinearConstraint objects for the solver.
         add_cn = raw_cns.append
         as_cn = as_linear_constraint
@@ -670,7 +587,7 @@ class WxContainer(WxConstraintsWidget):
             primitive = self.layout_box.primitive
             width = primitive('width')
             height = primitive('height')
-            w, h = self._layout_manager.get_min_size(width, height, weak)
+            w, h = self._layout_manager.get_min_size(width, height, 'weak')
             res = wx.Size(w, h)
         else:
             res = wx.Size(-1, -1)
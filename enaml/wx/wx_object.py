@@ -113,6 +113,7 @@ class WxObject(object):
         self._children = []
         self._widget = None
         self._initialized = False
+        self._destroying = False
         self.set_parent(parent)
 
     #--------------------------------------------------------------------------
@@ -259,6 +260,10 @@ class WxObject(object):
         removed.
 
         """
+        # Set the destroying flag to True so objects can optimize
+        # their destruction behavior.
+        self._destroying = True
+
         # Destroy the children before destroying the underlying widget
         # this gives the children the opportunity to perform cleanup
         # with an intact parent before being destroyed. Destroying a
@@ -276,10 +281,14 @@ class WxObject(object):
 
         # Fire the child_removed event immediately, so a child can be
         # removed from any auxiliary container they parent may have
-        # placed it in, before the underlying widget is destroyed.
+        # placed it in, before the underlying widget is destroyed. If
+        # the parent is also being destroyed, the child is left in
+        # place and its widget is destroyed by wx along with the widget
+        # of the root of the destroyed subtree.
         parent = self._parent
+        in_subtree = parent is not None and parent._destroying
         if parent is not None:
-            if self in parent._children:
+            if not in_subtree and self in parent._children:
                 parent._children.remove(self)
                 if parent._initialized:
                     # Wx has a tendency to destroy the world out from
@@ -295,7 +304,8 @@ class WxObject(object):
         # should no longer be any public references to it.
         widget = self._widget
         if widget:
-            widget.Destroy()
+            if not in_subtree:
+                widget.Destroy()
             self._widget = None
 
         # Remove what should be the last remaining strong references to
@@ -495,10 +505,11 @@ class WxObject(object):
         ordered.extend(curr_set)
         self._children = ordered
 
-    def on_action_destroy(self, content):
-        """ Handle the 'destroy' action from the Enaml object.
+    def on_action_destroy_subtree(self, content):
+        """ Handle the 'destroy_subtree' action from the Enaml object.
 
-        This method will call the `destroy` method on the object.
+        This method will call the `destroy` method on the object, which
+        destroys the object and all of its descendants.
 
         """
         if self._initialized:
@@ -506,3 +517,11 @@ class WxObject(object):
         else:
             DeferredCall(self.destroy)
 
+    def on_action_destroy(self, content):
+        """ Handle the 'destroy' action from the Enaml object.
+
+        This is the action sent by older versions of the server.
+
+        """
+        self.on_action_destroy_subtree(content)
+
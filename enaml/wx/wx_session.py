@@ -228,7 +228,8 @@ class WxSession(object):
         """ Handle the 'message_batch' action sent by the Enaml session.
 
         Actions sent to the message batch are processed in the following
-        order 'children_changed' -> 'destroy' -> 'relayout' -> other...
+        order 'children_changed' -> 'destroy_subtree' -> 'destroy' ->
+        'relayout' -> other...
 
         """
         actions = defaultdict(list)
@@ -236,7 +237,9 @@ class WxSession(object):
             action = item[1]
             actions[action].append(item)
         ordered = []
-        batch_order = ('children_changed', 'destroy', 'relayout')
+        batch_order = (
+            'children_changed', 'destroy_subtree', 'destroy', 'relayout',
+        )
         for key in batch_order:
             ordered.extend(actions.pop(key, ()))
         for value in actions.itervalues():
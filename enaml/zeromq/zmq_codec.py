@@ -0,0 +1,195 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" The wire codecs used to serialize the parts of a zmq message.
+
+A codec is selected per connection. The server detects the codec in
+use by a client by inspecting the first frame of the messages which
+the client sends, and replies to that client with the same codec.
+Clients which do not opt into a binary codec are served with JSON.
+
+"""
+from abc import ABCMeta, abstractmethod
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class MessageCodec(object):
+    """ An abstract base class for zmq message part codecs.
+
+    """
+    __metaclass__ = ABCMeta
+
+    #: The unique name of the codec.
+    name = ''
+
+    @abstractmethod
+    def dumps(self, obj):
+        """ Serialize an object into a message frame.
+
+        Parameters
+        ----------
+        obj : object
+            The object to serialize.
+
+        Returns
+        -------
+        result : str
+            The serialized bytes for the frame.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data):
+        """ Deserialize a message frame into an object.
+
+        Parameters
+        ----------
+        data : str
+            The serialized bytes of the frame.
+
+        Returns
+        -------
+        result : object
+            The deserialized object.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def accepts(self, data):
+        """ Get whether a message frame was written with this codec.
+
+        This is called with the header frame of an incoming message to
+        detect the codec in use by the client. It must be cheap, since
+        it is called for every received message.
+
+        Parameters
+        ----------
+        data : str
+            The serialized bytes of the header frame of a message.
+
+        Returns
+        -------
+        result : bool
+            True if the frame was serialized with this codec.
+
+        """
+        raise NotImplementedError
+
+
+class JSONCodec(MessageCodec):
+    """ A MessageCodec which serializes message parts as JSON.
+
+    This is the default codec and is understood by every client.
+
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def accepts(self, data):
+        # Every message header is a JSON object.
+        return data[:1] == '{'
+
+
+class BinaryCodec(MessageCodec):
+    """ A MessageCodec which serializes message parts with msgpack.
+
+    Byte strings are sent as native binary values and text is sent as
+    utf-8, so payloads such as image data are neither escaped nor
+    encoded. This codec is only available if msgpack is installed.
+
+    """
+    name = 'binary'
+
+    def dumps(self, obj):
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+    def accepts(self, data):
+        # A msgpack map starts with a fixmap, map16 or map32 marker.
+        if not data:
+            return False
+        marker = ord(data[0])
+        return 0x80 <= marker <= 0x8f or marker in (0xde, 0xdf)
+
+
+#: The default codec for connections.
+default_codec = JSONCodec()
+
+
+#: The registry of available codecs, in order of detection.
+_codecs = [default_codec]
+if msgpack is not None:
+    _codecs.append(BinaryCodec())
+
+
+def register_codec(codec):
+    """ Register a codec which may be negotiated by a client.
+
+    Parameters
+    ----------
+    codec : MessageCodec
+        The codec instance to register. A previously registered codec
+        with the same name will be replaced.
+
+    """
+    for idx, other in enumerate(_codecs):
+        if other.name == codec.name:
+            _codecs[idx] = codec
+            return
+    _codecs.append(codec)
+
+
+def lookup_codec(name):
+    """ Lookup a registered codec by name.
+
+    Parameters
+    ----------
+    name : str
+        The name of the codec.
+
+    Returns
+    -------
+    result : MessageCodec or None
+        The codec with the given name, or None if no such codec is
+        registered.
+
+    """
+    for codec in _codecs:
+        if codec.name == name:
+            return codec
+
+
+def detect_codec(data):
+    """ Detect the codec used to serialize a message frame.
+
+    Parameters
+    ----------
+    data : str
+        The serialized header frame of an incoming message.
+
+    Returns
+    -------
+    result : MessageCodec
+        The first registered codec which accepts the frame, or the
+        default codec if no codec accepts it.
+
+    """
+    for codec in _codecs:
+        if codec.accepts(data):
+            return codec
+    return default_codec
@@ -2,8 +2,6 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-import json
-
 import zmq
 from zmq.eventloop.ioloop import IOLoop
 from zmq.eventloop.zmqstream import ZMQStream
@@ -12,8 +10,10 @@ from enaml.message import Message
 from enaml.request import BaseRequest, BasePushHandler
 from enaml.utils import log_exceptions
 
+from .zmq_codec import default_codec, detect_codec
+
 
-def pack_message(routing_id, message):
+def pack_message(routing_id, message, codec=default_codec):
     """ Pack a routing id and Message into a mutlipart zmq message.
 
     Parameters
@@ -24,9 +24,13 @@ def pack_message(routing_id, message):
     message : Message
         The Message object to serialized into the multipart message.
 
+    codec : MessageCodec, optional
+        The codec to use for serializing the message parts. The
+        default is the JSON codec.
+
     """
     multipart = [routing_id]
-    dumps = json.dumps
+    dumps = codec.dumps
     multipart.extend(dumps(part) for part in message)
     return multipart
 
@@ -34,6 +38,8 @@ def pack_message(routing_id, message):
 def unpack_message(multipart):
     """ Unpack a mutlipart Enaml message received by the server.
 
+    The codec of the message is detected from its header frame.
+
     Parameters
     ----------
     multipart : list
@@ -42,22 +48,26 @@ def unpack_message(multipart):
 
     Returns
     -------
-    routing_id, message : str, Message
-        The zmq routing id and the deserialized Message object.
+    routing_id, message, codec : str, Message, MessageCodec
+        The zmq routing id, the deserialized Message object, and the
+        codec which was used by the client to serialize the message.
 
     """
     if len(multipart) != 5:
         raise TypeError('Invalid wire message: %s' % multipart)
     routing_id = multipart[0]
-    loads = json.loads
-    return routing_id, Message(loads(part) for part in multipart[1:])
+    codec = detect_codec(multipart[1])
+    loads = codec.loads
+    message = Message(loads(part) for part in multipart[1:])
+    return routing_id, message, codec
 
 
 class ZMQRequest(BaseRequest):
     """ A concrete BaseRequest implementation for the ZMQServer.
 
     """
-    def __init__(self, message, routing_id, stream, ioloop):
+    def __init__(self, message, routing_id, stream, ioloop,
+                 codec=default_codec):
         """ Initialize a ZMQRequest.
 
         Parameters
@@ -74,11 +84,16 @@ class ZMQRequest(BaseRequest):
         ioloop : IOLoop
             The zmq IOLoop instance for this request.
 
+        codec : MessageCodec, optional
+            The codec negotiated with the client. The reply and any
+            pushed messages are serialized with this codec.
+
         """
         self._message = message
         self._routing_id = routing_id
         self._stream = stream
         self._ioloop = ioloop
+        self._codec = codec
         self._finished = False
 
     #--------------------------------------------------------------------------
@@ -132,8 +147,8 @@ class ZMQRequest(BaseRequest):
         """
         if self._finished:
             raise RuntimeError('Request already finished')
-        packed = pack_message(self._routing_id, message)
-        self._stream.send_multipart(packed)
+        packed = pack_message(self._routing_id, message, self._codec)
+        self._stream.send_multipart(packed, copy=False)
         self._finished = True
 
     def push_handler(self):
@@ -147,7 +162,9 @@ class ZMQRequest(BaseRequest):
             to this client, without the client initiating a request.
 
         """
-        return ZMQPushHandler(self._routing_id, self._stream, self._ioloop)
+        return ZMQPushHandler(
+            self._routing_id, self._stream, self._ioloop, self._codec,
+        )
 
 
 class ZMQPushHandler(BasePushHandler):
@@ -158,7 +175,7 @@ class ZMQPushHandler(BasePushHandler):
     this handler will silently drop the messages.
 
     """
-    def __init__(self, routing_id, stream, ioloop):
+    def __init__(self, routing_id, stream, ioloop, codec=default_codec):
         """ Initialize a ZMQPushHandler.
 
         Parameters
@@ -172,10 +189,14 @@ class ZMQPushHandler(BasePushHandler):
         ioloop : IOLoop
             The zmq IOLoop instance for this push handler.
 
+        codec : MessageCodec, optional
+            The codec negotiated with the client.
+
         """
         self._routing_id = routing_id
         self._stream = stream
         self._ioloop = ioloop
+        self._codec = codec
 
     @log_exceptions
     def push_message(self, message):
@@ -187,8 +208,8 @@ class ZMQPushHandler(BasePushHandler):
             The Message instance that should be pushed to the client.
 
         """
-        packed = pack_message(self._routing_id, message)
-        self._stream.send_multipart(packed)
+        packed = pack_message(self._routing_id, message, self._codec)
+        self._stream.send_multipart(packed, copy=False)
 
     def add_callback(self, callback):
         """ Add a callback to the event queue to be called later.
@@ -252,8 +273,10 @@ class ZMQServer(object):
             The multipart message received by the client.
 
         """
-        routing_id, message = unpack_message(multipart)
-        request = ZMQRequest(message, routing_id, self._stream, self._ioloop)
+        routing_id, message, codec = unpack_message(multipart)
+        request = ZMQRequest(
+            message, routing_id, self._stream, self._ioloop, codec,
+        )
         self._app.handle_request(request)
 
     #--------------------------------------------------------------------------